@@ -0,0 +1,68 @@
+"""Per-client token buckets for the analyze endpoints.
+
+Every client (remote address, or the first `X-Forwarded-For` hop behind a
+trusted proxy) owns a bucket that refills at `rate` tokens per second up to
+`burst`. A request takes `cost` tokens or is refused with the number of
+seconds until enough have accumulated, which `server.py` returns as
+`429` + `Retry-After`. Buckets are refilled lazily on access, so idle clients
+cost nothing; the least recently seen ones are dropped beyond `max_clients`.
+
+    limiter = ClientLimiter(rate=2, burst=20)
+    wait = limiter.take("203.0.113.7")   # 0.0 -> admitted, else seconds to wait
+
+The global, per-provider side of admission control (bounded wait queue in
+front of the concurrency slots) lives in `upstream.ProviderClient`.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst, now):
+        self.tokens = float(burst)
+        self.updated = now
+
+
+class ClientLimiter:
+    def __init__(self, rate=2.0, burst=20, max_clients=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"admitted": 0, "limited": 0}
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def take(self, client, cost=1):
+        """Seconds until `cost` tokens are available for `client`; 0.0 means admitted (tokens taken)."""
+        if not self.enabled:
+            return 0.0
+        cost = min(cost, self.burst)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.burst, now)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+                bucket.updated = now
+            if bucket.tokens >= cost:
+                bucket.tokens -= cost
+                self.counters["admitted"] += 1
+                return 0.0
+            self.counters["limited"] += 1
+            return (cost - bucket.tokens) / self.rate
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, clients=len(self._buckets), rate=self.rate, burst=self.burst)
@@ -0,0 +1,183 @@
+"""Local OpenAI-compatible chat-completions stand-in for load tests.
+
+Speaks enough of `POST /v1/chat/completions` for `server.py`: a JSON
+completion, or with `stream: true` an SSE stream of `choices[0].delta.content`
+chunks ending in `data: [DONE]`. Timing and failures are configurable:
+
+    --latency    time to first token, e.g. `0.4`, `uniform:0.2,1.5`,
+                 `normal:0.8,0.2` or `lognormal:-0.5,0.6` (seconds)
+    --tps        generation speed in tokens per second (0 = instant)
+    --tokens     completion length in tokens
+    --error-rate fraction of requests answered with --error-status
+    --fail-marker  requests whose body contains this text always fail
+
+    python backend/fake_provider.py --port 8001 --latency lognormal:-0.5,0.6 --tps 40
+    DEEPSEEK_API_URL=http://127.0.0.1:8001/v1/chat/completions python backend/server.py
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = ("残差", "连接", "注意力", "特征", "金字塔", "扩散", "模型", "语义", "分割", "检测",
+         "transformer", "backbone", "token", "embedding", "benchmark", "scaling")
+
+
+def parse_latency(spec):
+    """`0.4` / `fixed:0.4` / `uniform:a,b` / `normal:mu,sigma` / `lognormal:mu,sigma` -> sampler."""
+    spec = str(spec).strip()
+    kind, _, args = spec.partition(":") if ":" in spec else ("fixed", "", spec)
+    values = [float(part) for part in args.split(",") if part.strip()]
+    samplers = {
+        "fixed": lambda rng: values[0],
+        "uniform": lambda rng: rng.uniform(values[0], values[1]),
+        "normal": lambda rng: rng.gauss(values[0], values[1]),
+        "lognormal": lambda rng: rng.lognormvariate(values[0], values[1]),
+    }
+    if kind not in samplers:
+        raise ValueError(f"unknown latency distribution: {spec}")
+    sampler = samplers[kind]
+    return lambda rng: max(0.0, sampler(rng))
+
+
+class FakeProvider(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency="0", tps=0.0, tokens=60, error_rate=0.0,
+                 error_status=500, fail_marker=None, seed=None):
+        super().__init__(address, FakeProviderHandler)
+        self.latency = parse_latency(latency)
+        self.tps = tps
+        self.tokens = tokens
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.fail_marker = fail_marker
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters = {"calls": 0, "streams": 0, "errors": 0}
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/v1/chat/completions"
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+            return self.counters[name]
+
+    def plan(self, body):
+        """Draw (first-token delay, tokens, failing) for one request."""
+        with self.lock:
+            delay = self.latency(self.rng)
+            failing = self.rng.random() < self.error_rate
+            words = [self.rng.choice(WORDS) for _ in range(self.tokens)]
+        if self.fail_marker and self.fail_marker in body:
+            failing = True
+        return delay, words, failing
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients can reuse connections
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def _send(self, status, payload, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_POST(self):
+        provider = self.server
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8")
+        call = provider.count("calls")
+        try:
+            body = json.loads(raw or "{}")
+        except ValueError:
+            self._send(400, b'{"error": {"message": "invalid JSON"}}')
+            return
+        delay, words, failing = provider.plan(raw)
+        time.sleep(delay)
+        if failing:
+            provider.count("errors")
+            payload = json.dumps({"error": {"message": f"fake failure #{call}"}}).encode("utf-8")
+            self._send(provider.error_status, payload)
+            return
+
+        interval = 1.0 / provider.tps if provider.tps > 0 else 0.0
+        if not body.get("stream"):
+            time.sleep(interval * len(words))
+            content = " ".join(words)
+            payload = {
+                "id": f"fake-{call}",
+                "object": "chat.completion",
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": {"completion_tokens": len(words)},
+            }
+            self._send(200, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+            return
+
+        provider.count("streams")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for pos, word in enumerate(words):
+            if pos and interval:
+                time.sleep(interval)
+            chunk = {"id": f"fake-{call}", "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]}
+            self._chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n")
+        self._chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="OpenAI-compatible fake LLM provider.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", default="0.5", help="First-token delay distribution (seconds).")
+    parser.add_argument("--tps", type=float, default=50.0, help="Tokens per second; 0 sends everything at once.")
+    parser.add_argument("--tokens", type=int, default=60)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--fail-marker", default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    provider = FakeProvider((args.host, args.port), args.latency, args.tps, args.tokens,
+                            args.error_rate, args.error_status, args.fail_marker, args.seed)
+    print(f"Fake provider on http://{args.host}:{provider.server_port}/v1/chat/completions "
+          f"(latency={args.latency}, tps={args.tps}, error_rate={args.error_rate})")
+    try:
+        provider.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(provider.counters))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
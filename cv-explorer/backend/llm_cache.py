@@ -0,0 +1,182 @@
+"""Two-level response cache for `/api/analyze`.
+
+Same scholar, same paper, same prompt: the answer does not change between two
+clicks a minute apart, so it should not cost another upstream call. Entries
+are keyed by
+
+    sha256(model, prompt_type, normalized text, canonical context JSON)
+
+where the text is whitespace-collapsed and case-folded and the context is
+dumped with sorted keys, so key order and stray spaces from the frontend do not
+split the cache.
+
+Lookups go through an in-memory LRU (`LLM_CACHE_SIZE` entries) and fall back to
+a SQLite file (`LLM_CACHE_PATH`) that survives restarts; disk hits are promoted
+into memory. Both levels honour the same TTL (`LLM_CACHE_TTL` seconds). If the
+file cannot be opened (read-only deployments), the cache runs memory-only.
+
+`SingleFlight` covers the gap before the first answer is cached: concurrent
+misses on one key wait for a single upstream call instead of each making one.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    prompt_type TEXT,
+    created REAL NOT NULL,
+    payload TEXT NOT NULL
+)
+"""
+
+
+def normalize_text(text):
+    return " ".join(str(text or "").split()).casefold()
+
+
+def cache_key(model, prompt_type, text, context):
+    canonical = json.dumps(context or {}, sort_keys=True, ensure_ascii=False,
+                           separators=(",", ":"), default=str)
+    digest = hashlib.sha256()
+    for part in (model or "", prompt_type or "", normalize_text(text), canonical):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path=None, max_entries=256, ttl=7 * 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()  # key -> (created, result)
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "bypassed": 0}
+        self.path = None
+        self._db = None
+        if path:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(str(path), check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute(SCHEMA)
+                db.execute("DELETE FROM responses WHERE created < ?", (time.time() - ttl,))
+                db.commit()
+                self._db, self.path = db, Path(path)
+            except (OSError, sqlite3.Error) as e:
+                print(f"[llm-cache] 无法打开 {path}，仅使用内存缓存: {e}")
+
+    def _remember(self, key, created, result):
+        self._memory[key] = (created, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Cached result for `key`, or None. Hits are returned as fresh dicts."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return dict(entry[1])
+            if entry:
+                del self._memory[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT created, payload FROM responses WHERE key = ?", (key,)).fetchone()
+                if row and now - row[0] < self.ttl:
+                    result = json.loads(row[1])
+                    self._remember(key, row[0], result)
+                    self.counters["disk_hits"] += 1
+                    return dict(result)
+            self.counters["misses"] += 1
+            return None
+
+    def set(self, key, result, model=None, prompt_type=None):
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, dict(result))
+            self.counters["writes"] += 1
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO responses (key, model, prompt_type, created, payload) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, model or "", prompt_type, created, json.dumps(result, ensure_ascii=False)))
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"[llm-cache] 写入失败: {e}")
+
+    def bypass(self):
+        with self._lock:
+            self.counters["bypassed"] += 1
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            counters["memory_entries"] = len(self._memory)
+            if self._db is not None:
+                counters["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        counters["hit_rate"] = round((counters["memory_hits"] + counters["disk_hits"]) / lookups, 4) \
+            if lookups else 0.0
+        counters["persistent"] = self._db is not None
+        return counters
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key (the leader) runs `fn`; callers arriving while it
+    is in flight wait for it and receive the same result, or the same exception.
+    Once the leader finishes the key is forgotten, so later callers start a new
+    call (by then the response cache normally answers them).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> [done event, result, exception]
+        self.counters = {"leaders": 0, "coalesced": 0, "in_flight": 0}
+
+    def do(self, key, fn):
+        """Returns (result, shared); `shared` is True for callers that waited on a leader."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = [threading.Event(), None, None]
+                self._calls[key] = call
+                self.counters["leaders"] += 1
+                self.counters["in_flight"] += 1
+            else:
+                self.counters["coalesced"] += 1
+        if not leader:
+            call[0].wait()
+            if call[2] is not None:
+                raise call[2]
+            return call[1], True
+
+        try:
+            call[1] = fn()
+        except Exception as e:
+            call[2] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                self.counters["in_flight"] -= 1
+            call[0].set()
+        return call[1], False
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
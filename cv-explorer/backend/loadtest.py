@@ -0,0 +1,210 @@
+"""Fixed-concurrency load generator for `/api/analyze`.
+
+Each of `--concurrency` workers keeps one request in flight (with its own
+keep-alive session) until `--requests` have been sent or `--duration` seconds
+have passed, then prints throughput, latency percentiles, status codes and the
+`X-Cache` mix. `--distinct` controls how many different texts are asked about,
+and with it the response-cache hit rate. `--stream` drives
+`/api/analyze/stream` and also reports time to first token.
+
+With `--local` nothing needs to be running: a fake provider
+(`fake_provider.py`) and `server.py` are started in-process on free ports, and
+DeepSeek is pointed at the fake. `--slots`, `--max-queue` and
+`--queue-timeout` size the provider's admission control (per-client rate
+limiting is off unless `--rate` is given), so overload behaviour can be
+compared:
+
+    python backend/loadtest.py --local --concurrency 64 --slots 8 --max-queue 8 --duration 20
+    python backend/loadtest.py --local --concurrency 64 --slots 8 --max-queue 100000 --queue-timeout 60 --duration 20
+
+    python backend/loadtest.py --local --concurrency 32 --requests 2000 --distinct 50
+    python backend/loadtest.py --local --stream --latency lognormal:-0.5,0.6 --tps 40
+    python backend/loadtest.py --url http://localhost:5000 --model mock --duration 30
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import requests
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def start_local(args):
+    """fake provider + server.py on 127.0.0.1; returns (base url, fake provider)."""
+    from werkzeug.serving import make_server
+
+    from fake_provider import FakeProvider
+
+    provider = FakeProvider(("127.0.0.1", 0), args.latency, args.tps, args.tokens,
+                            args.error_rate, seed=args.seed).start()
+    os.environ["DEEPSEEK_API_URL"] = provider.url
+    os.environ.setdefault("LLM_CACHE_PATH", str(Path(tempfile.mkdtemp(prefix="cv-loadtest-")) / "llm_cache.sqlite3"))
+    os.environ.setdefault("DEEPSEEK_MAX_CONCURRENCY", str(args.slots or args.concurrency))
+    if args.max_queue is not None:
+        os.environ["DEEPSEEK_MAX_QUEUE"] = str(args.max_queue)
+    if args.queue_timeout is not None:
+        os.environ["PROVIDER_QUEUE_TIMEOUT"] = str(args.queue_timeout)
+    os.environ["ANALYZE_RATE"] = str(args.rate)
+    os.environ["ANALYZE_BURST"] = str(args.burst)
+    import server
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    httpd = make_server("127.0.0.1", 0, server.app, threaded=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{httpd.server_port}", provider
+
+
+def one_request(session, url, body, stream):
+    """(status, x-cache, seconds to first token or None, total seconds, Retry-After seconds or None)."""
+    start = time.perf_counter()
+    first = None
+    with session.post(url, json=body, stream=stream, timeout=120) as response:
+        if stream and response.ok:
+            for line in response.iter_lines():
+                if first is None and line.startswith(b"event: delta"):
+                    first = time.perf_counter() - start
+                if line.startswith(b"event: error"):
+                    return "stream-error", None, first, time.perf_counter() - start, None
+        else:
+            response.content  # 读完响应体，连接才能复用
+        cache = response.headers.get("X-Cache")
+        retry_after = response.headers.get("Retry-After")
+        return (response.status_code, cache, first, time.perf_counter() - start,
+                float(retry_after) if retry_after else None)
+
+
+def run(args, base_url):
+    url = base_url.rstrip("/") + ("/api/analyze/stream" if args.stream else "/api/analyze")
+    deadline = time.perf_counter() + args.duration if args.duration else None
+    issued = {"count": 0}
+    lock = threading.Lock()
+    results = []
+
+    def next_index():
+        with lock:
+            if args.requests and issued["count"] >= args.requests:
+                return None
+            if deadline and time.perf_counter() >= deadline:
+                return None
+            issued["count"] += 1
+            return issued["count"]
+
+    def worker():
+        session = requests.Session()
+        local = []
+        while True:
+            index = next_index()
+            if index is None:
+                break
+            body = {"text": f"{args.text} #{index % args.distinct}", "model": args.model,
+                    "prompt_type": args.prompt_type, "context": {"year": 2024}}
+            if args.api_key:
+                body["api_key"] = args.api_key
+            try:
+                outcome = one_request(session, url, body, args.stream)
+            except requests.RequestException as e:
+                outcome = (type(e).__name__, None, None, None, None)
+            local.append(outcome[:4])
+            if args.honor_retry_after and outcome[4]:
+                time.sleep(outcome[4])
+        with lock:
+            results.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    latencies = [total * 1000 for status, _, _, total in results if status == 200 and total is not None]
+    first_tokens = [first * 1000 for _, _, first, _ in results if first is not None]
+    report = {
+        "url": url, "model": args.model, "concurrency": args.concurrency,
+        "requests": len(results), "wall_s": round(wall, 2),
+        "rps": round(len(results) / wall, 1) if wall else 0.0,
+        "ok": len(latencies),
+        "status": dict(Counter(str(status) for status, _, _, _ in results)),
+        "x_cache": dict(Counter(cache or "-" for _, cache, _, _ in results)),
+    }
+    for pct in (50, 90, 99):
+        value = percentile(latencies, pct)
+        report[f"p{pct}_ms"] = round(value, 1) if value is not None else None
+    if args.stream:
+        for pct in (50, 99):
+            value = percentile(first_tokens, pct)
+            report[f"ttft_p{pct}_ms"] = round(value, 1) if value is not None else None
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test /api/analyze at fixed concurrency.")
+    parser.add_argument("--url", default="http://localhost:5000", help="Backend base URL (ignored with --local).")
+    parser.add_argument("--local", action="store_true", help="Start a fake provider and server.py in-process.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="Total requests (0 = until --duration).")
+    parser.add_argument("--duration", type=float, default=0, help="Stop after this many seconds.")
+    parser.add_argument("--model", default="deepseek")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--prompt-type", default=None)
+    parser.add_argument("--text", default="Gaussian Splatting")
+    parser.add_argument("--distinct", type=int, default=1000000,
+                        help="Distinct texts in the workload; small values exercise the cache.")
+    parser.add_argument("--stream", action="store_true", help="Use /api/analyze/stream and report TTFT.")
+    parser.add_argument("--honor-retry-after", action="store_true",
+                        help="Workers sleep for Retry-After after a 429/503, like a well-behaved client.")
+    fake = parser.add_argument_group("fake provider (--local)")
+    fake.add_argument("--latency", default="0.3")
+    fake.add_argument("--tps", type=float, default=100.0)
+    fake.add_argument("--tokens", type=int, default=40)
+    fake.add_argument("--error-rate", type=float, default=0.0)
+    fake.add_argument("--seed", type=int, default=0)
+    admission = parser.add_argument_group("admission control (--local)")
+    admission.add_argument("--slots", type=int, default=None, help="Provider concurrency (default: --concurrency).")
+    admission.add_argument("--max-queue", type=int, default=None, help="Calls allowed to wait for a slot.")
+    admission.add_argument("--queue-timeout", type=float, default=None)
+    admission.add_argument("--rate", type=float, default=0.0, help="Per-client tokens/s (0 = no rate limit).")
+    admission.add_argument("--burst", type=int, default=20)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.requests and not args.duration:
+        print("需要 --requests 或 --duration")
+        return 2
+    provider = None
+    base_url = args.url
+    if args.local:
+        base_url, provider = start_local(args)
+        if args.api_key is None:
+            args.api_key = "fake-key"
+    # 本地模式下屏蔽 server.py 每个请求的日志输出，只打印报告
+    with contextlib.redirect_stdout(io.StringIO()) if args.local else contextlib.nullcontext():
+        report = run(args, base_url)
+    if provider is not None:
+        report["provider"] = dict(provider.counters)
+        provider.shutdown()
+    print(json.dumps(report, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Prometheus text-format instrumentation for the backend (no client library).
+
+Metrics live in one process-wide `REGISTRY` and are rendered by
+`/api/metrics` in the 0.0.4 exposition format:
+
+    REQUESTS = REGISTRY.counter("cv_http_requests_total", "HTTP requests.", ("route", "status"))
+    REQUESTS.inc(route="/api/analyze", status="200")
+    LATENCY = REGISTRY.histogram("cv_http_request_duration_seconds", "Latency.", ("route",))
+    LATENCY.observe(0.12, route="/api/analyze")
+    REGISTRY.collector(lambda: [("cv_llm_cache_entries", "gauge", "Entries.", [({}, 12)])])
+
+Each counter / gauge / histogram holds one lock and a dict keyed by the label
+values; an observation is a dict lookup, a bisect and a few additions, so the
+instrumentation stays on in production. Collectors run only at scrape time and
+turn the `stats()` dicts the backend already keeps into samples.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# 秒；覆盖本地索引查询（毫秒级）到上游 LLM 调用（数十秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def family(name, kind, help_text, samples):
+    """Exposition lines for one metric family; `samples` are (suffix, labels, value)."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{suffix}{format_labels(labels)} {format_value(value)}" for suffix, labels, value in samples)
+    return lines
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key):
+        return dict(zip(self.labelnames, key))
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [("", self._labels(key), value) for key, value in sorted(items)]
+
+    def render(self):
+        return family(self.name, self.kind, self.help, self.samples())
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][slot] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels):
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts), total, count) for key, (counts, total, count) in self._values.items()]
+        samples = []
+        for key, counts, total, count in sorted(items):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, hits in zip(self.buckets + (math.inf,), counts):
+                cumulative += hits
+                samples.append(("_bucket", dict(labels, le=format_value(bound)), cumulative))
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, count))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            # 模块被重复导入（如脚本里 import server）时返回已注册的同名指标
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def collector(self, fn):
+        """`fn()` -> [(name, kind, help, [(labels, value), ...]), ...], evaluated on every scrape."""
+        with self._lock:
+            self._collectors.append(fn)
+        return fn
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collect in collectors:
+            try:
+                families = list(collect())
+            except Exception as e:  # 单个收集器出错不影响整次抓取
+                lines.append(f"# collector {getattr(collect, '__name__', 'collector')} failed: {escape(e)}")
+                continue
+            for name, kind, help_text, samples in families:
+                lines.extend(family(name, kind, help_text, [("", labels, value) for labels, value in samples]))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
@@ -0,0 +1,212 @@
+"""Latency-aware routing of `/api/analyze` across LLM providers.
+
+For every provider the router keeps an EWMA of call latency and of the error
+rate, plus a circuit breaker:
+
+    closed      calls go through; `failure_threshold` consecutive failures open it
+    open        calls are refused without touching the network for `cooldown` s
+    half-open   one probe call is let through; success closes, failure re-opens
+
+A routed call starts on the requested provider. If it has not answered after
+`hedge_after` seconds (or fails, or its circuit is open, or its EWMA latency
+already exceeds the deadline), the next configured hedge provider is started
+as well and the first success wins. When nothing has succeeded by `deadline`
+seconds, when every circuit is open, or when the EWMA latency of everything
+still running says the deadline will be missed, the caller's fallback (the
+mock generator) answers instead, marked as degraded. Abandoned
+calls keep running in the background, so their outcome still feeds the
+statistics (and, through the attempt function, the response cache).
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from upstream import ProviderBusy
+
+
+class ProviderHealth:
+    def __init__(self, name, alpha=0.2, failure_threshold=5, cooldown=30.0):
+        self.name = name
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.ewma_latency = None
+        self.ewma_error = 0.0
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.counters = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self):
+        """Whether a call may start now; in half-open state only one probe at a time."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.probing:
+                self.probing = True
+                return True
+            self.counters["rejected"] += 1
+            return False
+
+    def record(self, latency, ok):
+        with self._lock:
+            self.counters["calls"] += 1
+            self.ewma_latency = latency if self.ewma_latency is None \
+                else self.alpha * latency + (1 - self.alpha) * self.ewma_latency
+            self.ewma_error = self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * self.ewma_error
+            self.probing = False
+            if ok:
+                self.consecutive_failures = 0
+                self.opened_at = None
+                return
+            self.counters["failures"] += 1
+            self.consecutive_failures += 1
+            if self.opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    self.counters["opened"] += 1
+                self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """A probe that never reached the provider (e.g. no free slot) does not decide the circuit."""
+        with self._lock:
+            self.probing = False
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counters, state=self.state,
+                        ewma_latency_ms=round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+                        ewma_error=round(self.ewma_error, 4),
+                        consecutive_failures=self.consecutive_failures)
+
+
+class Router:
+    def __init__(self, hedges=None, hedge_after=6.0, deadline=25.0, max_workers=32, **health_options):
+        self.hedges = hedges or {}  # provider -> [hedge providers, in order]
+        self.hedge_after = hedge_after
+        self.deadline = deadline
+        self.health_options = health_options
+        self._health = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-route")
+        self.counters = {"routed": 0, "hedged": 0, "hedge_wins": 0, "deadline_fallbacks": 0,
+                         "predicted_fallbacks": 0, "short_circuited": 0}
+
+    def health(self, name):
+        with self._lock:
+            if name not in self._health:
+                self._health[name] = ProviderHealth(name, **self.health_options)
+            return self._health[name]
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def expected_latency(self, provider):
+        latency = self.health(provider).ewma_latency
+        return latency if latency is not None else 0.0
+
+    def _timed(self, provider, attempt):
+        health = self.health(provider)
+        started = time.perf_counter()
+        try:
+            result = attempt(provider)
+        except ProviderBusy:
+            health.release_probe()
+            raise
+        except Exception:
+            health.record(time.perf_counter() - started, False)
+            raise
+        health.record(time.perf_counter() - started, "error" not in result)
+        return result
+
+    def call(self, primary, attempt, fallback, available=None):
+        """(result, provider) for `attempt(provider)`, hedged and bounded by the deadline.
+
+        `available` filters hedge providers (e.g. those with an API key). When every
+        attempt fails, the last error result is returned (or ProviderBusy re-raised).
+        """
+        self._count("routed")
+        started = time.perf_counter()
+        candidates = [primary] + [name for name in self.hedges.get(primary, [])
+                                  if available is None or name in available]
+        pending = {}
+        launched = 0
+        last_error, busy = None, None
+
+        def launch_next():
+            nonlocal launched
+            while candidates:
+                provider = candidates.pop(0)
+                if self.health(provider).allow():
+                    if launched:
+                        self._count("hedged")
+                    pending[self._executor.submit(self._timed, provider, attempt)] = provider
+                    launched += 1
+                    return True
+            return False
+
+        if not launch_next():
+            self._count("short_circuited")
+            return fallback(), "mock"
+        if candidates and self.expected_latency(primary) > self.deadline:
+            launch_next()  # 已知很慢，不等对冲阈值
+
+        while pending:
+            elapsed = time.perf_counter() - started
+            remaining = self.deadline - elapsed
+            if remaining <= 0:
+                break
+            if not candidates and all(self.expected_latency(name) - elapsed > remaining
+                                      for name in pending.values()):
+                self._count("predicted_fallbacks")
+                return fallback(), "mock"
+            timeout = remaining
+            if candidates:
+                timeout = min(timeout, max(0.0, self.hedge_after * launched - elapsed))
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    result = future.result()
+                except ProviderBusy as e:
+                    busy = e
+                    continue
+                except Exception as e:
+                    last_error = {"error": f"{provider} 调用失败: {e}"}
+                    continue
+                if "error" not in result:
+                    if provider != primary:
+                        self._count("hedge_wins")
+                    return result, provider
+                last_error = result
+            # 失败后立即换下一个；仍在等待时，到了对冲阈值再并发启动下一个
+            if candidates and (not pending or time.perf_counter() - started >= self.hedge_after * launched):
+                launch_next()
+
+        if pending:
+            self._count("deadline_fallbacks")
+            return fallback(), "mock"
+        if last_error is None and busy is not None:
+            raise busy
+        if last_error is None:
+            self._count("short_circuited")
+            return fallback(), "mock"
+        return last_error, primary
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            providers = dict(self._health)
+        counters["providers"] = {name: health.snapshot() for name, health in providers.items()}
+        counters["hedge_after_s"] = self.hedge_after
+        counters["deadline_s"] = self.deadline
+        return counters
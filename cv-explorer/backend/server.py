@@ -1,11 +1,30 @@
 import os
+import sys
 import time
 import random
 import json
-import requests
-from flask import Flask, request, jsonify
+import hashlib
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(1, str(Path(__file__).resolve().parent.parent / "scripts"))
+from admission import ClientLimiter  # noqa: E402
+from corpus_columns import DIMENSIONS as STATS_DIMENSIONS, CorpusStats  # noqa: E402
+from fake_provider import parse_latency  # noqa: E402
+from flow_cube import FlowCube  # noqa: E402
+from keyword_cube import WEIGHTINGS as KEYWORD_WEIGHTINGS, KeywordCube  # noqa: E402
+from llm_cache import ResponseCache, SingleFlight, cache_key  # noqa: E402
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY  # noqa: E402
+from router import Router  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+from spatial_index import IndexHolder  # noqa: E402
+from static_assets import AssetStore, parse_range, select_encoding  # noqa: E402
+from upstream import ProviderBusy, ProviderClient, QueueFull  # noqa: E402
+
 # 初始化 Flask 应用
 app = Flask(__name__)
 CORS(app)  # 允许跨域请求
@@ -18,6 +37,189 @@ API_KEYS = {
     "doubao": os.environ.get("DOUBAO_API_KEY", "")
 }
 
+# 演示响应的模拟延迟（秒），支持 `0.8`、`uniform:0.2,1.5`、`lognormal:-0.5,0.6` 等分布写法
+MOCK_LATENCY = parse_latency(os.environ.get("MOCK_LATENCY", "0.8"))  # model=mock
+DEMO_LATENCY = parse_latency(os.environ.get("DEMO_LATENCY", "1"))  # 未配置 Key 的真实模型
+MOCK_STREAM_INTERVAL = float(os.environ.get("MOCK_STREAM_INTERVAL", "0.03"))  # 流式切块间隔
+
+
+def simulate_latency(latency):
+    time.sleep(latency(random))
+
+
+# 预生成的数据资产目录 (scripts/ 输出)，可通过 CV_DATA_DIR 覆盖
+DATA_DIR = Path(os.environ.get(
+    "CV_DATA_DIR", Path(__file__).resolve().parent.parent / "data"))
+TILE_DIR = DATA_DIR / "tiles"
+TILE_CACHE_SECONDS = int(os.environ.get("TILE_CACHE_SECONDS", "3600"))
+IMMUTABLE_CACHE_SECONDS = 31536000
+
+# 自托管（无静态托管）时由 /data/<path> 直接提供 web/data 下的数据集，启动时内存映射
+WEB_DATA_DIR = Path(os.environ.get(
+    "CV_WEB_DATA_DIR", Path(__file__).resolve().parent.parent / "web" / "data"))
+DATA_ASSETS = AssetStore(WEB_DATA_DIR)
+DATA_CACHE_SECONDS = int(os.environ.get("DATA_CACHE_SECONDS", "60"))  # 未带哈希的文件名，过期后凭 ETag 重新验证
+DATA_CHUNK = 256 * 1024
+
+_tile_index_cache = {"mtime": None, "index": None, "etag": None}
+
+# landscape 坐标的网格空间索引，landscape_data.json 变化后自动重建
+LANDSCAPE_INDEX = IndexHolder(DATA_DIR / "landscape_data.json")
+SPATIAL_MAX_K = 200
+SPATIAL_MAX_LIMIT = 2000
+
+# 全量论文的 BM25 倒排索引（scripts/search_index.py 生成，mmap 只读）
+SEARCH_INDEX = IndexHolder(DATA_DIR / "search_index.bin", SearchIndex.open)
+SEARCH_MAX_LIMIT = 100
+
+# 全量论文的列式副本，/api/stats 在内存中按 year / venue / concept 分组聚合
+STATS_CACHE_SIZE = int(os.getenv("STATS_CACHE_SIZE", "512"))
+STATS_MAX_ROWS = 5000
+STATS_INDEX = IndexHolder(DATA_DIR / "corpus_columns.bin",
+                          lambda path: CorpusStats.open(path, STATS_CACHE_SIZE))
+
+# year × problem × method 累积权重立方体，任意年份区间的桑基图流向 O(P×M) 得出
+FLOW_CUBE = IndexHolder(DATA_DIR / "flow_cube.json", FlowCube.open)
+
+# 关键词 × 年份稀疏矩阵（scripts/wordcloud_new.py 生成），加载后展开为前缀和
+KEYWORD_CUBE = IndexHolder(DATA_DIR / "keyword_cube.bin", KeywordCube.open)
+WORDCLOUD_MAX_K = 500
+
+# /api/analyze 的响应缓存：内存 LRU + SQLite 持久层，重启后仍可命中
+LLM_CACHE = ResponseCache(
+    os.environ.get("LLM_CACHE_PATH", Path(__file__).resolve().parent / "llm_cache.sqlite3"),
+    max_entries=int(os.environ.get("LLM_CACHE_SIZE", "256")),
+    ttl=int(os.environ.get("LLM_CACHE_TTL", str(7 * 24 * 3600))))
+# 相同缓存键的并发请求只发起一次上游调用，其余请求等待并共享结果
+LLM_INFLIGHT = SingleFlight()
+
+# 上游地址可覆盖，便于指向本地的假服务做压测
+PROVIDER_URLS = {
+    "deepseek": os.environ.get("DEEPSEEK_API_URL", "https://api.deepseek.com/v1/chat/completions"),
+    "chatgpt": os.environ.get("OPENAI_API_URL", "https://api.openai.com/v1/chat/completions"),
+}
+# 每个上游一个长连接池 + 并发上限，慢调用不会占满所有工作线程；
+# 排队等待槽位的调用最多 <NAME>_MAX_QUEUE 个，再多直接 429
+PROVIDER_CLIENTS = {
+    name: ProviderClient(
+        name,
+        max_concurrency=int(os.environ.get(f"{name.upper()}_MAX_CONCURRENCY", "8")),
+        queue_timeout=float(os.environ.get("PROVIDER_QUEUE_TIMEOUT", "2")),
+        read_timeout=float(os.environ.get("PROVIDER_READ_TIMEOUT", "60")),
+        max_queue=int(os.environ.get(f"{name.upper()}_MAX_QUEUE", "16")))
+    for name in PROVIDER_URLS
+}
+
+# 分析接口的每客户端令牌桶：每秒补充 ANALYZE_RATE 个，最多攒 ANALYZE_BURST 个（ANALYZE_RATE=0 关闭）；
+# 部署在反向代理后时设置 TRUST_PROXY=1，按 X-Forwarded-For 的首个地址区分客户端
+ANALYZE_LIMITER = ClientLimiter(
+    rate=float(os.environ.get("ANALYZE_RATE", "2")),
+    burst=int(os.environ.get("ANALYZE_BURST", "20")))
+TRUST_PROXY = os.environ.get("TRUST_PROXY", "") not in ("", "0")
+
+
+def parse_hedges(spec):
+    """`deepseek:chatgpt,chatgpt:deepseek` -> {"deepseek": ["chatgpt"], "chatgpt": ["deepseek"]}"""
+    hedges = {}
+    for pair in spec.split(","):
+        primary, _, backup = pair.strip().partition(":")
+        if primary and backup:
+            hedges.setdefault(primary.strip(), []).append(backup.strip())
+    return hedges
+
+
+# 按 EWMA 延迟 / 错误率路由：连续失败熔断，超过 LLM_HEDGE_AFTER 秒向备用上游发对冲请求，
+# 超过 LLM_DEADLINE 秒仍无结果则降级为演示响应（LLM_HEDGES 为空时不对冲）
+LLM_ROUTER = Router(
+    hedges=parse_hedges(os.environ.get("LLM_HEDGES", "")),
+    hedge_after=float(os.environ.get("LLM_HEDGE_AFTER", "6")),
+    deadline=float(os.environ.get("LLM_DEADLINE", "25")),
+    failure_threshold=int(os.environ.get("CIRCUIT_FAILURES", "5")),
+    cooldown=float(os.environ.get("CIRCUIT_COOLDOWN", "30")))
+
+# /api/metrics 暴露的请求级指标；缓存、上游并发与路由状态在抓取时由 collect_backend_metrics 汇总
+HTTP_REQUESTS = REGISTRY.counter(
+    "cv_http_requests_total", "HTTP requests by route, method and status.", ("route", "method", "status"))
+HTTP_SECONDS = REGISTRY.histogram(
+    "cv_http_request_duration_seconds", "Time to response headers by route (streamed bodies excluded).", ("route",))
+HTTP_IN_FLIGHT = REGISTRY.gauge("cv_http_requests_in_flight", "Requests being handled, including open streams.")
+ANALYZE_REQUESTS = REGISTRY.counter(
+    "cv_analyze_requests_total", "Analyses by endpoint, model, prompt type and outcome (X-Cache state, ERROR, BUSY or LIMITED).",
+    ("endpoint", "model", "prompt_type", "outcome"))
+
+ADMISSION_REJECTIONS = REGISTRY.counter(
+    "cv_admission_rejections_total", "Analyses refused before reaching upstream, by reason.", ("reason",))
+
+
+def count_analysis(endpoint, model, prompt_type, outcome):
+    ANALYZE_REQUESTS.inc(endpoint=endpoint, model=model, prompt_type=prompt_type or "none", outcome=outcome)
+
+
+def client_id():
+    if TRUST_PROXY:
+        forwarded = request.headers.get('X-Forwarded-For', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.remote_addr or "-"
+
+
+def retry_response(message, status, retry_after):
+    response = jsonify({"error": message})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def rate_limited(cost=1):
+    """客户端令牌不足时返回 429 响应，否则 None"""
+    wait = ANALYZE_LIMITER.take(client_id(), cost)
+    if not wait:
+        return None
+    ADMISSION_REJECTIONS.inc(reason="rate_limited")
+    return retry_response(f"请求过于频繁，请 {math.ceil(wait)} 秒后重试", 429, wait)
+
+
+def busy_response(error, model):
+    """排队已满 -> 429，排队超时 -> 503；Retry-After 取该提供方的 EWMA 延迟"""
+    full = isinstance(error, QueueFull)
+    ADMISSION_REJECTIONS.inc(reason="queue_full" if full else "queue_timeout")
+    return retry_response(str(error), 429 if full else 503, LLM_ROUTER.expected_latency(model) or 2)
+
+
+def load_tile_index():
+    """读取瓦片索引；文件被流水线重写后自动重新加载。"""
+    path = TILE_DIR / "index.json"
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None, None
+    if _tile_index_cache["mtime"] != mtime:
+        raw = path.read_bytes()
+        _tile_index_cache.update(
+            mtime=mtime,
+            index=json.loads(raw),
+            etag=hashlib.sha256(raw).hexdigest())
+    return _tile_index_cache["index"], _tile_index_cache["etag"]
+
+
+def cached_json_file(path, etag, max_age, immutable=False):
+    """以 ETag + Cache-Control 返回磁盘上的 JSON，客户端接受 gzip 时直接发送预压缩副本。"""
+    gz_path = path.with_name(path.name + ".gz")
+    use_gzip = "gzip" in request.headers.get("Accept-Encoding", "") and gz_path.exists()
+    response = Response(
+        (gz_path if use_gzip else path).read_bytes(), mimetype="application/json")
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+        etag = f"{etag}-gz"
+    response.headers["Vary"] = "Accept-Encoding"
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if immutable:
+        response.cache_control.immutable = True
+    return response.make_conditional(request)
+
+
 # 模拟数据生成器
 
 
@@ -72,76 +274,93 @@ def generate_mock_response(text, context, prompt_type=None):
 # 注意：以下函数在没有真实 API Key 的情况下会返回模拟或错误信息
 
 
+def deepseek_payload(text, context, prompt_type=None):
+    if prompt_type == "scholar_profile":
+        name = text
+        desc = context.get("desc", "")
+        tags = ", ".join(context.get("concepts", []))
+        view_mode = context.get("leaderboardView")
+        system_prompt = "你是一个AI名人堂解说员。请用 Markdown 格式回答，语气专业且带有崇敬感。"
+        if view_mode == "nankai":
+            user_content = (
+                f"请介绍南开大学计算机视觉领域的杰出学者 {name}。\n"
+                f"他/她在南开大学媒体计算团队（NKU Media Lab）中扮演着重要角色。\n"
+                f"请重点解读其在 CV 领域的核心学术地位，以及对他/她所代表的南开视觉研究力量的评价。"
+            )
+        else:
+            user_content = (
+                f"请介绍计算机科学家 {name}。\n"
+                f"背景信息：{desc}\n"
+                f"请用 Markdown 格式回答：\n"
+                f"1. **👑 封神理由**：一句话概括他为什么是 Top 级别。\n"
+                f"2. **🧠 核心贡献**：通俗解释他的 1-2 个代表作（如 {tags}）。\n"
+                f"3. **🌟 历史地位**：他在 AI 发展长河中的坐标。\n"
+                f"字数 250 字以内，保持简洁有力。"
+            )
+    elif prompt_type == "paper_impact":
+        title = text
+        system_prompt = "你是一个技术史学家。请用 Markdown 格式解读经典论文。"
+        user_content = (
+            f"经典论文《{title}》是引用量极高的镇山之作。\n"
+            f"请以【技术史学家】的视角解读：\n"
+            f"1. **💥 破局点**：在它出现之前，领域面临什么死胡同？\n"
+            f"2. **🔑 核心魔法**：它用什么简单的直觉解决了问题？\n"
+            f"3. **🌍 世界回响**：它如何影响了后来的研究？\n"
+            f"字数 250 字以内，使用 Markdown 列表格式，保持简洁。"
+        )
+    else:
+        system_prompt = "你是一个专业的计算机视觉研究助手。请直接输出分析内容，不要包含'好的'、'以下是分析'等客套话。**回答必须非常简明扼要，严格控制篇幅，只列出最核心的定义、关键技术点和趋势，避免任何冗余解释。**请使用 Markdown 格式。对于数学公式，请使用 LaTeX 格式，行内公式用 \\( ... \\) 包裹，独立公式用 \\[ ... \\] 包裹。"
+        user_content = f"请简要分析计算机视觉中的概念: {text}。上下文信息: {json.dumps(context)}"
+
+    return {
+        "model": "deepseek-chat",
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ],
+        "max_tokens": 1024
+    }
+
+
 def call_deepseek(text, context, api_key, prompt_type=None):
     if not api_key:
         # 如果没有 Key，为了演示效果，返回一个带标记的 Mock 数据
-        time.sleep(1)
+        simulate_latency(DEMO_LATENCY)
         return generate_mock_response(text, context, prompt_type)
 
     # 实际调用 DeepSeek API 的代码示例 (需根据官方文档调整)
     try:
-        url = "https://api.deepseek.com/v1/chat/completions"
+        url = PROVIDER_URLS["deepseek"]
         headers = {"Authorization": f"Bearer {api_key}",
                    "Content-Type": "application/json"}
 
-        if prompt_type == "scholar_profile":
-            name = text
-            desc = context.get("desc", "")
-            tags = ", ".join(context.get("concepts", []))
-            view_mode = context.get("leaderboardView")
-            system_prompt = "你是一个AI名人堂解说员。请用 Markdown 格式回答，语气专业且带有崇敬感。"
-            if view_mode == "nankai":
-                user_content = (
-                    f"请介绍南开大学计算机视觉领域的杰出学者 {name}。\n"
-                    f"他/她在南开大学媒体计算团队（NKU Media Lab）中扮演着重要角色。\n"
-                    f"请重点解读其在 CV 领域的核心学术地位，以及对他/她所代表的南开视觉研究力量的评价。"
-                )
-            else:
-                user_content = (
-                    f"请介绍计算机科学家 {name}。\n"
-                    f"背景信息：{desc}\n"
-                    f"请用 Markdown 格式回答：\n"
-                    f"1. **👑 封神理由**：一句话概括他为什么是 Top 级别。\n"
-                    f"2. **🧠 核心贡献**：通俗解释他的 1-2 个代表作（如 {tags}）。\n"
-                    f"3. **🌟 历史地位**：他在 AI 发展长河中的坐标。\n"
-                    f"字数 250 字以内，保持简洁有力。"
-                )
-        elif prompt_type == "paper_impact":
-            title = text
-            system_prompt = "你是一个技术史学家。请用 Markdown 格式解读经典论文。"
-            user_content = (
-                f"经典论文《{title}》是引用量极高的镇山之作。\n"
-                f"请以【技术史学家】的视角解读：\n"
-                f"1. **💥 破局点**：在它出现之前，领域面临什么死胡同？\n"
-                f"2. **🔑 核心魔法**：它用什么简单的直觉解决了问题？\n"
-                f"3. **🌍 世界回响**：它如何影响了后来的研究？\n"
-                f"字数 250 字以内，使用 Markdown 列表格式，保持简洁。"
-            )
-        else:
-            system_prompt = "你是一个专业的计算机视觉研究助手。请直接输出分析内容，不要包含'好的'、'以下是分析'等客套话。**回答必须非常简明扼要，严格控制篇幅，只列出最核心的定义、关键技术点和趋势，避免任何冗余解释。**请使用 Markdown 格式。对于数学公式，请使用 LaTeX 格式，行内公式用 \\( ... \\) 包裹，独立公式用 \\[ ... \\] 包裹。"
-            user_content = f"请简要分析计算机视觉中的概念: {text}。上下文信息: {json.dumps(context)}"
-
-        payload = {
-            "model": "deepseek-chat",
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_content}
-            ],
-            "max_tokens": 1024
-        }
-        response = requests.post(url, headers=headers,
-                                 json=payload, timeout=60)
-        response.raise_for_status()
+        payload = deepseek_payload(text, context, prompt_type)
+        response = PROVIDER_CLIENTS["deepseek"].post(url, headers=headers, json=payload)
         result = response.json()
         content = result['choices'][0]['message']['content']
         return {"summary": content, "keywords": ["DeepSeek-API"], "confidence": 1.0}
+    except ProviderBusy:
+        raise
     except Exception as e:
         return {"error": f"DeepSeek API 调用失败: {str(e)}"}
 
 
+def chatgpt_payload(text, context, prompt_type=None):
+    system_prompt = "你是一个专业的计算机视觉研究助手。请直接输出分析内容，不要包含任何客套话。**回答必须非常简明扼要，严格控制篇幅，只列出最核心的定义、关键技术点和趋势，避免任何冗余解释。**请使用 Markdown 格式。对于数学公式，请使用 LaTeX 格式，行内公式用 \\( ... \\) 包裹，独立公式用 \\[ ... \\] 包裹。"
+
+    return {
+        "model": "gpt-3.5-turbo",
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"分析 CV 论文主题: {text}。背景: {context}"}
+        ],
+        "max_tokens": 1024
+    }
+
+
 def call_chatgpt(text, context, api_key):
     if not api_key:
-        time.sleep(1)
+        simulate_latency(DEMO_LATENCY)
         return {
             "summary": f"[ChatGPT 模式] (未配置 API Key) 作为 AI 语言模型，我认为 '{text}' 是个有趣的话题。",
             "keywords": ["OpenAI", "GPT-4", "NLP"],
@@ -149,33 +368,24 @@ def call_chatgpt(text, context, api_key):
         }
     # 实际调用 OpenAI API 的代码示例
     try:
-        url = "https://api.openai.com/v1/chat/completions"
+        url = PROVIDER_URLS["chatgpt"]
         headers = {"Authorization": f"Bearer {api_key}",
                    "Content-Type": "application/json"}
 
-        system_prompt = "你是一个专业的计算机视觉研究助手。请直接输出分析内容，不要包含任何客套话。**回答必须非常简明扼要，严格控制篇幅，只列出最核心的定义、关键技术点和趋势，避免任何冗余解释。**请使用 Markdown 格式。对于数学公式，请使用 LaTeX 格式，行内公式用 \\( ... \\) 包裹，独立公式用 \\[ ... \\] 包裹。"
-
-        payload = {
-            "model": "gpt-3.5-turbo",
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"分析 CV 论文主题: {text}。背景: {context}"}
-            ],
-            "max_tokens": 1024
-        }
-        response = requests.post(url, headers=headers,
-                                 json=payload, timeout=60)
-        response.raise_for_status()
+        payload = chatgpt_payload(text, context)
+        response = PROVIDER_CLIENTS["chatgpt"].post(url, headers=headers, json=payload)
         result = response.json()
         content = result['choices'][0]['message']['content']
         return {"summary": content, "keywords": ["GPT-API"], "confidence": 1.0}
+    except ProviderBusy:
+        raise
     except Exception as e:
         return {"error": f"OpenAI API 调用失败: {str(e)}"}
 
 
 def call_gemini(text, context, api_key):
     if not api_key:
-        time.sleep(1)
+        simulate_latency(DEMO_LATENCY)
         return {
             "summary": f"[Gemini 模式] (未配置 API Key) Google 的多模态模型正在分析 '{text}' 的视觉与文本关联。",
             "keywords": ["Gemini", "Google", "Multimodal"],
@@ -187,7 +397,7 @@ def call_gemini(text, context, api_key):
 
 def call_doubao(text, context, api_key):
     if not api_key:
-        time.sleep(1)
+        simulate_latency(DEMO_LATENCY)
         return {
             "summary": f"[豆包模式] (未配置 API Key) 字节跳动豆包大模型为您解读 '{text}'。",
             "keywords": ["Doubao", "ByteDance", "Chinese"],
@@ -197,6 +407,65 @@ def call_doubao(text, context, api_key):
     return {"summary": "Doubao API 暂未实现", "keywords": [], "confidence": 0.0}
 
 
+def call_model(model, text, context, api_key, prompt_type=None):
+    """按模型名分发；不支持的模型返回 None"""
+    if model == 'mock':
+        simulate_latency(MOCK_LATENCY)  # 模拟网络延迟
+        return generate_mock_response(text, context, prompt_type)
+    if model == 'deepseek':
+        return call_deepseek(text, context, api_key, prompt_type)
+    if model == 'chatgpt':
+        return call_chatgpt(text, context, api_key)
+    if model == 'gemini':
+        return call_gemini(text, context, api_key)
+    if model == 'doubao':
+        return call_doubao(text, context, api_key)
+    return None
+
+
+def degraded_response(text, context, prompt_type=None):
+    """上游熔断或超出时限时的演示响应，带 degraded 标记，不写入缓存"""
+    return dict(generate_mock_response(text, context, prompt_type), degraded=True, provider="mock")
+
+
+def cached_call(key, model, text, context, api_key, prompt_type=None):
+    """领头请求经路由调用上游并在释放等待者之前写入缓存，之后到达的请求直接命中缓存"""
+    def attempt(provider):
+        # 对冲到备用上游时使用其自身配置的 Key，结果按备用上游的缓存键保存
+        provider_key = api_key if provider == model else API_KEYS[provider]
+        result = call_model(provider, text, context, provider_key, prompt_type)
+        if "error" not in result:
+            slot = key if provider == model else cache_key(provider, prompt_type, text, context)
+            LLM_CACHE.set(slot, result, provider, prompt_type)
+        return result
+
+    backups = {name for name in PROVIDER_URLS if API_KEYS.get(name)}
+    result, provider = LLM_ROUTER.call(
+        model, attempt, lambda: degraded_response(text, context, prompt_type), backups)
+    if provider not in (model, "mock"):
+        result = dict(result, provider=provider)
+    return result
+
+
+def run_analysis(model, text, context, api_key, prompt_type=None, refresh=False):
+    """缓存 -> 合并并发 -> 上游，返回 (result, X-Cache 状态)；并发已满时抛出 ProviderBusy"""
+    # 只缓存真实 API 的结果；未配置 Key 时的演示响应不落盘
+    if model not in API_KEYS or not api_key:
+        return call_model(model, text, context, api_key, prompt_type), 'SKIP'
+    key = cache_key(model, prompt_type, text, context)
+    if refresh:
+        LLM_CACHE.bypass()
+    else:
+        cached = LLM_CACHE.get(key)
+        if cached is not None:
+            return cached, 'HIT'
+    result, shared = LLM_INFLIGHT.do(
+        key, lambda: cached_call(key, model, text, context, api_key, prompt_type))
+    if result.get("degraded"):
+        return result, 'DEGRADED'
+    return result, 'SHARED' if shared else ('BYPASS' if refresh else 'MISS')
+
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
     try:
@@ -217,37 +486,595 @@ def analyze():
         print(
             f"[{time.strftime('%H:%M:%S')}] 收到分析请求: Model={model}, Type={prompt_type}, Text={text[:20]}...")
 
-        if model == 'mock':
-            time.sleep(0.8)  # 模拟网络延迟
-            result = generate_mock_response(text, context, prompt_type)
-        elif model == 'deepseek':
-            result = call_deepseek(text, context, api_key, prompt_type)
-        elif model == 'chatgpt':
-            result = call_chatgpt(text, context, api_key)
-        elif model == 'gemini':
-            result = call_gemini(text, context, api_key)
-        elif model == 'doubao':
-            result = call_doubao(text, context, api_key)
-        else:
+        if model not in API_KEYS and model != 'mock':
             return jsonify({"error": f"不支持的模型: {model}"}), 400
+        limited = rate_limited()
+        if limited is not None:
+            count_analysis("analyze", model, prompt_type, "LIMITED")
+            return limited
+
+        refresh = bool(data.get('refresh')) or 'no-cache' in request.headers.get('Cache-Control', '')
+        try:
+            result, cache_state = run_analysis(model, text, context, api_key, prompt_type, refresh)
+        except ProviderBusy:
+            count_analysis("analyze", model, prompt_type, "BUSY")
+            raise
 
         # 如果结果中有错误信息
         if "error" in result:
+            count_analysis("analyze", model, prompt_type, "ERROR")
             return jsonify(result), 500
+        count_analysis("analyze", model, prompt_type, cache_state)
 
-        return jsonify(result)
+        response = jsonify(result)
+        response.headers['X-Cache'] = cache_state
+        return response
 
+    except ProviderBusy as e:
+        return busy_response(e, model)
     except Exception as e:
         print(f"服务器内部错误: {e}")
         return jsonify({"error": "服务器内部错误"}), 500
 
 
+# 支持 `stream: true` 的上游：请求体构造函数与结果里的关键词标签
+STREAM_PAYLOADS = {"deepseek": deepseek_payload, "chatgpt": chatgpt_payload}
+STREAM_LABELS = {"deepseek": "DeepSeek-API", "chatgpt": "GPT-API"}
+MOCK_STREAM_CHUNK = 12  # 字符
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def chunked(text, size=MOCK_STREAM_CHUNK):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def provider_deltas(model, text, context, api_key, prompt_type=None):
+    """逐段产出上游 `stream: true` 返回的增量文本（OpenAI 兼容的 SSE 协议）"""
+    payload = dict(STREAM_PAYLOADS[model](text, context, prompt_type), stream=True)
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    for line in PROVIDER_CLIENTS[model].stream_lines(PROVIDER_URLS[model], headers=headers, json=payload):
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        choices = json.loads(data).get("choices") or [{}]
+        delta = (choices[0].get("delta") or {}).get("content")
+        if delta:
+            yield delta
+
+
+@app.route('/api/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """与 /api/analyze 相同的请求体，以 server-sent events 逐段返回：
+
+    event: meta   {"model", "cache"}
+    event: delta  {"text"}               增量文本，可多次
+    event: done   {summary, keywords, confidence}
+    event: error  {"error"}
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "无效的请求数据"}), 400
+    text = data.get('text', '')
+    context = data.get('context', {})
+    model = data.get('model', 'mock')
+    prompt_type = data.get('prompt_type')
+    api_key = data.get('api_key', '') or API_KEYS.get(model, "")
+    if model not in API_KEYS and model != 'mock':
+        return jsonify({"error": f"不支持的模型: {model}"}), 400
+    limited = rate_limited()
+    if limited is not None:
+        count_analysis("stream", model, prompt_type, "LIMITED")
+        return limited
+
+    print(
+        f"[{time.strftime('%H:%M:%S')}] 收到流式分析请求: Model={model}, Type={prompt_type}, Text={text[:20]}...")
+    cacheable = model in API_KEYS and bool(api_key)
+    key = cache_key(model, prompt_type, text, context) if cacheable else None
+    refresh = bool(data.get('refresh')) or 'no-cache' in request.headers.get('Cache-Control', '')
+
+    def replay(result, state):
+        """完整结果按事件输出：命中缓存时一次发完，否则切块模拟逐字输出"""
+        yield sse("meta", {"model": model, "cache": state})
+        if "error" in result:
+            count_analysis("stream", model, prompt_type, "ERROR")
+            yield sse("error", result)
+            return
+        count_analysis("stream", model, prompt_type, state)
+        if state == "HIT":
+            yield sse("delta", {"text": result.get("summary", "")})
+        else:
+            for delta in chunked(result.get("summary", "")):
+                yield sse("delta", {"text": delta})
+                time.sleep(MOCK_STREAM_INTERVAL)
+        yield sse("done", result)
+
+    def generate():
+        if cacheable and model not in STREAM_PAYLOADS:
+            # 上游不支持流式：与 /api/analyze 一样经缓存、合并并发与路由，再输出完整结果
+            try:
+                result, state = run_analysis(model, text, context, api_key, prompt_type, refresh)
+            except ProviderBusy as e:
+                count_analysis("stream", model, prompt_type, "BUSY")
+                yield sse("error", {"error": str(e)})
+                return
+            yield from replay(result, state)
+            return
+
+        cached = None
+        if cacheable and refresh:
+            LLM_CACHE.bypass()
+        elif cacheable:
+            cached = LLM_CACHE.get(key)
+        if cached is not None:
+            yield from replay(cached, "HIT")
+            return
+
+        streaming = model in STREAM_PAYLOADS and bool(api_key)
+        health = LLM_ROUTER.health(model) if streaming else None
+        if streaming and health.allow():
+            yield sse("meta", {"model": model, "cache": "BYPASS" if refresh else "MISS"})
+            parts = []
+            started = time.perf_counter()
+            settled = False
+            try:
+                for delta in provider_deltas(model, text, context, api_key, prompt_type):
+                    parts.append(delta)
+                    yield sse("delta", {"text": delta})
+                settled = True
+            except ProviderBusy as e:
+                settled = True
+                health.release_probe()
+                count_analysis("stream", model, prompt_type, "BUSY")
+                yield sse("error", {"error": str(e)})
+                return
+            except Exception as e:
+                settled = True
+                health.record(time.perf_counter() - started, False)
+                count_analysis("stream", model, prompt_type, "ERROR")
+                yield sse("error", {"error": f"{model} 流式调用失败: {str(e)}"})
+                return
+            finally:
+                # 客户端中途断开（GeneratorExit）时上游没有给出结论，只归还半开探测名额
+                if not settled:
+                    health.release_probe()
+            health.record(time.perf_counter() - started, True)
+            count_analysis("stream", model, prompt_type, "BYPASS" if refresh else "MISS")
+            result = {"summary": "".join(parts), "keywords": [STREAM_LABELS[model]], "confidence": 1.0}
+            LLM_CACHE.set(key, result, model, prompt_type)
+            yield sse("done", result)
+            return
+
+        # 已熔断或未配置 Key 时返回演示响应
+        if streaming:
+            yield from replay(degraded_response(text, context, prompt_type), "DEGRADED")
+        else:
+            yield from replay(generate_mock_response(text, context, prompt_type), "SKIP")
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # 关闭反向代理缓冲，保证逐段送达
+    return response
+
+
+# 批量预热：每批最多条目数与同时在途的上游调用数（不超过该提供方的并发上限）
+BATCH_MAX_ITEMS = 200
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "4"))
+
+
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """批量分析，按完成顺序以 NDJSON 逐行返回，结果同时写入响应缓存：
+
+    {"model", "api_key", "refresh", "concurrency", "items": [{"id", "text", "context", "prompt_type"}]}
+    -> {"index", "id", "status", "cache", "result" | "error"} ...  {"done": true, "count", "ok", "took_ms"}
+    """
+    started = time.perf_counter()
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "items 必须是非空数组"}), 400
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({"error": f"单批最多 {BATCH_MAX_ITEMS} 条"}), 400
+    model = data.get('model', 'mock')
+    if model not in API_KEYS and model != 'mock':
+        return jsonify({"error": f"不支持的模型: {model}"}), 400
+    api_key = data.get('api_key', '') or API_KEYS.get(model, "")
+    refresh = bool(data.get('refresh'))
+    client = PROVIDER_CLIENTS.get(model)
+    cap = min(BATCH_CONCURRENCY, client.max_concurrency) if client else BATCH_CONCURRENCY
+    try:
+        workers = max(1, min(int(data.get('concurrency') or cap), cap, len(items)))
+    except (TypeError, ValueError):
+        return jsonify({"error": "concurrency 必须是整数"}), 400
+    limited = rate_limited(len(items))  # 每条占一个令牌（不超过桶容量）
+    if limited is not None:
+        return limited
+    print(f"[{time.strftime('%H:%M:%S')}] 收到批量分析请求: Model={model}, Items={len(items)}, Workers={workers}")
+
+    def analyze_one(item):
+        if not isinstance(item, dict) or not item.get('text'):
+            return 400, {"error": "缺少 text"}, None
+        try:
+            result, cache_state = run_analysis(model, item['text'], item.get('context') or {}, api_key,
+                                               item.get('prompt_type'), refresh)
+        except ProviderBusy as e:
+            count_analysis("batch", model, item.get('prompt_type'), "BUSY")
+            return (429 if isinstance(e, QueueFull) else 503), {"error": str(e)}, None
+        count_analysis("batch", model, item.get('prompt_type'), "ERROR" if "error" in result else cache_state)
+        return (500 if "error" in result else 200), result, cache_state
+
+    def generate():
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {executor.submit(analyze_one, item): index for index, item in enumerate(items)}
+        ok = 0
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                item = items[index] if isinstance(items[index], dict) else {}
+                try:
+                    status, result, cache_state = future.result()
+                except Exception as e:
+                    status, result, cache_state = 500, {"error": f"服务器内部错误: {e}"}, None
+                line = {"index": index, "id": item.get('id'), "status": status, "cache": cache_state}
+                if status == 200:
+                    ok += 1
+                    line["result"] = result
+                else:
+                    line["error"] = result.get("error")
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+            yield json.dumps({"done": True, "count": len(items), "ok": ok,
+                              "took_ms": round((time.perf_counter() - started) * 1000, 3)}) + "\n"
+        finally:
+            # 客户端中途断开时不再启动剩余条目
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def etag_matches(header, etag):
+    """If-None-Match 按弱比较：列表中任一标签（忽略 W/ 前缀）相同或为 * 即命中"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/").strip('"') == etag for tag in header.split(","))
+
+
+def iter_slices(data, start, stop):
+    for offset in range(start, stop, DATA_CHUNK):
+        yield data[offset:min(offset + DATA_CHUNK, stop)]
+
+
+@app.route('/data/<path:name>', methods=['GET'])
+def data_file(name):
+    """web/data 下的数据集：强 ETag 与 If-None-Match 304、单段 Range（仅对原始字节）、
+    按 Accept-Encoding 选择 .br / .gz 预压缩副本；assets/ 下带哈希的文件长期缓存。"""
+    asset = DATA_ASSETS.get(name)
+    if asset is None:
+        return jsonify({"error": f"数据文件不存在: {name}"}), 404
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and if_range and if_range.strip() != f'"{asset.etag}"':
+        range_header = None  # 文件已变化，改发完整内容
+    encoding = None if range_header else select_encoding(asset, request.headers.get('Accept-Encoding'))
+    body, etag = asset.variant(encoding)
+
+    headers = {"ETag": f'"{etag}"', "Vary": "Accept-Encoding", "Accept-Ranges": "bytes"}
+    if name.startswith("assets/"):
+        headers["Cache-Control"] = f"public, max-age={IMMUTABLE_CACHE_SECONDS}, immutable"
+    else:
+        headers["Cache-Control"] = f"public, max-age={DATA_CACHE_SECONDS}"
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        return Response(status=304, headers=headers)
+
+    status, start, stop = 200, 0, len(body)
+    if range_header:
+        try:
+            span = parse_range(range_header, len(body))
+        except ValueError:
+            return Response(status=416, headers=dict(headers, **{"Content-Range": f"bytes */{len(body)}"}))
+        if span is not None:
+            status, start, stop = 206, span[0], span[1] + 1
+            headers["Content-Range"] = f"bytes {start}-{stop - 1}/{len(body)}"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    headers["Content-Length"] = str(stop - start)
+    return Response(iter_slices(body, start, stop), status=status, headers=headers,
+                    content_type=asset.content_type, direct_passthrough=True)
+
+
+@app.route('/api/landscape/tiles/index', methods=['GET'])
+def landscape_tile_index():
+    index, etag = load_tile_index()
+    if index is None:
+        return jsonify({"error": "瓦片尚未生成，请先运行 scripts/landscape_tiles.py"}), 404
+    return cached_json_file(TILE_DIR / "index.json", etag, max_age=60)
+
+
+@app.route('/api/landscape/tiles/<int:z>/<int:x>/<int:y>', methods=['GET'])
+def landscape_tile(z, x, y):
+    index, _ = load_tile_index()
+    if index is None:
+        return jsonify({"error": "瓦片尚未生成，请先运行 scripts/landscape_tiles.py"}), 404
+
+    scope = request.args.get('year', 'all')
+    scope_meta = index["scopes"].get(scope)
+    if scope_meta is None:
+        return jsonify({"error": f"没有 {scope} 年的瓦片"}), 404
+    tile_meta = scope_meta["tiles"].get(f"{z}/{x}/{y}")
+    if tile_meta is None:
+        return jsonify({"error": "瓦片不存在，请使用上层叶子瓦片"}), 404
+
+    # URL 携带内容哈希 (?v=) 时内容永不变化，可长期缓存
+    version = request.args.get('v')
+    immutable = bool(version) and tile_meta["sha256"].startswith(version)
+    return cached_json_file(
+        TILE_DIR / scope / str(z) / str(x) / f"{y}.json",
+        tile_meta["sha256"],
+        max_age=IMMUTABLE_CACHE_SECONDS if immutable else TILE_CACHE_SECONDS,
+        immutable=immutable)
+
+
+def query_filters():
+    """解析 year / venue 过滤参数；venue=ALL 等同于不过滤。"""
+    year = request.args.get('year', type=int)
+    venue = request.args.get('venue')
+    if venue in (None, '', 'ALL'):
+        venue = None
+    return year, venue
+
+
+def spatial_response(index, ids, started, extra=None, distances=None):
+    results = []
+    for pos, idx in enumerate(ids.tolist()):
+        record = dict(index.records[idx])
+        if distances is not None:
+            record["distance"] = round(float(distances[pos]), 4)
+        results.append(record)
+    payload = {"results": results, "took_ms": round((time.perf_counter() - started) * 1000, 3)}
+    payload.update(extra or {})
+    response = jsonify(payload)
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response
+
+
+@app.route('/api/landscape/nearest', methods=['GET'])
+def landscape_nearest():
+    started = time.perf_counter()
+    x = request.args.get('x', type=float)
+    y = request.args.get('y', type=float)
+    if x is None or y is None:
+        return jsonify({"error": "缺少坐标参数 x / y"}), 400
+    k = max(1, min(SPATIAL_MAX_K, request.args.get('k', 1, type=int)))
+    index = LANDSCAPE_INDEX.get()
+    if index is None:
+        return jsonify({"error": "landscape_data.json 不存在"}), 404
+    year, venue = query_filters()
+    ids, distances = index.nearest(x, y, k, year, venue)
+    return spatial_response(index, ids, started, distances=distances)
+
+
+@app.route('/api/landscape/box', methods=['GET'])
+def landscape_box():
+    started = time.perf_counter()
+    bounds = [request.args.get(name, type=float) for name in ('x0', 'x1', 'y0', 'y1')]
+    if any(value is None for value in bounds):
+        return jsonify({"error": "缺少范围参数 x0 / x1 / y0 / y1"}), 400
+    limit = max(1, min(SPATIAL_MAX_LIMIT, request.args.get('limit', 500, type=int)))
+    index = LANDSCAPE_INDEX.get()
+    if index is None:
+        return jsonify({"error": "landscape_data.json 不存在"}), 404
+    year, venue = query_filters()
+    total, ids = index.box(*bounds, year=year, venue=venue, limit=limit)
+    return spatial_response(index, ids, started, extra={"count": total})
+
+
+@app.route('/api/search', methods=['GET'])
+def search_papers():
+    started = time.perf_counter()
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({"error": "缺少查询参数 q"}), 400
+    limit = max(1, min(SEARCH_MAX_LIMIT, request.args.get('limit', 20, type=int)))
+    index = SEARCH_INDEX.get()
+    if index is None:
+        return jsonify({"error": "search_index.bin 不存在，请先运行 scripts/process_advanced.py"}), 404
+    year, venue = query_filters()
+    total, hits = index.search(query, year=year, venue=venue, limit=limit)
+    results = [dict(index.record(doc), score=round(score, 4)) for doc, score in hits]
+    response = jsonify({
+        "query": query,
+        "count": total,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 3),
+    })
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response
+
+
+def list_arg(name):
+    """逗号分隔或重复出现的参数 -> 排序去重的 tuple（便于作为缓存键）；空则 None。"""
+    values = set()
+    for raw in request.args.getlist(name):
+        values.update(part.strip() for part in raw.split(',') if part.strip())
+    values.discard('ALL')
+    return tuple(sorted(values)) or None
+
+
+def year_range_arg(text):
+    """'2021' 或 '2019-2023' -> (first, last)。"""
+    first, _, last = text.partition('-')
+    first, last = int(first), int(last or first)
+    return (first, last) if first <= last else (last, first)
+
+
+@app.route('/api/stats', methods=['GET'])
+def corpus_stats():
+    started = time.perf_counter()
+    group_by = tuple(part.strip() for part in request.args.get('group_by', 'year').split(',') if part.strip())
+    if not group_by or len(set(group_by)) != len(group_by) or \
+            any(dim not in STATS_DIMENSIONS for dim in group_by):
+        return jsonify({"error": f"group_by 只能取 {', '.join(STATS_DIMENSIONS)} 且不可重复"}), 400
+    try:
+        years = year_range_arg(request.args['year']) if request.args.get('year') else None
+    except ValueError:
+        return jsonify({"error": "year 需为 2021 或 2019-2023 形式"}), 400
+    top = request.args.get('top', type=int)
+    limit = max(1, min(STATS_MAX_ROWS, request.args.get('limit', 1000, type=int)))
+
+    index = STATS_INDEX.get()
+    if index is None:
+        return jsonify({"error": "corpus_columns.bin 不存在，请先运行 scripts/process_advanced.py"}), 404
+    result = index.query(
+        group_by, years, list_arg('venue'), list_arg('concept'),
+        request.args.get('min_citations', type=int), request.args.get('max_citations', type=int),
+        top if top and top > 0 else None, limit)
+    response = jsonify(dict(result, took_ms=round((time.perf_counter() - started) * 1000, 3)))
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response
+
+
+@app.route('/api/flow', methods=['GET'])
+def flow_links():
+    started = time.perf_counter()
+    try:
+        first, last = year_range_arg(request.args['year']) if request.args.get('year') else (None, None)
+    except ValueError:
+        return jsonify({"error": "year 需为 2021 或 2019-2023 形式"}), 400
+    top = request.args.get('top', type=int)
+    cube = FLOW_CUBE.get()
+    if cube is None:
+        return jsonify({"error": "flow_cube.json 不存在，请先运行 scripts/process_advanced.py"}), 404
+    payload = cube.sankey(
+        first, last,
+        min_value=max(0.0, request.args.get('min_value', 0.0, type=float)),
+        top=top if top and top > 0 else None,
+        problems=list_arg('problem'),
+        methods=list_arg('method'),
+        compare=request.args.get('compare', '').lower() in ('1', 'true', 'yes'))
+    payload["took_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    response = jsonify(payload)
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response
+
+
+@app.route('/api/wordcloud', methods=['GET'])
+def wordcloud_range():
+    started = time.perf_counter()
+    try:
+        first, last = year_range_arg(request.args['year']) if request.args.get('year') else (None, None)
+    except ValueError:
+        return jsonify({"error": "year 需为 2021 或 2019-2023 形式"}), 400
+    weighting = request.args.get('weight', 'citations')
+    if weighting not in KEYWORD_WEIGHTINGS:
+        return jsonify({"error": f"weight 只能取 {', '.join(KEYWORD_WEIGHTINGS)}"}), 400
+    k = max(1, min(WORDCLOUD_MAX_K, request.args.get('k', 50, type=int)))
+    cube = KEYWORD_CUBE.get()
+    if cube is None:
+        return jsonify({"error": "keyword_cube.bin 不存在，请先运行 scripts/wordcloud_new.py"}), 404
+    words = cube.top(first, last, k, weighting)
+    response = jsonify({
+        "years": [first or cube.first_year, last or cube.last_year],
+        "weight": weighting,
+        "words": words,
+        "took_ms": round((time.perf_counter() - started) * 1000, 3),
+    })
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response
+
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_started = time.perf_counter()
+    HTTP_IN_FLIGHT.inc()
+
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    HTTP_SECONDS.observe(time.perf_counter() - g.get("metrics_started", time.perf_counter()), route=route)
+    return response
+
+
+@app.teardown_request
+def finish_request_metrics(error=None):
+    # 流式响应的请求上下文保留到生成器结束，因此在途数包含未结束的流
+    HTTP_IN_FLIGHT.dec()
+
+
+@REGISTRY.collector
+def collect_backend_metrics():
+    """抓取时把各组件已有的 stats() 转成指标"""
+    cache = LLM_CACHE.stats()
+    inflight = LLM_INFLIGHT.stats()
+    router = LLM_ROUTER.stats()
+    families = [
+        ("cv_llm_cache_events_total", "counter", "LLM response cache lookups and writes.",
+         [({"event": event}, cache[event]) for event in ("memory_hits", "disk_hits", "misses", "writes", "bypassed")]),
+        ("cv_llm_cache_entries", "gauge", "Cached LLM responses by tier.",
+         [({"tier": tier}, cache[f"{tier}_entries"]) for tier in ("memory", "disk") if f"{tier}_entries" in cache]),
+        ("cv_llm_coalesced_total", "counter", "Analyses that waited on an identical in-flight call.",
+         [({}, inflight["coalesced"])]),
+        ("cv_llm_inflight_keys", "gauge", "Distinct analyses currently calling upstream.",
+         [({}, inflight["in_flight"])]),
+        ("cv_provider_in_flight", "gauge", "Upstream calls holding a provider slot.",
+         [({"provider": name}, client.stats()["in_flight"]) for name, client in PROVIDER_CLIENTS.items()]),
+        ("cv_provider_max_concurrency", "gauge", "Provider slot limit.",
+         [({"provider": name}, client.max_concurrency) for name, client in PROVIDER_CLIENTS.items()]),
+        ("cv_provider_waiting", "gauge", "Upstream calls queued for a provider slot.",
+         [({"provider": name}, client.stats()["waiting"]) for name, client in PROVIDER_CLIENTS.items()]),
+        ("cv_rate_limit_clients", "gauge", "Clients with a live token bucket.",
+         [({}, ANALYZE_LIMITER.stats()["clients"])]),
+        ("cv_router_events_total", "counter", "Provider router decisions.",
+         [({"event": event}, value) for event, value in router.items() if isinstance(value, int)]),
+        ("cv_provider_ewma_latency_seconds", "gauge", "EWMA of upstream latency per provider.",
+         [({"provider": name}, health["ewma_latency_ms"] / 1000)
+          for name, health in router["providers"].items() if health["ewma_latency_ms"] is not None]),
+        ("cv_provider_ewma_error_ratio", "gauge", "EWMA of the upstream error rate per provider.",
+         [({"provider": name}, health["ewma_error"]) for name, health in router["providers"].items()]),
+        ("cv_provider_circuit_state", "gauge", "Circuit breaker state per provider (1 for the current state).",
+         [({"provider": name, "state": state}, int(health["state"] == state))
+          for name, health in router["providers"].items() for state in ("closed", "open", "half-open")]),
+    ]
+    stats = STATS_INDEX.get()
+    if stats is not None:
+        info = stats.query.cache_info()
+        families.append(("cv_stats_cache_events_total", "counter", "/api/stats group-by cache lookups.",
+                         [({"event": "hits"}, info.hits), ({"event": "misses"}, info.misses)]))
+    return families
+
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    return Response(REGISTRY.render(), content_type=METRICS_CONTENT_TYPE)
+
+
 @app.route('/api/health', methods=['GET'])
 def health():
     return jsonify({
         "status": "ok",
         "models": list(API_KEYS.keys()) + ['mock'],
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "llm_cache": LLM_CACHE.stats(),
+        "llm_inflight": LLM_INFLIGHT.stats(),
+        "providers": {name: client.stats() for name, client in PROVIDER_CLIENTS.items()},
+        "router": LLM_ROUTER.stats(),
+        "rate_limit": ANALYZE_LIMITER.stats(),
+        "data_assets": DATA_ASSETS.stats()
     })
 
 
@@ -257,4 +1084,11 @@ if __name__ == '__main__':
     print("Address: http://localhost:5000")
     print("Supported Models: Mock, DeepSeek, ChatGPT, Gemini, Doubao")
     print("="*40)
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    LANDSCAPE_INDEX.get()  # 启动时预建空间索引
+    SEARCH_INDEX.get()
+    STATS_INDEX.get()
+    FLOW_CUBE.get()
+    KEYWORD_CUBE.get()
+    DATA_ASSETS.load()  # 映射 web/data 下的数据集
+    # 多线程模式：上游调用阻塞的只是各自的请求线程，/api/health 等路由照常响应
+    app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
@@ -0,0 +1,168 @@
+"""Uniform-grid spatial index over the landscape coordinates.
+
+Points are bucketed into a G x G grid (about POINTS_PER_CELL points per cell)
+and stored cell-major, so every grid row of a query rectangle is one
+contiguous slice. Box queries touch only the covered cells; nearest-neighbour
+queries walk rings of cells outwards and stop once the next ring cannot hold
+anything closer than the current k-th hit. Both stay roughly constant-time as
+the landscape grows, unlike a linear scan.
+"""
+
+import json
+import math
+import threading
+from pathlib import Path
+
+import numpy as np
+
+POINTS_PER_CELL = 8
+
+
+class LandscapeIndex:
+    def __init__(self, records):
+        self.records = records
+        count = len(records)
+        self.xs = np.fromiter((float(r.get("x") or 0.0) for r in records), dtype=np.float64, count=count)
+        self.ys = np.fromiter((float(r.get("y") or 0.0) for r in records), dtype=np.float64, count=count)
+        self.years = np.fromiter((int(r.get("year") or 0) for r in records), dtype=np.int32, count=count)
+        self.citations = np.fromiter((int(r.get("citations") or 0) for r in records), dtype=np.int64, count=count)
+        self.venue_names = sorted({r.get("venue") or "Others" for r in records})
+        venue_codes = {name: code for code, name in enumerate(self.venue_names)}
+        self.venues = np.fromiter((venue_codes[r.get("venue") or "Others"] for r in records),
+                                  dtype=np.int16, count=count)
+
+        self.grid = max(1, int(math.ceil(math.sqrt(count / POINTS_PER_CELL)))) if count else 1
+        if count:
+            self.x0, self.x1 = float(self.xs.min()), float(self.xs.max())
+            self.y0, self.y1 = float(self.ys.min()), float(self.ys.max())
+        else:
+            self.x0 = self.x1 = self.y0 = self.y1 = 0.0
+        self.cell_w = ((self.x1 - self.x0) or 1.0) / self.grid
+        self.cell_h = ((self.y1 - self.y0) or 1.0) / self.grid
+
+        cells = self._cell_y(self.ys) * self.grid + self._cell_x(self.xs)
+        self.order = np.argsort(cells, kind="stable")
+        self.offsets = np.searchsorted(cells[self.order], np.arange(self.grid * self.grid + 1))
+
+    def _cell_x(self, values):
+        return np.clip(((values - self.x0) / self.cell_w).astype(np.int64), 0, self.grid - 1)
+
+    def _cell_y(self, values):
+        return np.clip(((values - self.y0) / self.cell_h).astype(np.int64), 0, self.grid - 1)
+
+    def _cells(self, cx0, cx1, cy0, cy1):
+        """Point ids of the cell rectangle [cx0, cx1] x [cy0, cy1] (inclusive)."""
+        cx0, cx1 = max(0, cx0), min(self.grid - 1, cx1)
+        cy0, cy1 = max(0, cy0), min(self.grid - 1, cy1)
+        if cx0 > cx1 or cy0 > cy1:
+            return np.empty(0, dtype=np.int64)
+        slices = [self.order[self.offsets[cy * self.grid + cx0]:self.offsets[cy * self.grid + cx1 + 1]]
+                  for cy in range(cy0, cy1 + 1)]
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def _filter(self, ids, year=None, venue=None):
+        if year is not None:
+            ids = ids[self.years[ids] == year]
+        if venue is not None:
+            if venue not in self.venue_names:
+                return ids[:0]
+            ids = ids[self.venues[ids] == self.venue_names.index(venue)]
+        return ids
+
+    def box(self, x0, x1, y0, y1, year=None, venue=None, limit=500):
+        """Papers inside the rectangle, most cited first. Returns (total, ids)."""
+        x0, x1 = sorted((x0, x1))
+        y0, y1 = sorted((y0, y1))
+        ids = self._cells(
+            int(self._cell_x(np.array([x0]))[0]), int(self._cell_x(np.array([x1]))[0]),
+            int(self._cell_y(np.array([y0]))[0]), int(self._cell_y(np.array([y1]))[0]))
+        ids = ids[(self.xs[ids] >= x0) & (self.xs[ids] <= x1) & (self.ys[ids] >= y0) & (self.ys[ids] <= y1)]
+        ids = self._filter(ids, year, venue)
+        total = int(ids.size)
+        if limit is not None and total > limit:
+            top = np.argpartition(-self.citations[ids], limit - 1)[:limit]
+            ids = ids[top]
+        ids = ids[np.argsort(-self.citations[ids], kind="stable")]
+        return total, ids
+
+    def nearest(self, x, y, k=1, year=None, venue=None):
+        """The k closest papers to (x, y). Returns (ids, distances), closest first."""
+        if not self.records or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        cx = int(self._cell_x(np.array([x]))[0])
+        cy = int(self._cell_y(np.array([y]))[0])
+        min_cell = min(self.cell_w, self.cell_h)
+        # 查询点可能落在网格外，先算出它到网格的距离，保证停止条件正确
+        outside = math.hypot(max(self.x0 - x, 0, x - self.x1), max(self.y0 - y, 0, y - self.y1))
+
+        found_ids = []
+        found_dist = []
+        radius = 0
+        while True:
+            if radius == 0:
+                ring = self._cells(cx, cx, cy, cy)
+            else:
+                ring = np.concatenate([
+                    self._cells(cx - radius, cx + radius, cy - radius, cy - radius),
+                    self._cells(cx - radius, cx + radius, cy + radius, cy + radius),
+                    self._cells(cx - radius, cx - radius, cy - radius + 1, cy + radius - 1),
+                    self._cells(cx + radius, cx + radius, cy - radius + 1, cy + radius - 1),
+                ])
+            ring = self._filter(ring, year, venue)
+            if ring.size:
+                found_ids.append(ring)
+                found_dist.append(np.hypot(self.xs[ring] - x, self.ys[ring] - y))
+
+            candidates = sum(part.size for part in found_ids)
+            exhausted = cx - radius <= 0 and cy - radius <= 0 and \
+                cx + radius >= self.grid - 1 and cy + radius >= self.grid - 1
+            if candidates >= k:
+                kth = np.partition(np.concatenate(found_dist), k - 1)[k - 1]
+                # 圈外的点在某一轴上至少相距 radius 个单元格，在网格外的轴上至少相距 outside
+                if kth <= math.hypot(outside, radius * min_cell) or exhausted:
+                    break
+            elif exhausted:
+                break
+            radius += 1
+
+        if not found_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        ids = np.concatenate(found_ids)
+        dist = np.concatenate(found_dist)
+        top = np.argsort(dist, kind="stable")[:k]
+        return ids[top], dist[top]
+
+    def linear_nearest(self, x, y, k=1, year=None, venue=None):
+        """Brute-force reference used by the benchmark."""
+        ids = self._filter(np.arange(len(self.records)), year, venue)
+        dist = np.hypot(self.xs[ids] - x, self.ys[ids] - y)
+        top = np.argsort(dist, kind="stable")[:k]
+        return ids[top], dist[top]
+
+
+def load_landscape_index(path):
+    with Path(path).open("r", encoding="utf-8") as f:
+        return LandscapeIndex(json.load(f))
+
+
+class IndexHolder:
+    """Lazily (re)loads an index via `loader(path)` when its file changes on disk."""
+
+    def __init__(self, path, loader=load_landscape_index):
+        self.path = Path(path)
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._index = None
+
+    def get(self):
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return None
+        if self._mtime != mtime:
+            with self._lock:
+                if self._mtime != mtime:
+                    self._index = self.loader(self.path)
+                    self._mtime = mtime
+        return self._index
@@ -0,0 +1,181 @@
+"""Memory-mapped dataset files for the backend's `/data/<path>` route.
+
+Self-hosted deployments can let Flask serve `web/data` instead of a static
+file server. Every published file (`.json` / `.bin`, see `scripts/publish.py`)
+is mapped read-only once, together with its precompressed `.gz` / `.br`
+siblings, and gets a strong ETag from the sha256 of its identity bytes:
+
+    "<sha256[:16]>"          identity
+    "<sha256[:16]>-gzip"     gzip sibling (a different representation, so a different tag)
+
+`AssetStore.get(name)` returns the mapped `Asset`, re-mapping it when the file
+on disk has been replaced (publishing renames a new file into place, so the old
+mapping stays valid until then) and mapping files published after startup on
+first use. `select_encoding` and `parse_range` implement the parts of
+Accept-Encoding and Range that the route needs: the best available
+precompressed variant, and a single byte range over the identity bytes.
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+from pathlib import Path
+
+SERVED_SUFFIXES = (".json", ".bin")
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}  # 按偏好顺序
+CONTENT_TYPES = {".json": "application/json", ".bin": "application/octet-stream"}
+
+
+def map_file(path):
+    """Read-only mapping of `path` (empty files cannot be mapped and become b"")."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+
+class Asset:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.signature = self._signature(self.path)
+        self.data = map_file(self.path)
+        self.size = len(self.data)
+        self.etag = hashlib.sha256(self.data).hexdigest()[:16]
+        self.content_type = CONTENT_TYPES.get(self.path.suffix, "application/octet-stream")
+        self.encodings = {}
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            sibling = self.path.with_name(self.path.name + suffix)
+            if sibling.is_file():
+                self.encodings[encoding] = map_file(sibling)
+
+    @staticmethod
+    def _signature(path):
+        stat = path.stat()
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def stale(self):
+        try:
+            if self._signature(self.path) != self.signature:
+                return True
+            # 压缩副本晚于原文件写入，新增的副本也要重新映射
+            return any(self.path.with_name(self.path.name + suffix).is_file() != (encoding in self.encodings)
+                       for encoding, suffix in ENCODING_SUFFIXES.items())
+        except OSError:
+            return True
+
+    def variant(self, encoding):
+        """(bytes, strong ETag) of the identity (`None`) or a precompressed representation."""
+        if encoding is None:
+            return self.data, self.etag
+        return self.encodings[encoding], f"{self.etag}-{encoding}"
+
+
+class AssetStore:
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self._assets = {}
+        self._lock = threading.Lock()
+        self.counters = {"mapped": 0, "remapped": 0}
+
+    def load(self):
+        """Map every servable file under the root (call at startup)."""
+        if not self.root.is_dir():
+            return self
+        for path in sorted(self.root.rglob("*")):
+            if path.is_file() and path.suffix in SERVED_SUFFIXES:
+                self.get(path.relative_to(self.root).as_posix())
+        return self
+
+    def _resolve(self, name):
+        if Path(name).suffix not in SERVED_SUFFIXES:
+            return None
+        path = (self.root / name).resolve()
+        if self.root not in path.parents or not path.is_file():
+            return None
+        return path
+
+    def get(self, name):
+        asset = self._assets.get(name)
+        if asset is not None and not asset.stale():
+            return asset
+        path = self._resolve(name)
+        if path is None:
+            return None
+        with self._lock:
+            current = self._assets.get(name)
+            if current is not None and current is not asset:
+                return current
+            try:
+                self._assets[name] = fresh = Asset(path)
+            except OSError:
+                self._assets.pop(name, None)
+                return None
+            self.counters["remapped" if asset is not None else "mapped"] += 1
+            return fresh
+
+    def stats(self):
+        with self._lock:
+            assets = list(self._assets.values())
+            counters = dict(self.counters)
+        counters["files"] = len(assets)
+        counters["bytes"] = sum(asset.size for asset in assets)
+        counters["encoded_bytes"] = sum(len(data) for asset in assets for data in asset.encodings.values())
+        return counters
+
+
+def accepted_encodings(header):
+    """Accept-Encoding -> {coding: q}; `*` stands for any coding not listed."""
+    accepted = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def select_encoding(asset, header):
+    """Best precompressed variant the client accepts (br before gzip), or None for identity."""
+    accepted = accepted_encodings(header)
+    best, best_q = None, 0.0
+    for encoding in ENCODING_SUFFIXES:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in asset.encodings and q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def parse_range(header, size):
+    """`bytes=a-b` / `bytes=a-` / `bytes=-n` -> (start, end inclusive); None to ignore, ValueError if unsatisfiable.
+
+    Multiple ranges are ignored (the whole file is sent), as RFC 9110 allows.
+    """
+    unit, _, spec = (header or "").partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if not first:
+            length = int(last)
+            if length <= 0:
+                raise ValueError("empty suffix range")
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        if first.isdigit() or last.isdigit():
+            raise
+        return None
+    if start >= size or end < start:
+        raise ValueError("range not satisfiable")
+    return start, end
@@ -0,0 +1,138 @@
+"""Pooled, concurrency-bounded HTTP clients for the LLM providers.
+
+A bare `requests.post` opens a new TCP + TLS connection for every analysis and
+lets any number of 60 s calls pile up on the server's worker threads, until
+even `/api/health` waits for a free thread. Each provider instead gets
+
+    - one `requests.Session` whose adapter keeps up to `max_concurrency`
+      keep-alive connections, so repeat calls skip the handshake;
+    - a semaphore of the same size: a call that cannot get a slot within
+      `queue_timeout` seconds fails fast with `ProviderBusy` (HTTP 503) rather
+      than parking another worker thread behind a slow upstream;
+    - a bounded wait queue: when `max_queue` calls are already waiting for a
+      slot, the next one is refused at once with `QueueFull` (HTTP 429), so
+      overload sheds requests instead of stretching everyone's latency;
+    - separate connect / read timeouts, so an unreachable host fails in seconds.
+
+Sizes come from `<PROVIDER>_MAX_CONCURRENCY` style env vars in `server.py`.
+Call latency and failures are recorded in `metrics.REGISTRY`.
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import REGISTRY
+
+UPSTREAM_SECONDS = REGISTRY.histogram(
+    "cv_upstream_request_duration_seconds",
+    "Upstream LLM call latency (streamed calls: until the last line).", ("provider", "outcome"))
+UPSTREAM_ERRORS = REGISTRY.counter(
+    "cv_upstream_errors_total", "Failed upstream LLM calls by kind.", ("provider", "kind"))
+
+
+def error_kind(error):
+    if isinstance(error, requests.Timeout):
+        return "timeout"
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return f"http_{error.response.status_code}"
+    if isinstance(error, requests.ConnectionError):
+        return "connection"
+    return "other"
+
+
+class ProviderBusy(Exception):
+    pass
+
+
+class QueueFull(ProviderBusy):
+    pass
+
+
+class ProviderClient:
+    def __init__(self, name, max_concurrency=8, queue_timeout=2.0, connect_timeout=5.0, read_timeout=60.0,
+                 max_queue=16):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.timeout = (connect_timeout, read_timeout)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "in_flight": 0, "waiting": 0, "rejected": 0, "queue_full": 0, "failed": 0}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            self.counters[name] += delta
+
+    def _acquire(self):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                full = self.counters["waiting"] >= self.max_queue
+                self.counters["queue_full" if full else "waiting"] += 1
+            if full:
+                UPSTREAM_ERRORS.inc(provider=self.name, kind="queue_full")
+                raise QueueFull(f"{self.name} 排队已满（{self.max_queue}），请稍后重试")
+            try:
+                acquired = self._slots.acquire(timeout=self.queue_timeout)
+            finally:
+                self._count("waiting", -1)
+            if not acquired:
+                self._count("rejected")
+                UPSTREAM_ERRORS.inc(provider=self.name, kind="busy")
+                raise ProviderBusy(f"{self.name} 并发已满（{self.max_concurrency}），请稍后重试")
+        self._count("requests")
+        self._count("in_flight")
+
+    def _release(self):
+        self._count("in_flight", -1)
+        self._slots.release()
+
+    def _failed(self, error, started):
+        self._count("failed")
+        UPSTREAM_SECONDS.observe(time.perf_counter() - started, provider=self.name, outcome="error")
+        UPSTREAM_ERRORS.inc(provider=self.name, kind=error_kind(error))
+
+    def post(self, url, headers=None, json=None):
+        """`session.post` inside a concurrency slot; raises ProviderBusy when none frees up in time."""
+        self._acquire()
+        started = time.perf_counter()
+        try:
+            response = self.session.post(url, headers=headers, json=json, timeout=self.timeout)
+            response.raise_for_status()
+            UPSTREAM_SECONDS.observe(time.perf_counter() - started, provider=self.name, outcome="ok")
+            return response
+        except requests.RequestException as e:
+            self._failed(e, started)
+            raise
+        finally:
+            self._release()
+
+    def stream_lines(self, url, headers=None, json=None):
+        """Yield decoded lines of a streamed response; the slot is held until the generator closes."""
+        self._acquire()
+        started = time.perf_counter()
+        try:
+            with self.session.post(url, headers=headers, json=json, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                # 按行切分后再解码，多字节字符不会被拆开
+                for line in response.iter_lines():
+                    if line:
+                        yield line.decode("utf-8")
+            UPSTREAM_SECONDS.observe(time.perf_counter() - started, provider=self.name, outcome="ok")
+        except requests.RequestException as e:
+            self._failed(e, started)
+            raise
+        finally:
+            self._release()
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, max_concurrency=self.max_concurrency, max_queue=self.max_queue)
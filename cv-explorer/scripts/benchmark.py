@@ -0,0 +1,1054 @@
+"""Repeatable micro/macro benchmarks for the data pipeline.
+
+Each benchmark runs over a synthetic corpus (see `synthetic_corpus.py`) at one
+or more sizes. Results can be stored as a baseline and later checked against
+it:
+
+    python scripts/benchmark.py run --save-baseline
+    python scripts/benchmark.py run --check --threshold 0.25
+    python scripts/benchmark.py run --only build_sankey --sizes 1000,100000,1000000
+    python scripts/benchmark.py lowmem --size 5000
+    python scripts/benchmark.py imports
+    python scripts/benchmark.py formats --sizes 15000,100000
+    python scripts/benchmark.py coalesce --clients 32
+    python scripts/benchmark.py upstream --threads 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import re
+import shutil
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+current_dir = Path(__file__).resolve().parent
+if str(current_dir) not in sys.path:
+    sys.path.append(str(current_dir))
+
+from synthetic_corpus import CorpusGenerator  # noqa: E402
+
+DEFAULT_BASELINE = current_dir / "benchmark_baseline.json"
+BENCHMARKS = {}
+
+
+def benchmark(name, sizes, max_size=None, repeat=5):
+    """Register `setup(papers) -> callable` as a named benchmark."""
+    def decorator(setup):
+        BENCHMARKS[name] = {
+            "setup": setup,
+            "sizes": sizes,
+            "max_size": max_size,
+            "repeat": repeat
+        }
+        return setup
+    return decorator
+
+
+@benchmark("normalize_phrase", sizes=(1000, 10000))
+def bench_normalize_phrase(papers):
+    from taxonomy import normalize_phrase
+    concepts = [c for p in papers for c in p["con"]]
+
+    def run():
+        for concept in concepts:
+            normalize_phrase(concept)
+    return run
+
+
+@benchmark("clean_academic_text", sizes=(1000, 10000))
+def bench_clean_academic_text(papers):
+    from taxonomy import clean_academic_text
+    abstracts = [p["abs"] for p in papers]
+
+    def run():
+        for text in abstracts:
+            clean_academic_text(text)
+    return run
+
+
+@benchmark("find_matches", sizes=(1000, 10000))
+def bench_find_matches(papers):
+    from taxonomy import METHOD_MATCHER, PROBLEM_MATCHER
+    texts = [f"{p['t']} {p['abs']}" for p in papers]
+
+    def run():
+        for text in texts:
+            PROBLEM_MATCHER.find_matches(text)
+            METHOD_MATCHER.find_matches(text)
+    return run
+
+
+@benchmark("derive_semantic_tags", sizes=(200, 1000), repeat=3)
+def bench_derive_semantic_tags(papers):
+    from process_advanced import derive_semantic_tags
+
+    def run():
+        for paper in papers:
+            derive_semantic_tags(paper, None, None, 5)
+    return run
+
+
+@benchmark("select_top_papers", sizes=(1000, 10000, 100000))
+def bench_select_top_papers(papers):
+    from process_advanced import select_top_papers
+
+    def run():
+        select_top_papers(papers, 300, 15000)
+    return run
+
+
+@benchmark("build_sankey", sizes=(1000, 10000), repeat=3)
+def bench_build_sankey(papers):
+    from process_advanced import build_sankey
+
+    def run():
+        build_sankey(papers, 2.0)
+    return run
+
+
+@benchmark("compute_embeddings", sizes=(1000,), max_size=20000, repeat=1)
+def bench_compute_embeddings(papers):
+    from process_advanced import compute_embeddings
+
+    def run():
+        compute_embeddings(papers, 1000)
+    return run
+
+
+@benchmark("process_visual_data", sizes=(1000, 10000), repeat=3)
+def bench_process_visual_data(papers):
+    import processor
+
+    workdir = tempfile.mkdtemp(prefix="cv-bench-")
+    (Path(workdir) / "data").mkdir()
+    input_path = Path(workdir) / "data" / "cleaned_papers.json"
+    with input_path.open("w", encoding="utf-8") as f:
+        json.dump(papers, f)
+
+    def run():
+        # processor writes data/summary.json relative to the working directory.
+        previous = os.getcwd()
+        os.chdir(workdir)
+        try:
+            processor.process_visual_data(str(input_path))
+        finally:
+            os.chdir(previous)
+    return run
+
+
+@benchmark("density_contours", sizes=(1000, 10000), repeat=1)
+def bench_density_contours(papers):
+    from landscape_density import density_contours, grid_bounds, semantic_anchors
+    records = synthetic_landscape_records(len(papers))
+    bounds = grid_bounds(records)
+
+    def run():
+        density_contours(records, bounds)
+        semantic_anchors(records)
+    return run
+
+
+@benchmark("build_search_index", sizes=(1000, 10000), repeat=1)
+def bench_build_search_index(papers):
+    from search_index import encode_search_index
+
+    def run():
+        encode_search_index(papers)
+    return run
+
+
+SEARCH_QUERIES = (
+    "diffusion models", "object detection transformer", "gaussian splatting",
+    "neural radiance fields view synthesis", "semantic segmentation",
+    "contrastive learning self-supervised", "point cloud", "pose estimation"
+)
+
+
+class _Quiet:
+    """Silence the pipeline's progress prints while timing."""
+
+    def __enter__(self):
+        self._stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+        return self
+
+    def __exit__(self, *exc):
+        sys.stdout.close()
+        sys.stdout = self._stdout
+        return False
+
+
+def time_callable(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        with _Quiet():
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_benchmarks(names, sizes_override=None, repeat_override=None, seed=0):
+    generator_cache = {}
+
+    def corpus(size):
+        if size not in generator_cache:
+            generator_cache[size] = list(CorpusGenerator(seed=seed).papers(size))
+        return generator_cache[size]
+
+    results = {}
+    for name in names:
+        spec = BENCHMARKS[name]
+        sizes = sizes_override or spec["sizes"]
+        repeat = repeat_override or spec["repeat"]
+        for size in sizes:
+            if spec["max_size"] and size > spec["max_size"]:
+                print(f"  skip {name}@{size} (max {spec['max_size']})")
+                continue
+            fn = spec["setup"](corpus(size))
+            with _Quiet():
+                fn()  # warm-up: regex caches, lazy imports
+            samples = time_callable(fn, repeat)
+            median = statistics.median(samples)
+            key = f"{name}@{size}"
+            results[key] = {
+                "benchmark": name,
+                "size": size,
+                "repeat": repeat,
+                "median_s": round(median, 6),
+                "min_s": round(min(samples), 6),
+                "per_item_us": round(median / size * 1e6, 3)
+            }
+            print(f"  {key:<32} median {median * 1000:10.2f} ms   "
+                  f"{results[key]['per_item_us']:10.2f} us/paper")
+    return results
+
+
+def check_regressions(results, baseline, threshold):
+    regressions = []
+    for key, current in results.items():
+        reference = baseline.get("results", {}).get(key)
+        if not reference:
+            continue
+        ratio = current["median_s"] / reference["median_s"] if reference["median_s"] else 1.0
+        status = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print(f"  {key:<32} {reference['median_s'] * 1000:10.2f} -> "
+              f"{current['median_s'] * 1000:10.2f} ms  x{ratio:5.2f}  {status}")
+        if ratio > 1 + threshold:
+            regressions.append(key)
+    return regressions
+
+
+def load_baseline(path):
+    path = Path(path)
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, previous=None):
+    merged = dict((previous or {}).get("results", {}))
+    merged.update(results)
+    payload = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": dict(sorted(merged.items()))
+    }
+    with Path(path).open("w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def _embedding_run(papers, low_memory):
+    from process_advanced import build_semantic_clusters, compute_embeddings
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with _Quiet():
+        coords, tfidf, feature_names = compute_embeddings(
+            papers, 1000, low_memory=low_memory)
+        labels, _ = build_semantic_clusters(
+            tfidf, feature_names, 14, low_memory=low_memory)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "coords": coords,
+        "tfidf": tfidf,
+        "labels": labels,
+        "seconds": elapsed,
+        "peak_mb": peak / (1024 * 1024)
+    }
+
+
+def compare_low_memory(size, seed=0, neighbors=10):
+    """Peak memory and layout quality of float64 vs --low-memory embeddings."""
+    from scipy.spatial import procrustes
+    from sklearn.manifold import trustworthiness
+    from sklearn.metrics import adjusted_rand_score
+
+    papers = list(CorpusGenerator(seed=seed).papers(size))
+    runs = {}
+    for mode, flag in (("float64", False), ("low_memory", True)):
+        runs[mode] = _embedding_run(papers, flag)
+
+    reference = runs["float64"]["tfidf"]
+    report = {"size": size}
+    for mode, run in runs.items():
+        report[mode] = {
+            "seconds": round(run["seconds"], 3),
+            "peak_mb": round(run["peak_mb"], 2),
+            "trustworthiness": round(float(trustworthiness(
+                reference, run["coords"], n_neighbors=neighbors, metric="cosine")), 4)
+        }
+    _, _, disparity = procrustes(
+        runs["float64"]["coords"].astype(float), runs["low_memory"]["coords"].astype(float))
+    report["memory_saved_mb"] = round(
+        runs["float64"]["peak_mb"] - runs["low_memory"]["peak_mb"], 2)
+    report["procrustes_disparity"] = round(float(disparity), 4)
+    if runs["float64"]["labels"] is not None and runs["low_memory"]["labels"] is not None:
+        report["cluster_ari"] = round(float(adjusted_rand_score(
+            runs["float64"]["labels"], runs["low_memory"]["labels"])), 4)
+    return report
+
+
+IMPORT_SCENARIOS = (
+    ("taxonomy", "import taxonomy"),
+    ("processor (summary run)", "import processor"),
+    ("process_advanced", "import process_advanced"),
+    # What every summary / word-cloud run paid before the taxonomy split.
+    ("eager ML stack (previous layout)",
+     "import taxonomy, numpy, sklearn.cluster, sklearn.decomposition, "
+     "sklearn.feature_extraction.text, sklearn.manifold"),
+)
+
+
+def measure_import_times(repeat=5):
+    """Cold-interpreter import cost of each scenario (median of `repeat`)."""
+    results = {}
+    for label, statement in (("interpreter", "pass"),) + IMPORT_SCENARIOS:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", statement], cwd=current_dir, check=True)
+            samples.append(time.perf_counter() - start)
+        results[label] = round(statistics.median(samples) * 1000, 1)
+    return results
+
+
+def synthetic_landscape_records(count, seed=0):
+    """landscape_data.json-shaped records without running the embedding."""
+    from taxonomy import prettify_concept
+
+    rng = random.Random(seed)
+    clusters = ["Diffusion Models", "Object Detection", "Vision Transformer (ViT)",
+                "NeRF & Neural Fields", "Segmentation (SAM & U-Net)", None]
+    records = []
+    for idx, paper in enumerate(CorpusGenerator(seed=seed).papers(count)):
+        concepts = [prettify_concept(c) for c in paper["con"][-rng.randint(1, 4):]]
+        records.append({
+            "id": f"paper-{idx}",
+            "title": paper["t"],
+            "year": paper["y"],
+            "venue": paper["v"],
+            "citations": paper["c"],
+            "x": rng.gauss(0, 30),
+            "y": rng.gauss(0, 30),
+            "concepts": concepts,
+            "semantic_primary": concepts[0] if concepts else None,
+            "semantic_cluster": rng.choice(clusters)
+        })
+    return records
+
+
+NODE_DECODE_SCRIPT = """
+import { readFileSync } from 'fs';
+import { decodeLandscapeBinary, landscapeRecordsFromColumns } from '%(module)s';
+const median = xs => xs.sort((a, b) => a - b)[xs.length >> 1];
+const text = readFileSync('%(json)s', 'utf8');
+const buf = readFileSync('%(bin)s');
+const bin = buf.buffer.slice(buf.byteOffset, buf.byteOffset + buf.byteLength);
+const runs = { json: [], columns: [], records: [] };
+for (let i = 0; i < %(repeat)d; i += 1) {
+    let t = performance.now(); JSON.parse(text); runs.json.push(performance.now() - t);
+    t = performance.now(); const table = decodeLandscapeBinary(bin); runs.columns.push(performance.now() - t);
+    t = performance.now(); landscapeRecordsFromColumns(table); runs.records.push(performance.now() - t);
+}
+console.log(JSON.stringify({ json: median(runs.json), columns: median(runs.columns), records: median(runs.records) }));
+"""
+
+
+def compare_landscape_formats(sizes, repeat=5, seed=0):
+    from landscape_binary import decode_landscape, encode_landscape
+
+    node = shutil.which("node")
+    module = (current_dir.parent / "web" / "src" / "landscape_binary.js").as_uri()
+    rows = []
+    for size in sizes:
+        records = synthetic_landscape_records(size, seed)
+        json_bytes = json.dumps(records, ensure_ascii=False).encode("utf-8")
+        bin_bytes = encode_landscape(records)
+        row = {
+            "size": size,
+            "json_kb": round(len(json_bytes) / 1024, 1),
+            "bin_kb": round(len(bin_bytes) / 1024, 1),
+            "json_gzip_kb": round(len(gzip.compress(json_bytes)) / 1024, 1),
+            "bin_gzip_kb": round(len(gzip.compress(bin_bytes)) / 1024, 1),
+            "py_json_ms": round(statistics.median(time_callable(
+                lambda: json.loads(json_bytes), repeat)) * 1000, 1),
+            "py_bin_ms": round(statistics.median(time_callable(
+                lambda: decode_landscape(bin_bytes), repeat)) * 1000, 1),
+        }
+        if node:
+            with tempfile.TemporaryDirectory() as tmp:
+                json_path = Path(tmp) / "landscape.json"
+                bin_path = Path(tmp) / "landscape.bin"
+                json_path.write_bytes(json_bytes)
+                bin_path.write_bytes(bin_bytes)
+                script = NODE_DECODE_SCRIPT % {
+                    "module": module, "json": json_path.as_posix(),
+                    "bin": bin_path.as_posix(), "repeat": repeat}
+                out = subprocess.run([node, "--input-type=module", "-e", script],
+                                     capture_output=True, text=True, check=True)
+                timings = json.loads(out.stdout)
+                row["js_json_parse_ms"] = round(timings["json"], 1)
+                row["js_bin_columns_ms"] = round(timings["columns"], 1)
+                row["js_bin_records_ms"] = round(timings["records"], 1)
+        rows.append(row)
+    return rows
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def compare_spatial_queries(sizes, queries=2000, seed=0):
+    """Per-query latency of the backend spatial index against a linear scan."""
+    sys.path.insert(0, str(current_dir.parent / "backend"))
+    from spatial_index import LandscapeIndex
+
+    rows = []
+    for size in sizes:
+        records = synthetic_landscape_records(size, seed)
+        start = time.perf_counter()
+        index = LandscapeIndex(records)
+        build_ms = (time.perf_counter() - start) * 1000
+        rng = random.Random(seed)
+        points = [(rng.gauss(0, 30), rng.gauss(0, 30)) for _ in range(queries)]
+        years = sorted({r["year"] for r in records})
+
+        def latencies(fn):
+            samples = []
+            for x, y in points:
+                t = time.perf_counter()
+                fn(x, y)
+                samples.append((time.perf_counter() - t) * 1000)
+            return samples
+
+        # 悬停 = nearest(k=1)，刷选 = 约占平面 5% 的矩形
+        runs = {
+            "nearest": latencies(lambda x, y: index.nearest(x, y, 1)),
+            "nearest_year": latencies(lambda x, y: index.nearest(x, y, 1, year=years[-1])),
+            "linear_nearest": latencies(lambda x, y: index.linear_nearest(x, y, 1)),
+            "box": latencies(lambda x, y: index.box(x - 7, x + 7, y - 7, y + 7, limit=500)),
+        }
+        row = {"size": size, "build_ms": round(build_ms, 1)}
+        for name, samples in runs.items():
+            row[f"{name}_p50_ms"] = round(percentile(samples, 50), 3)
+            row[f"{name}_p99_ms"] = round(percentile(samples, 99), 3)
+        rows.append(row)
+    return rows
+
+
+def compare_search_queries(sizes, rounds=50, seed=0):
+    """Index build time/size and per-query BM25 latency (with and without filters)."""
+    from search_index import SearchIndex, encode_search_index
+
+    rows = []
+    for size in sizes:
+        papers = list(CorpusGenerator(seed=seed).papers(size))
+        start = time.perf_counter()
+        blob = encode_search_index(papers)
+        build_s = time.perf_counter() - start
+        index = SearchIndex(blob)
+        row = {"size": size, "build_s": round(build_s, 2), "index_mb": round(len(blob) / 2 ** 20, 2)}
+        for label, kwargs in (("query", {}), ("query_filtered", {"year": 2023, "venue": "CVPR"})):
+            samples = []
+            for _ in range(rounds):
+                for query in SEARCH_QUERIES:
+                    t = time.perf_counter()
+                    index.search(query, **kwargs)
+                    samples.append((time.perf_counter() - t) * 1000)
+            row[f"{label}_p50_ms"] = round(percentile(samples, 50), 3)
+            row[f"{label}_p99_ms"] = round(percentile(samples, 99), 3)
+        rows.append(row)
+    return rows
+
+
+def stats_query_pool(stats, count, seed=0):
+    """Random but repeatable /api/stats argument tuples (a few hundred distinct ones)."""
+    rng = random.Random(seed)
+    groupings = [("year",), ("venue",), ("concept",), ("venue", "year"), ("year", "concept"),
+                 ("venue", "concept"), ("year", "venue", "concept")]
+    years = list(range(stats.first_year, stats.first_year + stats.year_span))
+    pool = []
+    for _ in range(count):
+        first = rng.choice(years)
+        pool.append((
+            rng.choice(groupings),
+            (first, rng.choice([y for y in years if y >= first])) if rng.random() < 0.6 else None,
+            tuple(sorted(rng.sample(stats.venue_names, 1))) if rng.random() < 0.4 else None,
+            tuple(sorted(rng.sample(stats.concept_labels, min(2, len(stats.concept_labels)))))
+            if rng.random() < 0.3 else None,
+            rng.choice([None, 10, 100]),
+            None,
+            rng.choice([None, 10, 30]),
+            1000,
+        ))
+    return pool
+
+
+def compare_stats_queries(size, threads=8, requests_total=4000, distinct=300, seed=0):
+    """p50/p99 of CorpusStats.query under `threads` concurrent callers, cold and cached."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from corpus_columns import CorpusStats, encode_corpus_columns
+
+    blob = encode_corpus_columns(CorpusGenerator(seed=seed).papers(size))
+    rows = []
+    for label, cache_size in (("uncached", 0), ("lru", 512)):
+        stats = CorpusStats(blob, cache_size=cache_size)
+        pool = stats_query_pool(stats, distinct, seed)
+        rng = random.Random(seed)
+        workload = [rng.choice(pool) for _ in range(requests_total)]
+
+        def timed(args):
+            t = time.perf_counter()
+            stats.query(*args)
+            return (time.perf_counter() - t) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            samples = list(executor.map(timed, workload))
+        wall = time.perf_counter() - start
+        info = stats.query.cache_info()
+        rows.append({
+            "size": size, "mode": label, "threads": threads, "requests": requests_total,
+            "p50_ms": round(percentile(samples, 50), 3),
+            "p99_ms": round(percentile(samples, 99), 3),
+            "qps": round(requests_total / wall),
+            "hit_rate": round(info.hits / max(1, info.hits + info.misses), 3),
+        })
+    return rows
+
+
+def start_fake_provider(delay=0.0, fail_marker="FAIL"):
+    """backend/fake_provider.py on 127.0.0.1 with a fixed delay; returns (server, url, counters)."""
+    sys.path.insert(0, str(current_dir.parent / "backend"))
+    from fake_provider import FakeProvider
+
+    provider = FakeProvider(("127.0.0.1", 0), latency=str(delay), tokens=8, fail_marker=fail_marker).start()
+    return provider, provider.url, provider.counters
+
+
+def import_backend(provider_url, tmp):
+    """Import backend/server.py with DeepSeek pointed at `provider_url`, a throwaway cache and no rate limit."""
+    os.environ["DEEPSEEK_API_URL"] = provider_url
+    os.environ["LLM_CACHE_PATH"] = str(Path(tmp) / "llm_cache.sqlite3")
+    os.environ.setdefault("ANALYZE_RATE", "0")  # 所有模拟客户端同一地址，关闭每客户端限流
+    sys.path.insert(0, str(current_dir.parent / "backend"))
+    import server
+
+    return server
+
+
+def check_coalescing(clients=20, delay=0.3):
+    """Fire `clients` identical /api/analyze calls at once against a local fake provider.
+
+    Passes when each burst reaches the provider exactly once and every client
+    gets the same answer: the shared summary on success, the shared error when
+    the provider fails.
+    """
+    import threading
+
+    provider, url, upstream = start_fake_provider(delay)
+    tmp = tempfile.mkdtemp(prefix="cv-coalesce-")
+    server = import_backend(url, tmp)
+
+    rows = []
+    try:
+        for label, text in (("success", "Gaussian Splatting"), ("error", "FAIL Gaussian Splatting")):
+            upstream["calls"] = 0
+            before = server.LLM_INFLIGHT.stats()["coalesced"]
+            barrier = threading.Barrier(clients)
+            responses = [None] * clients
+
+            def fire(slot):
+                client = server.app.test_client()
+                barrier.wait()
+                reply = client.post("/api/analyze", json={"text": text, "model": "deepseek", "api_key": "fake"})
+                responses[slot] = (reply.status_code, reply.headers.get("X-Cache"), reply.get_json())
+
+            threads = [threading.Thread(target=fire, args=(slot,)) for slot in range(clients)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            wall = time.perf_counter() - start
+            statuses = sorted({status for status, _, _ in responses})
+            bodies = {json.dumps(body, sort_keys=True) for _, _, body in responses}
+            cache_states = {}
+            for _, state, _ in responses:
+                cache_states[state or "-"] = cache_states.get(state or "-", 0) + 1
+            rows.append({
+                "case": label, "clients": clients, "upstream_calls": upstream["calls"],
+                "coalesced": server.LLM_INFLIGHT.stats()["coalesced"] - before,
+                "statuses": statuses, "x_cache": cache_states, "wall_ms": round(wall * 1000, 1),
+                "ok": upstream["calls"] == 1 and len(bodies) == 1,
+            })
+    finally:
+        provider.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return rows
+
+
+def compare_upstream_clients(threads=8, requests_total=2000, delay=0.002):
+    """Requests/sec against a stub provider: fresh `requests.post` per call vs the pooled client.
+
+    Also times /api/health while every DeepSeek slot is held by a slow call, the
+    case that used to stall the whole server.
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    import requests
+
+    provider, url, _ = start_fake_provider(delay)
+    tmp = tempfile.mkdtemp(prefix="cv-upstream-")
+    server = import_backend(url, tmp)
+    payload = {"model": "deepseek-chat", "messages": [{"role": "user", "content": "ping"}]}
+    client = server.PROVIDER_CLIENTS["deepseek"]
+
+    rows = []
+    try:
+        for label, post in (
+            ("requests.post", lambda: requests.post(url, json=payload, timeout=60).raise_for_status()),
+            ("pooled", lambda: client.post(url, json=payload)),
+        ):
+            def timed(_):
+                t = time.perf_counter()
+                post()
+                return (time.perf_counter() - t) * 1000
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                samples = list(executor.map(timed, range(requests_total)))
+            wall = time.perf_counter() - start
+            rows.append({
+                "client": label, "threads": threads, "requests": requests_total,
+                "rps": round(requests_total / wall),
+                "p50_ms": round(percentile(samples, 50), 3),
+                "p99_ms": round(percentile(samples, 99), 3),
+            })
+
+        # 用慢速上游占满全部并发槽位，再测 /api/health 与排队超时
+        provider.shutdown()
+        provider, url, _ = start_fake_provider(client.queue_timeout + 1.0)
+        server.PROVIDER_URLS["deepseek"] = url
+        holders = [threading.Thread(target=client.post, args=(url,), kwargs={"json": payload})
+                   for _ in range(client.max_concurrency)]
+        for holder in holders:
+            holder.start()
+        time.sleep(0.2)
+        app = server.app.test_client()
+        samples = []
+        for _ in range(50):
+            t = time.perf_counter()
+            app.get("/api/health")
+            samples.append((time.perf_counter() - t) * 1000)
+        t = time.perf_counter()
+        status = app.post("/api/analyze", json={"text": "busy", "model": "deepseek", "api_key": "fake"}).status_code
+        rejected_ms = (time.perf_counter() - t) * 1000
+        for holder in holders:
+            holder.join()
+        rows.append({
+            "client": "saturated", "health_p99_ms": round(percentile(samples, 99), 3),
+            "analyze_status": status, "analyze_ms": round(rejected_ms, 1),
+        })
+    finally:
+        provider.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return rows
+
+
+def check_routing(requests_per_case=6, slow=1.5, fast=0.05, hedge_after=0.2, deadline=0.8):
+    """/api/analyze through the provider router against two local fake providers.
+
+    DeepSeek is the requested model, ChatGPT the configured hedge. Cases:
+    healthy (answered by DeepSeek), slow (hedged, answered by ChatGPT shortly
+    after `hedge_after`), failing (the circuit opens after three errors and the
+    rest degrade without an upstream call) and stalled (no hedge; degrades to
+    the mock response at `deadline`).
+    """
+    sys.path.insert(0, str(current_dir.parent / "backend"))
+    from fake_provider import FakeProvider
+    from router import Router
+
+    tmp = tempfile.mkdtemp(prefix="cv-routing-")
+    server = import_backend("http://127.0.0.1:9/unused", tmp)
+    server.API_KEYS["chatgpt"] = "fake"
+    cases = (
+        ("healthy", fast, 0.0, {"deepseek": ["chatgpt"]}),
+        ("slow", slow, 0.0, {"deepseek": ["chatgpt"]}),
+        ("failing", fast, 1.0, {}),
+        ("stalled", slow, 0.0, {}),
+    )
+    rows = []
+    try:
+        for label, latency, error_rate, hedges in cases:
+            primary = FakeProvider(("127.0.0.1", 0), latency=str(latency), tokens=8, error_rate=error_rate).start()
+            backup = FakeProvider(("127.0.0.1", 0), latency=str(fast), tokens=8).start()
+            server.PROVIDER_URLS.update(deepseek=primary.url, chatgpt=backup.url)
+            server.LLM_ROUTER = Router(hedges=hedges, hedge_after=hedge_after, deadline=deadline,
+                                       failure_threshold=3, cooldown=60)
+            client = server.app.test_client()
+            samples, answered_by, states = [], {}, {}
+            for i in range(requests_per_case):
+                t = time.perf_counter()
+                reply = client.post("/api/analyze", json={"text": f"{label} query {i}", "model": "deepseek",
+                                                          "api_key": "fake"})
+                samples.append((time.perf_counter() - t) * 1000)
+                body = reply.get_json()
+                who = body.get("provider", "deepseek") if reply.status_code == 200 else f"http {reply.status_code}"
+                answered_by[who] = answered_by.get(who, 0) + 1
+                state = reply.headers.get("X-Cache") or "-"
+                states[state] = states.get(state, 0) + 1
+            health = server.LLM_ROUTER.stats()["providers"]["deepseek"]
+            rows.append({
+                "case": label, "requests": requests_per_case, "answered_by": answered_by, "x_cache": states,
+                "deepseek_calls": primary.counters["calls"], "chatgpt_calls": backup.counters["calls"],
+                "circuit": health["state"], "ewma_latency_ms": health["ewma_latency_ms"],
+                "p50_ms": round(percentile(samples, 50), 1), "max_ms": round(max(samples), 1),
+            })
+            primary.shutdown()
+            backup.shutdown()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return rows
+
+
+def parse_exposition(text):
+    """Prometheus text format -> ({(name, labels): value}, {family: type}); raises ValueError when malformed."""
+    sample = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(?:[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*",?)*\})? (\S+)$')
+    samples, types = {}, {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ", 3)
+            types[name] = kind
+            continue
+        if not line or line.startswith("#"):
+            continue
+        match = sample.match(line)
+        if match is None:
+            raise ValueError(f"malformed sample: {line}")
+        name, labels, value = match.groups()
+        family = re.sub(r"_(bucket|sum|count)$", "", name) if name not in types else name
+        if family not in types:
+            raise ValueError(f"sample without # TYPE: {line}")
+        samples[(name, labels or "")] = float(value)
+    return samples, types
+
+
+def check_metrics(requests_total=300, distinct=20, observations=200000):
+    """Drive /api/analyze against a fake provider, scrape /api/metrics and cross-check the numbers.
+
+    Passes when the exposition parses, every histogram's buckets are cumulative
+    and end in `_count`, and the analyze / upstream / cache counters agree with
+    what the clients and the fake provider saw. Also reports the cost of one
+    observation and of one scrape.
+    """
+    provider, url, upstream = start_fake_provider(0.0)
+    tmp = tempfile.mkdtemp(prefix="cv-metrics-")
+    server = import_backend(url, tmp)
+    from metrics import Histogram
+
+    try:
+        client = server.app.test_client()
+        outcomes = {}
+        for i in range(requests_total):
+            text = "FAIL paper" if i % 50 == 0 else f"paper {i % distinct}"
+            reply = client.post("/api/analyze", json={"text": text, "model": "deepseek", "api_key": "fake"})
+            outcome = reply.headers.get("X-Cache") if reply.status_code == 200 else "ERROR"
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+        t = time.perf_counter()
+        body = client.get("/api/metrics").get_data(as_text=True)
+        scrape_ms = (time.perf_counter() - t) * 1000
+        samples, types = parse_exposition(body)
+
+        def total(name, **match):
+            return sum(value for (sample, labels), value in samples.items()
+                       if sample == name and all(f'{k}="{v}"' in labels for k, v in match.items()))
+
+        problems = []
+        for name, kind in types.items():
+            if kind != "histogram":
+                continue
+            series = {}
+            for (sample, labels), value in samples.items():
+                if sample == f"{name}_bucket":
+                    key = re.sub(r',?le="[^"]*"', "", labels)
+                    series.setdefault(key, []).append(value)
+            for key, counts in series.items():
+                if counts != sorted(counts) or counts[-1] != samples.get((f"{name}_count", key.replace("{}", ""))):
+                    problems.append(f"{name}{key} buckets not cumulative")
+        reported = {outcome: total("cv_analyze_requests_total", endpoint="analyze", outcome=outcome)
+                    for outcome in outcomes}
+        if reported != outcomes:
+            problems.append(f"analyze outcomes {reported} != {outcomes}")
+        upstream_seen = total("cv_upstream_request_duration_seconds_count", provider="deepseek")
+        if upstream_seen != upstream["calls"]:
+            problems.append(f"upstream calls {upstream_seen} != {upstream['calls']}")
+        if total("cv_upstream_errors_total", provider="deepseek") != upstream["errors"]:
+            problems.append("upstream errors disagree with the fake provider")
+        if total("cv_llm_cache_events_total", event="memory_hits") < outcomes.get("HIT", 0):
+            problems.append("cache hits missing")
+
+        histogram = Histogram("bench_seconds", "Overhead probe.", ("route",))
+        t = time.perf_counter()
+        for i in range(observations):
+            histogram.observe(0.003 * (i % 40), route="/api/analyze")
+        observe_ns = (time.perf_counter() - t) / observations * 1e9
+    finally:
+        provider.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {
+        "requests": requests_total, "x_cache": outcomes, "series": len(samples), "families": len(types),
+        "scrape_ms": round(scrape_ms, 2), "exposition_bytes": len(body), "observe_ns": round(observe_ns),
+        "problems": problems, "ok": not problems,
+    }
+
+
+def compare_data_serving(size=15000, rounds=200, seed=0):
+    """Latency of the backend's /data/<path> route for a landscape_data.json of `size` records.
+
+    Cases: unconditional full body (identity and gzip), a 304 revalidation, a
+    64 KiB range, and Flask's `send_file` (re-opens and streams the file on
+    every request) as the baseline. `map_ms` is the one-off startup cost of
+    mapping and hashing the file.
+    """
+    from flask import Flask, send_file
+    from publish import publish_bytes
+
+    tmp = Path(tempfile.mkdtemp(prefix="cv-dataserve-"))
+    web_data = tmp / "web-data"
+    payload = json.dumps(synthetic_landscape_records(size, seed), ensure_ascii=False).encode("utf-8")
+    publish_bytes(web_data / "landscape_data.json", payload)
+    os.environ["CV_WEB_DATA_DIR"] = str(web_data)
+    server = import_backend("http://127.0.0.1:9/unused", tmp)
+    from static_assets import AssetStore
+
+    baseline = Flask("send_file_baseline")
+    baseline.add_url_rule("/data/<path:name>", "data", lambda name: send_file(web_data / name, conditional=True))
+
+    try:
+        t = time.perf_counter()
+        AssetStore(web_data).load()
+        map_ms = (time.perf_counter() - t) * 1000
+        client = server.app.test_client()
+        etag = client.get("/data/landscape_data.json").headers["ETag"]
+        gzip_etag = client.get("/data/landscape_data.json", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+        cases = (
+            ("full", client, {}),
+            ("full gzip", client, {"Accept-Encoding": "gzip, br"}),
+            ("304", client, {"If-None-Match": etag}),
+            ("304 gzip", client, {"Accept-Encoding": "gzip, br", "If-None-Match": gzip_etag}),
+            ("range 64KiB", client, {"Range": "bytes=65536-131071"}),
+            ("send_file", baseline.test_client(), {}),
+        )
+        rows = []
+        for label, http, headers in cases:
+            samples = []
+            for _ in range(rounds):
+                t = time.perf_counter()
+                reply = http.get("/data/landscape_data.json", headers=headers)
+                body = reply.get_data()
+                samples.append((time.perf_counter() - t) * 1000)
+            rows.append({
+                "case": label, "records": size, "status": reply.status_code, "bytes": len(body),
+                "p50_ms": round(percentile(samples, 50), 3), "p99_ms": round(percentile(samples, 99), 3),
+            })
+        rows.append({"case": "startup map + sha256", "records": size, "bytes": len(payload), "map_ms": round(map_ms, 3)})
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return rows
+
+
+def parse_sizes(text):
+    return tuple(int(part) for part in text.split(",") if part.strip())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline benchmark suite.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run benchmarks.")
+    run.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS),
+                     help="Subset of benchmarks to run.")
+    run.add_argument("--sizes", type=parse_sizes, default=None,
+                     help="Comma-separated corpus sizes, e.g. 1000,100000,1000000.")
+    run.add_argument("--repeat", type=int, default=None)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    run.add_argument("--save-baseline", action="store_true")
+    run.add_argument("--check", action="store_true",
+                     help="Fail when a result is slower than the baseline by more than --threshold.")
+    run.add_argument("--threshold", type=float, default=0.25)
+    run.add_argument("--output", default=None, help="Write raw results to this JSON file.")
+
+    lowmem = sub.add_parser("lowmem", help="Compare float64 and --low-memory embeddings.")
+    lowmem.add_argument("--size", type=int, default=3000)
+    lowmem.add_argument("--seed", type=int, default=0)
+
+    imports = sub.add_parser("imports", help="Measure cold import time of the script modules.")
+    imports.add_argument("--repeat", type=int, default=5)
+
+    formats = sub.add_parser("formats", help="Compare landscape JSON and binary sizes/parse times.")
+    formats.add_argument("--sizes", type=parse_sizes, default=(15000, 100000))
+    formats.add_argument("--repeat", type=int, default=5)
+
+    spatial = sub.add_parser("spatial", help="Latency of the backend nearest/box index vs a linear scan.")
+    spatial.add_argument("--sizes", type=parse_sizes, default=(10000, 100000, 300000))
+    spatial.add_argument("--queries", type=int, default=2000)
+
+    search = sub.add_parser("search", help="BM25 index build time and query latency.")
+    search.add_argument("--sizes", type=parse_sizes, default=(10000, 100000))
+    search.add_argument("--rounds", type=int, default=50)
+
+    stats = sub.add_parser("stats", help="/api/stats group-by latency under concurrent load.")
+    stats.add_argument("--size", type=int, default=100000)
+    stats.add_argument("--threads", type=int, default=8)
+    stats.add_argument("--requests", type=int, default=4000)
+    stats.add_argument("--distinct", type=int, default=300,
+                       help="Distinct queries in the workload (controls the cache hit rate).")
+
+    coalesce = sub.add_parser("coalesce", help="Concurrent identical /api/analyze calls against a fake provider.")
+    coalesce.add_argument("--clients", type=int, default=20)
+    coalesce.add_argument("--delay", type=float, default=0.3, help="Fake provider latency in seconds.")
+
+    upstream = sub.add_parser("upstream", help="Requests/sec of fresh vs pooled provider connections.")
+    upstream.add_argument("--threads", type=int, default=8)
+    upstream.add_argument("--requests", type=int, default=2000)
+    upstream.add_argument("--delay", type=float, default=0.002, help="Stub provider latency in seconds.")
+
+    routing = sub.add_parser("routing", help="Hedging, circuit breaking and deadline fallback of /api/analyze.")
+    routing.add_argument("--requests", type=int, default=6, help="Requests per case.")
+    routing.add_argument("--slow", type=float, default=1.5, help="Slow provider latency in seconds.")
+    routing.add_argument("--hedge-after", type=float, default=0.2)
+    routing.add_argument("--deadline", type=float, default=0.8)
+
+    metrics = sub.add_parser("metrics", help="Check /api/metrics against a fake provider and time instrumentation.")
+    metrics.add_argument("--requests", type=int, default=300)
+    metrics.add_argument("--distinct", type=int, default=20)
+
+    dataserve = sub.add_parser("dataserve", help="/data/<path> latency: full, gzip, 304 and range requests.")
+    dataserve.add_argument("--size", type=int, default=15000, help="Records in the synthetic landscape file.")
+    dataserve.add_argument("--rounds", type=int, default=200)
+
+    sub.add_parser("list", help="List registered benchmarks.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "list":
+        for name, spec in BENCHMARKS.items():
+            print(f"{name:<24} sizes={spec['sizes']} max={spec['max_size']}")
+        return 0
+    if args.command == "imports":
+        for label, millis in measure_import_times(args.repeat).items():
+            print(f"  {label:<36} {millis:8.1f} ms")
+        return 0
+    if args.command == "formats":
+        for row in compare_landscape_formats(args.sizes, args.repeat):
+            print(json.dumps(row))
+        return 0
+    if args.command == "spatial":
+        for row in compare_spatial_queries(args.sizes, args.queries):
+            print(json.dumps(row))
+        return 0
+    if args.command == "search":
+        for row in compare_search_queries(args.sizes, args.rounds):
+            print(json.dumps(row))
+        return 0
+    if args.command == "stats":
+        for row in compare_stats_queries(args.size, args.threads, args.requests, args.distinct):
+            print(json.dumps(row))
+        return 0
+    if args.command == "coalesce":
+        rows = check_coalescing(args.clients, args.delay)
+        for row in rows:
+            print(json.dumps(row))
+        return 0 if all(row["ok"] for row in rows) else 1
+    if args.command == "upstream":
+        for row in compare_upstream_clients(args.threads, args.requests, args.delay):
+            print(json.dumps(row))
+        return 0
+    if args.command == "routing":
+        for row in check_routing(args.requests, args.slow, hedge_after=args.hedge_after, deadline=args.deadline):
+            print(json.dumps(row))
+        return 0
+    if args.command == "metrics":
+        row = check_metrics(args.requests, args.distinct)
+        print(json.dumps(row))
+        return 0 if row["ok"] else 1
+    if args.command == "dataserve":
+        for row in compare_data_serving(args.size, args.rounds):
+            print(json.dumps(row))
+        return 0
+    if args.command == "lowmem":
+        print(json.dumps(compare_low_memory(args.size, args.seed), indent=2))
+        return 0
+
+    names = args.only or list(BENCHMARKS)
+    print(f"Running {len(names)} benchmark(s)...")
+    results = run_benchmarks(names, args.sizes, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    baseline = load_baseline(args.baseline)
+    exit_code = 0
+    if args.check:
+        if baseline is None:
+            print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+            return 1
+        print(f"\nComparing against {args.baseline} (threshold {args.threshold * 100:.0f}%)")
+        regressions = check_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            exit_code = 1
+    if args.save_baseline:
+        path = save_baseline(args.baseline, results, baseline)
+        print(f"Baseline saved: {path}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
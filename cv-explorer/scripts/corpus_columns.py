@@ -0,0 +1,250 @@
+"""Columnar copy of the cleaned corpus for on-demand stats (`corpus_columns.bin`).
+
+`summary.json` bakes one aggregation (yearly counts, venue x year, top-30
+concepts per year). This file keeps just enough per paper to recompute any
+year / venue / concept group-by with arbitrary filters in the backend's
+`/api/stats`, without shipping the corpus itself.
+
+Container as in `landscape_binary.py`, magic "CVCC". Header:
+
+    {
+      "dictionaries": {"venue": [...], "concept": [...labels], "concept_key": [...normalized]},
+      "columns": [...]
+    }
+
+Columns (N papers with a year):
+
+    year              uint16[N]
+    venue             uint8[N]    index into dictionaries.venue ("Unknown" if missing; uint16 beyond 256)
+    citations         uint32[N]
+    concept_offsets   uint32[N+1] paper i owns concept_ids[offsets[i]:offsets[i+1]]
+    concept_ids       uint16[*]   index into dictionaries.concept
+
+Concepts go through `taxonomy.summary_concepts`, the filter behind
+summary.json's keywords, and are de-duplicated per paper.
+
+    python scripts/corpus_columns.py data/cleaned_papers.json
+"""
+
+import argparse
+import json
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from landscape_binary import numpy_columns, pack_columns, unpack_header
+from publish import write_if_changed
+from taxonomy import ensure_list, normalize_citations, normalize_year, pick_field, summary_concepts
+
+MAGIC = b"CVCC"
+VERSION = 1
+DIMENSIONS = ("year", "venue", "concept")
+
+
+def encode_corpus_columns(papers):
+    venues, venue_index = [], {}
+    labels, keys, concept_index = [], [], {}
+    years, venue_codes, citations = [], [], []
+    concept_offsets, concept_ids = [0], []
+
+    for paper in papers:
+        year = normalize_year(pick_field(paper, "year"))
+        if not year:
+            continue
+        venue = str(pick_field(paper, "venue", "") or "Unknown")
+        if venue not in venue_index:
+            venue_index[venue] = len(venues)
+            venues.append(venue)
+        seen = set()
+        for normalized, pretty in summary_concepts(ensure_list(pick_field(paper, "concepts")), year):
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            if normalized not in concept_index:
+                concept_index[normalized] = len(keys)
+                keys.append(normalized)
+                labels.append(pretty)
+            concept_ids.append(concept_index[normalized])
+        concept_offsets.append(len(concept_ids))
+        years.append(year)
+        venue_codes.append(venue_index[venue])
+        citations.append(max(0, normalize_citations(pick_field(paper, "citations", 0))))
+
+    # 最多 256 个 venue 用 uint8 编码，更多时改用 uint16（列类型记录在头部，读取端无需改动）
+    if len(venues) > 0x10000:
+        raise ValueError("venue dictionary exceeds 65536 entries")
+    venue_type = "uint8" if len(venues) <= 0x100 else "uint16"
+    # venue 字典按名称排序，分组结果里的 venue 顺序即字母序
+    ordered = sorted(venues)
+    position = {name: code for code, name in enumerate(ordered)}
+    remap = [position[name] for name in venues]
+    venues = ordered
+    venue_codes = [remap[code] for code in venue_codes]
+    if len(keys) > 0xFFFF:
+        raise ValueError("concept dictionary exceeds 65535 entries")
+    meta = {"dictionaries": {"venue": venues, "concept": labels, "concept_key": keys}}
+    columns = [
+        ("year", "uint16", years),
+        ("venue", venue_type, venue_codes),
+        ("citations", "uint32", citations),
+        ("concept_offsets", "uint32", concept_offsets),
+        ("concept_ids", "uint16", concept_ids),
+    ]
+    return pack_columns(MAGIC, VERSION, len(years), meta, columns)
+
+
+def write_corpus_columns(path, papers):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(path, encode_corpus_columns(papers))
+    return path
+
+
+class CorpusStats:
+    """Vectorised group-by over the columns; results are memoised in an LRU cache.
+
+    `query` takes hashable, already-normalised arguments so identical requests
+    share one cache entry:
+
+        group_by        tuple of DIMENSIONS
+        years           (first, last) inclusive, or None
+        venues          sorted tuple of venue names, or None
+        concepts        sorted tuple of concept labels, or None
+        min_citations / max_citations   inclusive bounds, or None
+        top             keep the `top` largest groups of the last dimension
+                        within each combination of the leading ones
+        limit           cap on returned rows
+    """
+
+    def __init__(self, buffer, cache_size=256):
+        import numpy as np
+
+        self._np = np
+        self.count, header = unpack_header(buffer, MAGIC, VERSION)
+        columns = numpy_columns(buffer, header)
+        dictionaries = header["dictionaries"]
+        self.venue_names = dictionaries["venue"]
+        self.concept_labels = dictionaries["concept"]
+        self.venue_codes = {name: code for code, name in enumerate(self.venue_names)}
+        self.concept_codes = {label: code for code, label in enumerate(self.concept_labels)}
+        # 概念标签大小写不一时，也接受归一化后的写法
+        self.concept_codes.update({key: code for code, key in enumerate(dictionaries["concept_key"])})
+
+        self.years = columns["year"].astype(np.int64)
+        self.venues = columns["venue"].astype(np.int64)
+        self.citations = columns["citations"].astype(np.int64)
+        self.weights = self.citations.astype(np.float64)
+        self.first_year = int(self.years.min()) if self.count else 0
+        self.year_span = int(self.years.max()) - self.first_year + 1 if self.count else 1
+        self.year_codes = self.years - self.first_year
+        # 按概念展开的行：(论文号, 概念号)，concept 维度的分组在这上面做
+        self.concept_doc = np.repeat(np.arange(self.count), np.diff(columns["concept_offsets"]))
+        self.concept_ids = columns["concept_ids"].astype(np.int64)
+        self.query = lru_cache(maxsize=cache_size)(self._query)
+
+    @classmethod
+    def open(cls, path, cache_size=256):
+        return cls(Path(path).read_bytes(), cache_size)
+
+    def _allowed(self, names, lookup, size):
+        """Boolean table over dictionary codes; indexing it is cheaper than np.isin."""
+        table = self._np.zeros(size, dtype=bool)
+        table[[lookup[name] for name in names if name in lookup]] = True
+        return table
+
+    def _size(self, dim):
+        return {"year": self.year_span, "venue": len(self.venue_names),
+                "concept": len(self.concept_labels)}[dim]
+
+    def _label(self, dim, code):
+        if dim == "year":
+            return self.first_year + code
+        if dim == "venue":
+            return self.venue_names[code]
+        return self.concept_labels[code]
+
+    def _query(self, group_by=("year",), years=None, venues=None, concepts=None,
+               min_citations=None, max_citations=None, top=None, limit=1000):
+        np = self._np
+        filtered = any(value is not None for value in (years, venues, concepts, min_citations, max_citations))
+        mask = np.ones(self.count, dtype=bool)
+        if years is not None:
+            mask &= (self.years >= years[0]) & (self.years <= years[1])
+        if venues is not None:
+            mask &= self._allowed(venues, self.venue_codes, len(self.venue_names))[self.venues]
+        if min_citations is not None:
+            mask &= self.citations >= min_citations
+        if max_citations is not None:
+            mask &= self.citations <= max_citations
+        concept_rows = None
+        if concepts is not None:
+            concept_rows = self._allowed(concepts, self.concept_codes, len(self.concept_labels))[self.concept_ids]
+            tagged = np.zeros(self.count, dtype=bool)
+            tagged[self.concept_doc[concept_rows]] = True
+            mask &= tagged
+
+        total = {"count": int(mask.sum()), "citations": int(self.citations[mask].sum())}
+        # 只取分组用到的列；无过滤且不按概念分组时直接用整列，省去一次 gather
+        if "concept" in group_by:
+            rows = mask[self.concept_doc] if filtered else slice(None)
+            if concept_rows is not None:
+                rows &= concept_rows
+            docs = self.concept_doc[rows]
+            columns = {"concept": self.concept_ids[rows]}
+        else:
+            docs = np.flatnonzero(mask) if filtered else slice(None)
+            columns = {}
+        for dim, column in (("year", self.year_codes), ("venue", self.venues)):
+            if dim in group_by:
+                columns[dim] = column[docs]
+
+        sizes = [self._size(dim) for dim in group_by]
+        code = columns[group_by[0]]
+        for dim, size in zip(group_by[1:], sizes[1:]):
+            code = code * size + columns[dim]
+        cells = int(np.prod(sizes))
+        counts = np.bincount(code, minlength=cells)
+        sums = np.bincount(code, weights=self.weights[docs], minlength=cells)
+
+        present = np.flatnonzero(counts)
+        parts = np.unravel_index(present, sizes)
+        # 先按前导维度分组、组内按论文数降序，截取 top 个最大的分组
+        order = np.lexsort((parts[-1], -counts[present]) + tuple(reversed(parts[:-1])))
+        present = present[order]
+        parts = tuple(part[order] for part in parts)
+        if top:
+            leading = present // sizes[-1]
+            starts = np.flatnonzero(np.r_[True, leading[1:] != leading[:-1]])
+            rank = np.arange(present.size) - np.repeat(starts, np.diff(np.r_[starts, present.size]))
+            keep = rank < top
+            present = present[keep]
+            parts = tuple(part[keep] for part in parts)
+        # 最后一维是年份时，保留下来的分组再按时间排列
+        if group_by[-1] == "year":
+            order = np.lexsort((parts[-1],) + tuple(reversed(parts[:-1])))
+            present = present[order]
+            parts = tuple(part[order] for part in parts)
+
+        rows = []
+        for idx in range(min(present.size, limit)):
+            row = {dim: self._label(dim, int(parts[pos][idx])) for pos, dim in enumerate(group_by)}
+            row["count"] = int(counts[present[idx]])
+            row["citations"] = int(sums[present[idx]])
+            rows.append(row)
+        return {"group_by": list(group_by), "total": total, "groups": int(present.size), "rows": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the columnar corpus used by /api/stats.")
+    parser.add_argument("input", nargs="?", default="data/cleaned_papers.json")
+    parser.add_argument("--output", default="data/corpus_columns.bin")
+    args = parser.parse_args()
+    with open(args.input, "r", encoding="utf-8") as f:
+        papers = json.load(f)
+    path = write_corpus_columns(args.output, papers)
+    print(f"{len(papers)} papers -> {path} ({path.stat().st_size} B)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
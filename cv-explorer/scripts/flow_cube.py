@@ -0,0 +1,134 @@
+"""Cumulative year x problem x method flow weights (`flow_cube.json`).
+
+`sankey_data.json` freezes one threshold and the last ten years. The cube keeps
+the raw (unthresholded) weights from `process_advanced.collect_flow_weights`
+for every year, as running totals, so the backend's `/api/flow` can answer any
+year range as `cumulative[last] - cumulative[first - 1]` in O(problems x
+methods) without touching papers.
+
+    {
+      "version": 1,
+      "years": [2014, ..., 2024],          # contiguous; gap years repeat the total
+      "problems": [...], "methods": [...],
+      "cumulative": [[[w, ...] per method] per problem] per year
+    }
+"""
+
+import json
+from pathlib import Path
+
+from publish import write_if_changed
+
+VERSION = 1
+PRECISION = 4
+
+
+def build_flow_cube(links_by_year):
+    if not links_by_year:
+        return {"version": VERSION, "years": [], "problems": [], "methods": [], "cumulative": []}
+    problems = sorted({prob for links in links_by_year.values() for prob, _ in links})
+    methods = sorted({meth for links in links_by_year.values() for _, meth in links})
+    problem_index = {name: idx for idx, name in enumerate(problems)}
+    method_index = {name: idx for idx, name in enumerate(methods)}
+
+    years = list(range(min(links_by_year), max(links_by_year) + 1))
+    running = [[0.0] * len(methods) for _ in problems]
+    cumulative = []
+    for year in years:
+        for (prob, meth), weight in links_by_year.get(year, {}).items():
+            running[problem_index[prob]][method_index[meth]] += weight
+        cumulative.append([[round(value, PRECISION) for value in row] for row in running])
+    return {
+        "version": VERSION,
+        "years": years,
+        "problems": problems,
+        "methods": methods,
+        "cumulative": cumulative,
+    }
+
+
+def write_flow_cube(path, links_by_year):
+    path = Path(path)
+    payload = json.dumps(build_flow_cube(links_by_year), ensure_ascii=False, separators=(",", ":"))
+    write_if_changed(path, payload.encode("utf-8"))
+    return path
+
+
+class FlowCube:
+    """Range queries over the cube, returned in the shape d3-sankey consumes."""
+
+    def __init__(self, payload):
+        import numpy as np
+
+        self._np = np
+        self.years = payload["years"]
+        self.problems = payload["problems"]
+        self.methods = payload["methods"]
+        shape = (len(self.years), len(self.problems), len(self.methods))
+        cumulative = np.asarray(payload["cumulative"], dtype=np.float64).reshape(shape)
+        # 前置一层全零，区间 [i, j] 的权重即 prefix[j + 1] - prefix[i]
+        self.prefix = np.concatenate([np.zeros((1,) + shape[1:]), cumulative])
+
+    @classmethod
+    def open(cls, path):
+        with Path(path).open("r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def weights(self, first, last):
+        """problems x methods weights summed over [first, last] (clipped to the cube)."""
+        np = self._np
+        if self.years:
+            first, last = max(first, self.years[0]), min(last, self.years[-1])
+        if not self.years or first > last:
+            return np.zeros(self.prefix.shape[1:])
+        lo, hi = first - self.years[0], last - self.years[0]
+        return np.maximum(self.prefix[hi + 1] - self.prefix[lo], 0.0)
+
+    def sankey(self, first=None, last=None, min_value=0.0, top=None,
+               problems=None, methods=None, compare=False):
+        """Links above `min_value`, at most `top` per problem (by weight).
+
+        With `compare`, each link also carries `prev_value` from the equally long
+        range just before, which is what the flow view's YoY badges need.
+        """
+        np = self._np
+        if first is None:
+            first = self.years[0] if self.years else 0
+        if last is None:
+            last = self.years[-1] if self.years else 0
+        matrix = self.weights(first, last).copy()
+        if problems is not None:
+            matrix[[idx for idx, name in enumerate(self.problems) if name not in problems], :] = 0.0
+        if methods is not None:
+            matrix[:, [idx for idx, name in enumerate(self.methods) if name not in methods]] = 0.0
+        keep = matrix >= max(min_value, 1e-9)
+        if top:
+            # 每个问题域只保留权重最大的 top 个方法
+            ranks = np.argsort(np.argsort(-matrix, axis=1, kind="stable"), axis=1, kind="stable")
+            keep &= ranks < top
+        previous = None
+        if compare:
+            span = last - first + 1
+            previous = self.weights(first - span, first - 1)
+
+        rows, cols = np.nonzero(keep)
+        order = np.argsort(-matrix[rows, cols], kind="stable")
+        links = []
+        for row, col in zip(rows[order].tolist(), cols[order].tolist()):
+            link = {
+                "source": self.problems[row],
+                "target": self.methods[col],
+                "value": round(float(matrix[row, col]), 2),
+            }
+            if previous is not None:
+                link["prev_value"] = round(float(previous[row, col]), 2)
+            links.append(link)
+        sources = sorted({link["source"] for link in links})
+        targets = sorted({link["target"] for link in links})
+        return {
+            "years": [first, last],
+            "nodes": [{"name": name, "side": "problem"} for name in sources]
+            + [{"name": name, "side": "method"} for name in targets],
+            "links": links,
+            "total": round(float(matrix[keep].sum()), 2),
+        }
@@ -0,0 +1,123 @@
+"""Sparse keyword x year weights for range word clouds (`keyword_cube.bin`).
+
+`wordcloud_data.json` keeps the top 50 terms of each single year. This file
+keeps every (keyword, year) cell that `wordcloud_new.py` scores, under two
+weightings, so the backend's `/api/wordcloud` can rank any year range:
+
+    count       occurrences (concept tags + title hits)
+    citations   the citation-weighted score wordcloud_data.json uses
+
+Container as in `landscape_binary.py`, magic "CVKC". Header:
+
+    {"first_year": 2014, "years": 11, "weightings": ["count", "citations"], "columns": [...]}
+
+Columns (K keywords sorted by total score, E non-zero cells):
+
+    term_offsets    uint32[K+1] byte ranges into term_bytes (NUL-terminated)
+    term_bytes      uint8[*]
+    cell_offsets    uint32[K+1] keyword k owns cells [offsets[k], offsets[k+1])
+    cell_year       uint8[E]    year - first_year, ascending within a keyword
+    cell_count      uint32[E]
+    cell_score      uint32[E]
+
+Only non-zero cells are stored; the reader expands them once into per-keyword
+prefix sums over the years (K x (years + 1)), after which a range is one
+subtraction and a top-k selection.
+"""
+
+from pathlib import Path
+
+from landscape_binary import numpy_columns, pack_columns, string_column, unpack_header
+from publish import write_if_changed
+
+MAGIC = b"CVKC"
+VERSION = 1
+WEIGHTINGS = {"count": "cell_count", "citations": "cell_score"}
+MAX_VALUE = 0xFFFFFFFF
+
+
+def encode_keyword_cube(cells):
+    """`cells` maps year -> {keyword: [count, score]}."""
+    years = sorted(year for year, terms in cells.items() if terms)
+    first_year = years[0] if years else 0
+    span = years[-1] - first_year + 1 if years else 0
+    if span > 0xFF:
+        raise ValueError("keyword cube spans more than 255 years")
+
+    by_term = {}
+    for year in years:
+        for term, (count, score) in cells[year].items():
+            by_term.setdefault(term, []).append((year - first_year, count, score))
+    terms = sorted(by_term, key=lambda term: (-sum(cell[2] for cell in by_term[term]), term))
+
+    cell_offsets, cell_year, cell_count, cell_score = [0], [], [], []
+    for term in terms:
+        for year_code, count, score in by_term[term]:
+            cell_year.append(year_code)
+            cell_count.append(min(int(count), MAX_VALUE))
+            cell_score.append(min(int(score), MAX_VALUE))
+        cell_offsets.append(len(cell_year))
+    term_offsets, term_bytes = string_column(terms)
+
+    meta = {"first_year": first_year, "years": span, "weightings": list(WEIGHTINGS)}
+    columns = [
+        ("term_offsets", "uint32", term_offsets),
+        ("term_bytes", "uint8", term_bytes),
+        ("cell_offsets", "uint32", cell_offsets),
+        ("cell_year", "uint8", cell_year),
+        ("cell_count", "uint32", cell_count),
+        ("cell_score", "uint32", cell_score),
+    ]
+    return pack_columns(MAGIC, VERSION, len(terms), meta, columns)
+
+
+def write_keyword_cube(path, cells):
+    path = Path(path)
+    write_if_changed(path, encode_keyword_cube(cells))
+    return path
+
+
+class KeywordCube:
+    def __init__(self, buffer):
+        import numpy as np
+
+        self._np = np
+        count, header = unpack_header(buffer, MAGIC, VERSION)
+        columns = numpy_columns(buffer, header)
+        self.first_year = header["first_year"]
+        self.span = header["years"]
+        term_bytes = columns["term_bytes"].tobytes()
+        self.terms = term_bytes[:-1].decode("utf-8").split("\0") if term_bytes else []
+
+        rows = np.repeat(np.arange(count), np.diff(columns["cell_offsets"]))
+        years = columns["cell_year"].astype(np.int64)
+        self.prefix = {}
+        for weighting, column in WEIGHTINGS.items():
+            dense = np.zeros((count, self.span + 1), dtype=np.int64)
+            dense[rows, years + 1] = columns[column]
+            self.prefix[weighting] = np.cumsum(dense, axis=1)
+
+    @classmethod
+    def open(cls, path):
+        return cls(Path(path).read_bytes())
+
+    @property
+    def last_year(self):
+        return self.first_year + self.span - 1
+
+    def top(self, first=None, last=None, k=50, weighting="citations"):
+        """Top-k keywords over [first, last] as wordcloud_data.json entries ({text, size})."""
+        np = self._np
+        first = self.first_year if first is None else max(first, self.first_year)
+        last = self.last_year if last is None else min(last, self.last_year)
+        if not self.terms or first > last or k <= 0:
+            return []
+        prefix = self.prefix[weighting]
+        totals = prefix[:, last - self.first_year + 1] - prefix[:, first - self.first_year]
+        if totals.size > k:
+            picked = np.argpartition(-totals, k - 1)[:k]
+        else:
+            picked = np.arange(totals.size)
+        # 关键词按总分排序存储，序号小者优先，保证同分时结果稳定
+        picked = picked[np.lexsort((picked, -totals[picked]))]
+        return [{"text": self.terms[idx], "size": int(totals[idx])} for idx in picked if totals[idx] > 0]
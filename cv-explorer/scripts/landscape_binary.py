@@ -0,0 +1,288 @@
+"""Compact columnar encoding of `landscape_data.json` (`landscape_data.bin`).
+
+Layout (all integers little-endian, every column starts on a 4-byte boundary):
+
+    offset  type        field
+    0       char[4]     magic "CVLB"
+    4       uint16      format version (1)
+    6       uint16      reserved (0)
+    8       uint32      record count N
+    12      uint32      header length H (bytes of UTF-8 JSON)
+    16      byte[H]     header JSON, space-padded to a multiple of 4
+
+The header JSON describes everything that is not a per-record number:
+
+    {
+      "bounds": {"x": [min, max], "y": [min, max]},
+      "dictionaries": {"venue": [...], "concept": [...]},
+      "columns": [{"name": "x", "type": "uint16", "offset": 1234, "length": N}, ...]
+    }
+
+`offset` is absolute from the start of the file and `length` counts elements.
+Columns, in order:
+
+    x, y                uint16[N]   quantized: v = min + q / 65535 * (max - min)
+    year                uint16[N]   0 = unknown
+    citations           uint32[N]
+    venue               uint8[N]    index into dictionaries.venue (uint16 beyond 256)
+    semantic_primary    uint16[N]   index into dictionaries.concept, 65535 = null
+    semantic_cluster    uint16[N]   index into dictionaries.concept, 65535 = null
+    concept_offsets     uint32[N+1] record i owns concept_ids[offsets[i]:offsets[i+1]]
+    concept_ids         uint16[*]   indexes into dictionaries.concept
+    title_offsets       uint32[N+1] byte ranges into title_bytes
+    title_bytes         uint8[*]    UTF-8, each string followed by a NUL byte
+    id_offsets          uint32[N+1] byte ranges into id_bytes
+    id_bytes            uint8[*]    UTF-8, each string followed by a NUL byte
+
+The NUL terminators let a reader decode a whole string column at once and
+split on "\\0"; the offsets still allow random access (drop the last byte).
+
+`web/src/landscape_binary.js` reads this layout into typed arrays.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from publish import publish_bytes
+
+MAGIC = b"CVLB"
+VERSION = 1
+NULL_CODE = 0xFFFF
+QUANT_MAX = 0xFFFF
+PREAMBLE = struct.Struct("<4sHHII")
+
+# JSON column type -> array typecode
+COLUMN_TYPES = {
+    "uint8": "B",
+    "uint16": "H",
+    "uint32": "I",
+}
+
+# JSON column type -> numpy dtype, for readers that map the file with numpy
+NUMPY_TYPES = {
+    "uint8": "<u1",
+    "uint16": "<u2",
+    "uint32": "<u4",
+}
+
+
+def _typed(typecode, values=()):
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def _bounds(values):
+    if not values:
+        return [0.0, 0.0]
+    return [float(min(values)), float(max(values))]
+
+
+def _quantize(value, lo, hi):
+    if hi <= lo:
+        return 0
+    scaled = round((value - lo) / (hi - lo) * QUANT_MAX)
+    return min(QUANT_MAX, max(0, int(scaled)))
+
+
+def string_column(strings):
+    offsets = [0]
+    blob = bytearray()
+    for text in strings:
+        blob.extend(str(text if text is not None else "").replace("\0", "").encode("utf-8"))
+        blob.append(0)
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def encode_landscape(records):
+    count = len(records)
+    xs = [float(r.get("x") or 0.0) for r in records]
+    ys = [float(r.get("y") or 0.0) for r in records]
+    bounds = {"x": _bounds(xs), "y": _bounds(ys)}
+
+    venues = []
+    venue_index = {}
+    concepts = []
+    concept_index = {}
+
+    def venue_code(name):
+        name = name or ""
+        if name not in venue_index:
+            venue_index[name] = len(venues)
+            venues.append(name)
+        return venue_index[name]
+
+    def concept_code(name):
+        if name is None:
+            return NULL_CODE
+        if name not in concept_index:
+            if len(concepts) >= NULL_CODE:
+                raise ValueError("concept dictionary exceeds 65535 entries")
+            concept_index[name] = len(concepts)
+            concepts.append(name)
+        return concept_index[name]
+
+    concept_offsets = [0]
+    concept_ids = []
+    for record in records:
+        for concept in record.get("concepts") or []:
+            concept_ids.append(concept_code(concept))
+        concept_offsets.append(len(concept_ids))
+
+    title_offsets, title_bytes = string_column(r.get("title") for r in records)
+    id_offsets, id_bytes = string_column(
+        r.get("id") or f"paper-{i}" for i, r in enumerate(records))
+
+    venue_codes = [venue_code(r.get("venue")) for r in records]
+    # 最多 256 个 venue 用 uint8 编码，更多时改用 uint16（列类型记录在头部，读取端无需改动）
+    if len(venues) > 0x10000:
+        raise ValueError("venue dictionary exceeds 65536 entries")
+    venue_type = "uint8" if len(venues) <= 0x100 else "uint16"
+
+    columns = [
+        ("x", "uint16", [_quantize(v, *bounds["x"]) for v in xs]),
+        ("y", "uint16", [_quantize(v, *bounds["y"]) for v in ys]),
+        ("year", "uint16", [int(r.get("year") or 0) for r in records]),
+        ("citations", "uint32", [max(0, int(r.get("citations") or 0)) for r in records]),
+        ("venue", venue_type, venue_codes),
+        ("semantic_primary", "uint16", [concept_code(r.get("semantic_primary")) for r in records]),
+        ("semantic_cluster", "uint16", [concept_code(r.get("semantic_cluster")) for r in records]),
+        ("concept_offsets", "uint32", concept_offsets),
+        ("concept_ids", "uint16", concept_ids),
+        ("title_offsets", "uint32", title_offsets),
+        ("title_bytes", "uint8", title_bytes),
+        ("id_offsets", "uint32", id_offsets),
+        ("id_bytes", "uint8", id_bytes),
+    ]
+    meta = {
+        "bounds": bounds,
+        "dictionaries": {"venue": venues, "concept": concepts},
+    }
+    return pack_columns(MAGIC, VERSION, count, meta, columns)
+
+
+def pack_columns(magic, version, count, meta, columns):
+    """Preamble + header JSON (`meta` plus the column layout) + aligned columns.
+
+    `columns` is a list of (name, type, values) with type a COLUMN_TYPES key.
+    Shared with `search_index.py`, whose file uses the same container.
+    """
+    encoded = [(name, kind, _typed(COLUMN_TYPES[kind], values).tobytes(), len(values))
+               for name, kind, values in columns]
+
+    def build_header(start):
+        layout = []
+        cursor = start
+        for name, kind, payload, length in encoded:
+            layout.append({"name": name, "type": kind, "offset": cursor, "length": length})
+            cursor += len(payload)
+            cursor += (-cursor) % 4
+        header = dict(meta, columns=layout)
+        raw = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return raw + b" " * ((-len(raw)) % 4)
+
+    # Column offsets depend on the header length, which depends on the offsets;
+    # iterate until the padded header size is stable (at most a few rounds).
+    header = build_header(PREAMBLE.size)
+    while True:
+        candidate = build_header(PREAMBLE.size + len(header))
+        if len(candidate) == len(header):
+            header = candidate
+            break
+        header = candidate
+
+    out = bytearray(PREAMBLE.pack(magic, version, 0, count, len(header)))
+    out.extend(header)
+    for _, _, payload, _ in encoded:
+        out.extend(payload)
+        out.extend(b"\0" * ((-len(out)) % 4))
+    return bytes(out)
+
+
+def unpack_header(buffer, magic, version):
+    """Validate the preamble and return (count, header dict)."""
+    found, found_version, _, count, header_length = PREAMBLE.unpack_from(buffer, 0)
+    if found != magic:
+        raise ValueError(f"not a {magic.decode()} file")
+    if found_version != version:
+        raise ValueError(f"unsupported {magic.decode()} version {found_version}")
+    return count, json.loads(bytes(buffer[PREAMBLE.size:PREAMBLE.size + header_length]))
+
+
+def numpy_columns(buffer, header):
+    """Zero-copy numpy views of every column (numpy is imported lazily)."""
+    import numpy as np
+
+    return {
+        spec["name"]: np.frombuffer(buffer, dtype=NUMPY_TYPES[spec["type"]],
+                                    count=spec["length"], offset=spec["offset"])
+        for spec in header["columns"]
+    }
+
+
+def decode_landscape(buffer):
+    """Inverse of `encode_landscape` (x/y come back quantized)."""
+    count, header = unpack_header(buffer, MAGIC, VERSION)
+
+    view = memoryview(buffer)
+    columns = {}
+    for spec in header["columns"]:
+        typecode = COLUMN_TYPES[spec["type"]]
+        itemsize = array(typecode).itemsize
+        start = spec["offset"]
+        chunk = view[start:start + spec["length"] * itemsize]
+        column = array(typecode)
+        column.frombytes(chunk)
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns[spec["name"]] = column
+
+    venues = header["dictionaries"]["venue"]
+    concepts = header["dictionaries"]["concept"]
+    (x_lo, x_hi), (y_lo, y_hi) = header["bounds"]["x"], header["bounds"]["y"]
+    x_step = (x_hi - x_lo) / QUANT_MAX
+    y_step = (y_hi - y_lo) / QUANT_MAX
+    titles = columns["title_bytes"].tobytes()
+    ids = columns["id_bytes"].tobytes()
+    concept_offsets = columns["concept_offsets"]
+    concept_ids = columns["concept_ids"]
+    title_offsets = columns["title_offsets"]
+    id_offsets = columns["id_offsets"]
+
+    def concept_or_none(code):
+        return None if code == NULL_CODE else concepts[code]
+
+    records = []
+    for i in range(count):
+        records.append({
+            "id": ids[id_offsets[i]:id_offsets[i + 1] - 1].decode("utf-8"),
+            "title": titles[title_offsets[i]:title_offsets[i + 1] - 1].decode("utf-8"),
+            "year": columns["year"][i] or None,
+            "venue": venues[columns["venue"][i]],
+            "citations": columns["citations"][i],
+            "x": x_lo + columns["x"][i] * x_step,
+            "y": y_lo + columns["y"][i] * y_step,
+            "concepts": [concepts[c] for c in concept_ids[concept_offsets[i]:concept_offsets[i + 1]]],
+            "semantic_primary": concept_or_none(columns["semantic_primary"][i]),
+            "semantic_cluster": concept_or_none(columns["semantic_cluster"][i]),
+        })
+    return records
+
+
+def save_landscape_binary(path, records):
+    path = Path(path)
+    publish_bytes(path, encode_landscape(records))
+    return path
+
+
+if __name__ == "__main__":
+    source = Path(sys.argv[1] if len(sys.argv) > 1 else "data/landscape_data.json")
+    with source.open("r", encoding="utf-8") as f:
+        payload = json.load(f)
+    target = save_landscape_binary(source.with_suffix(".bin"), payload)
+    print(f"{source} ({source.stat().st_size} B) -> {target} ({target.stat().st_size} B)")
@@ -0,0 +1,309 @@
+"""Precomputed density contours and semantic anchors for the landscape view.
+
+`landscape.js` used to run `d3.contourDensity` and regroup the anchors on
+every redraw. This stage computes them once per (year, venue, bandwidth):
+
+* density: citation-weighted points are binned onto a GRID x GRID lattice
+  and convolved with a Gaussian via zero-padded FFT (binned KDE); each grid
+  is normalised to its peak.
+* contours: marching squares at the relative THRESHOLDS, stitched into
+  closed rings (the grid is zero-padded, so every ring closes). Rings of one
+  threshold are drawn as a single even-odd path, so holes need no winding.
+* anchors: the same grouping/scoring as the view's `getSemanticAnchors`,
+  keeping the top MAX_ANCHORS groups and one weighted centroid per step of
+  the smoothing slider (0..1 by 0.05).
+
+The view does not offer a bandwidth control: its kernel width follows the
+zoom level. BANDWIDTHS is therefore a ladder of kernel widths expressed as a
+fraction of the plane width; the client picks the rung nearest to what the
+zoom would have used.
+
+Output (`density/`):
+
+    index.json   {"version", "grid", "bounds": {"x", "y"}, "bandwidths",
+                  "thresholds", "smoothing_steps",
+                  "scopes": {"all": {"path", "bytes", "sha256"}, "2014": ...}}
+    <scope>.json {"venues": {"ALL": {"count", "contours": [[rings per threshold]
+                  per bandwidth], "anchors": [...]}, "CVPR": ...}}
+
+Rings are flat integer lists in tenths of a (padded) grid cell, delta-coded:
+[x0, y0, dx1, dy1, ...]. Grid coordinate p maps to
+`bounds.x[0] + (p - 0.5) * (bounds.x[1] - bounds.x[0]) / grid` (same for y).
+"""
+
+import hashlib
+import json
+import math
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from profiling import count as profile_count
+from publish import is_compressed_sibling, publish_bytes
+
+DENSITY_VERSION = 1
+GRID = 128
+GRID_MARGIN = 0.06
+BANDWIDTHS = (0.16, 0.1, 0.06, 0.035, 0.02, 0.012)
+THRESHOLDS = (0.06, 0.12, 0.2, 0.3, 0.42, 0.56, 0.72, 0.88)
+SMOOTHING_STEPS = 21
+MAX_ANCHORS = 20
+COORD_SCALE = 10
+ALL_SCOPE = "all"
+ALL_VENUES = "ALL"
+INDEX_NAME = "index.json"
+EXCLUDED_ANCHORS = {"Others", "Uncategorized Research", "General Computer Vision"}
+
+
+def semantic_label_of(entry):
+    concepts = entry.get("concepts") or []
+    return (entry.get("semantic_primary")
+            or (concepts[0] if concepts else None)
+            or entry.get("semantic_cluster")
+            or entry.get("venue")
+            or "Others")
+
+
+def secondary_keyword_of(entry):
+    concepts = entry.get("concepts") or []
+    return (entry.get("semantic_cluster")
+            or (concepts[1] if len(concepts) > 1 else None)
+            or (concepts[0] if concepts else None)
+            or "递补")
+
+
+def grid_bounds(records):
+    xs = [float(r["x"]) for r in records] or [0.0, 1.0]
+    ys = [float(r["y"]) for r in records] or [0.0, 1.0]
+    span_x = (max(xs) - min(xs)) or 1.0
+    span_y = (max(ys) - min(ys)) or 1.0
+    return {
+        "x": [min(xs) - span_x * GRID_MARGIN, max(xs) + span_x * GRID_MARGIN],
+        "y": [min(ys) - span_y * GRID_MARGIN, max(ys) + span_y * GRID_MARGIN],
+    }
+
+
+def weighted_histogram(records, bounds, grid=GRID):
+    import numpy as np
+
+    xs = np.fromiter((float(r["x"]) for r in records), dtype=np.float64, count=len(records))
+    ys = np.fromiter((float(r["y"]) for r in records), dtype=np.float64, count=len(records))
+    weights = np.fromiter((max(1.0, float(r.get("citations") or 1)) for r in records),
+                          dtype=np.float64, count=len(records))
+    # rows = y, columns = x
+    hist, _, _ = np.histogram2d(ys, xs, bins=grid, range=[bounds["y"], bounds["x"]], weights=weights)
+    return hist
+
+
+def gaussian_blur_fft(hist, sigma_cells):
+    """Convolve `hist` with an isotropic Gaussian using a zero-padded real FFT."""
+    import numpy as np
+
+    radius = max(1, int(math.ceil(3 * sigma_cells)))
+    offsets = np.arange(-radius, radius + 1)
+    kernel_1d = np.exp(-0.5 * (offsets / sigma_cells) ** 2)
+    kernel = np.outer(kernel_1d, kernel_1d)
+    kernel /= kernel.sum()
+    rows, cols = hist.shape
+    shape = (rows + 2 * radius, cols + 2 * radius)
+    spectrum = np.fft.rfft2(hist, shape) * np.fft.rfft2(kernel, shape)
+    full = np.fft.irfft2(spectrum, shape)
+    return full[radius:radius + rows, radius:radius + cols]
+
+
+# case -> pairs of cell edges (t=top, r=right, b=bottom, l=left); corners are
+# tl=8, tr=4, br=2, bl=1. Saddles 5/10 are resolved with the cell centre.
+_SEGMENTS = {
+    1: (("l", "b"),), 2: (("b", "r"),), 3: (("l", "r"),), 4: (("t", "r"),),
+    6: (("t", "b"),), 7: (("l", "t"),), 8: (("l", "t"),), 9: (("t", "b"),),
+    11: (("t", "r"),), 12: (("l", "r"),), 13: (("b", "r"),), 14: (("l", "b"),),
+}
+_SADDLES = {
+    5: ((("l", "t"), ("b", "r")), (("t", "r"), ("l", "b"))),
+    10: ((("t", "r"), ("l", "b")), (("l", "t"), ("b", "r"))),
+}
+
+
+def marching_squares(values, threshold):
+    """Closed iso-rings of `values` at `threshold`, in padded grid coordinates."""
+    import numpy as np
+
+    padded = np.pad(values, 1)
+    inside = padded >= threshold
+    cases = (inside[:-1, :-1] * 8 + inside[:-1, 1:] * 4
+             + inside[1:, 1:] * 2 + inside[1:, :-1] * 1)
+
+    def fraction(a, b):
+        if b == a:
+            return 0.5
+        return min(1.0, max(0.0, (threshold - a) / (b - a)))
+
+    def edge_point(edge, i, j):
+        # Edge keys are shared by neighbouring cells, which makes stitching exact.
+        if edge == "t":
+            return ("h", i, j), (j + fraction(padded[i, j], padded[i, j + 1]), i)
+        if edge == "b":
+            return ("h", i + 1, j), (j + fraction(padded[i + 1, j], padded[i + 1, j + 1]), i + 1)
+        if edge == "l":
+            return ("v", i, j), (j, i + fraction(padded[i, j], padded[i + 1, j]))
+        return ("v", i, j + 1), (j + 1, i + fraction(padded[i, j + 1], padded[i + 1, j + 1]))
+
+    neighbours = defaultdict(list)
+    positions = {}
+    for i, j in zip(*np.nonzero((cases != 0) & (cases != 15))):
+        case = int(cases[i, j])
+        if case in _SADDLES:
+            centre = padded[i:i + 2, j:j + 2].mean()
+            pairs = _SADDLES[case][0 if centre >= threshold else 1]
+        else:
+            pairs = _SEGMENTS[case]
+        for a, b in pairs:
+            key_a, pos_a = edge_point(a, i, j)
+            key_b, pos_b = edge_point(b, i, j)
+            positions[key_a] = pos_a
+            positions[key_b] = pos_b
+            neighbours[key_a].append(key_b)
+            neighbours[key_b].append(key_a)
+
+    rings = []
+    visited = set()
+    for start in neighbours:
+        if start in visited:
+            continue
+        ring = [start]
+        visited.add(start)
+        previous, current = None, start
+        while True:
+            candidates = [n for n in neighbours[current] if n != previous and n not in visited]
+            if not candidates:
+                break
+            previous, current = current, candidates[0]
+            visited.add(current)
+            ring.append(current)
+        if len(ring) >= 3:
+            rings.append([positions[key] for key in ring])
+    return rings
+
+
+def encode_ring(ring):
+    encoded = []
+    last_x = last_y = 0
+    for x, y in ring:
+        qx, qy = int(round(x * COORD_SCALE)), int(round(y * COORD_SCALE))
+        encoded.extend((qx - last_x, qy - last_y))
+        last_x, last_y = qx, qy
+    return encoded
+
+
+def density_contours(records, bounds, grid=GRID):
+    """Encoded rings per bandwidth per threshold for one (scope, venue) subset."""
+    hist = weighted_histogram(records, bounds, grid)
+    result = []
+    for bandwidth in BANDWIDTHS:
+        density = gaussian_blur_fft(hist, bandwidth * grid)
+        peak = float(density.max())
+        levels = []
+        for threshold in THRESHOLDS:
+            rings = marching_squares(density / peak, threshold) if peak > 0 else []
+            levels.append([encode_ring(ring) for ring in rings])
+            profile_count("contour_rings", len(rings))
+        result.append(levels)
+    return result
+
+
+def semantic_anchors(records):
+    groups = defaultdict(list)
+    for record in records:
+        groups[semantic_label_of(record)].append(record)
+
+    anchors = []
+    for name, members in groups.items():
+        if name in EXCLUDED_ANCHORS:
+            continue
+        count = len(members)
+        total_cites = sum(m.get("citations") or 0 for m in members)
+        avg_cites = total_cites / count if count else 0
+        keyword_counts = defaultdict(int)
+        for member in members:
+            keyword_counts[secondary_keyword_of(member)] += 1
+        positions = []
+        for step in range(SMOOTHING_STEPS):
+            exponent = 1 + (step / (SMOOTHING_STEPS - 1)) * 0.8
+            weights = [math.pow((m.get("citations") or 1) + 1, exponent) for m in members]
+            total = sum(weights)
+            x = sum(w * float(m["x"]) for w, m in zip(weights, members)) / total
+            y = sum(w * float(m["y"]) for w, m in zip(weights, members)) / total
+            positions.append([round(x, 3), round(y, 3)])
+        anchors.append({
+            "name": name,
+            "count": count,
+            "importance": total_cites,
+            "score": round(math.pow(count, 1.18) + math.log1p(avg_cites) * 4, 4),
+            # 与前端 d3.rollups + sort 一致：按出现次数降序，平局保持首次出现顺序
+            "keywords": [k for k, _ in sorted(keyword_counts.items(), key=lambda kv: -kv[1])[:3]],
+            "positions": positions,
+        })
+    anchors.sort(key=lambda a: (-a["score"], -a["count"], -a["importance"]))
+    return anchors[:MAX_ANCHORS]
+
+
+def write_landscape_density(density_root, records):
+    density_root = Path(density_root)
+    bounds = grid_bounds(records)
+    scopes = defaultdict(list)
+    for record in records:
+        scopes[ALL_SCOPE].append(record)
+        if record.get("year") is not None:
+            scopes[str(record["year"])].append(record)
+
+    index = {
+        "version": DENSITY_VERSION,
+        "grid": GRID,
+        "bounds": bounds,
+        "bandwidths": list(BANDWIDTHS),
+        "thresholds": list(THRESHOLDS),
+        "smoothing_steps": SMOOTHING_STEPS,
+        "scopes": {},
+    }
+    written = {INDEX_NAME}
+    for scope in sorted(scopes, key=lambda s: (s != ALL_SCOPE, s)):
+        by_venue = defaultdict(list)
+        for record in scopes[scope]:
+            by_venue[ALL_VENUES].append(record)
+            by_venue[record.get("venue") or "Others"].append(record)
+        payload = {"venues": {}}
+        for venue, members in sorted(by_venue.items()):
+            payload["venues"][venue] = {
+                "count": len(members),
+                "contours": density_contours(members, bounds),
+                "anchors": semantic_anchors(members),
+            }
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        name = f"{scope}.json"
+        publish_bytes(density_root / name, raw)
+        written.add(name)
+        index["scopes"][scope] = {
+            "path": name,
+            "bytes": len(raw),
+            "sha256": hashlib.sha256(raw).hexdigest(),
+        }
+
+    for stale in density_root.iterdir():
+        base = stale.stem if is_compressed_sibling(stale) else stale.name
+        if stale.is_file() and base not in written:
+            stale.unlink()
+
+    index_path = density_root / INDEX_NAME
+    publish_bytes(index_path, json.dumps(index, ensure_ascii=False, indent=2).encode("utf-8"))
+    return index_path
+
+
+if __name__ == "__main__":
+    data_dir = Path(sys.argv[1] if len(sys.argv) > 1 else "data")
+    with (data_dir / "landscape_data.json").open("r", encoding="utf-8") as f:
+        landscape = json.load(f)
+    index_path = write_landscape_density(data_dir / "density", landscape)
+    with index_path.open("r", encoding="utf-8") as f:
+        index = json.load(f)
+    total = sum(meta["bytes"] for meta in index["scopes"].values())
+    print(f"{len(index['scopes'])} scopes, {total} B -> {index_path}")
@@ -0,0 +1,155 @@
+"""Level-of-detail quadtree tiles for the semantic landscape.
+
+The landscape plane (the global x/y bounds) is split like a map pyramid:
+tile `z/x/y` covers 1/2^z of each axis, with `x` growing with the data x and
+`y` growing with the data y. A tile holding more than `capacity` papers keeps
+only its `capacity` most-cited papers as representatives and is subdivided;
+a tile with at most `capacity` papers (or at `max_zoom`) is a leaf and holds
+every paper inside it. Only non-empty tiles are written, so a client that
+needs `z/x/y` below a leaf uses the nearest existing ancestor.
+
+One pyramid is built for all years (`all`) and one per year, matching the
+year filter of the landscape view:
+
+    tiles/index.json
+    tiles/<scope>/<z>/<x>/<y>.json      scope = "all" | "2014" | ...
+
+`index.json`:
+
+    {
+      "version": 1, "capacity": 256, "max_zoom": 8,
+      "bounds": {"x": [min, max], "y": [min, max]},
+      "scopes": {
+        "all": {"count": 3300, "tiles": {"0/0/0": {"count": 3300, "records": 256,
+                                                   "leaf": false, "sha256": "..."}}},
+        "2014": {...}
+      }
+    }
+
+Tiles contain landscape records (same shape as landscape_data.json) sorted
+by citations, and are served by `GET /api/landscape/tiles/<z>/<x>/<y>?year=`.
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from publish import is_compressed_sibling, publish_bytes
+
+TILES_VERSION = 1
+TILE_CAPACITY = 256
+MAX_ZOOM = 8
+INDEX_NAME = "index.json"
+ALL_SCOPE = "all"
+
+
+def coordinate_bounds(records):
+    xs = [float(r["x"]) for r in records]
+    ys = [float(r["y"]) for r in records]
+    if not xs:
+        return {"x": [0.0, 1.0], "y": [0.0, 1.0]}
+    return {"x": [min(xs), max(xs)], "y": [min(ys), max(ys)]}
+
+
+def _unit(value, lo, hi):
+    if hi <= lo:
+        return 0.0
+    return min(1.0, max(0.0, (value - lo) / (hi - lo)))
+
+
+def tile_of(u, v, z):
+    """Tile column/row at zoom `z` for unit coordinates in [0, 1]."""
+    side = 1 << z
+    return min(side - 1, int(u * side)), min(side - 1, int(v * side))
+
+
+def build_pyramid(records, bounds, capacity=TILE_CAPACITY, max_zoom=MAX_ZOOM):
+    """Return {(z, x, y): (records_in_tile, total_count, is_leaf)}."""
+    (x_lo, x_hi), (y_lo, y_hi) = bounds["x"], bounds["y"]
+    # 先按引用降序排好，子集保持顺序，代表点直接取前 capacity 个
+    ranked = sorted(records, key=lambda r: (-(r.get("citations") or 0), str(r.get("id"))))
+    units = [(_unit(float(r["x"]), x_lo, x_hi), _unit(float(r["y"]), y_lo, y_hi)) for r in ranked]
+
+    tiles = {}
+    stack = [(0, 0, 0, list(range(len(ranked))))]
+    while stack:
+        z, tx, ty, members = stack.pop()
+        if not members:
+            continue
+        leaf = len(members) <= capacity or z >= max_zoom
+        chosen = members if leaf else members[:capacity]
+        tiles[(z, tx, ty)] = ([ranked[i] for i in chosen], len(members), leaf)
+        if leaf:
+            continue
+        children = {}
+        for i in members:
+            children.setdefault(tile_of(*units[i], z + 1), []).append(i)
+        for (cx, cy), child_members in children.items():
+            stack.append((z + 1, cx, cy, child_members))
+    return tiles
+
+
+def _tile_bytes(records):
+    return json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_landscape_tiles(tile_root, records, capacity=TILE_CAPACITY, max_zoom=MAX_ZOOM):
+    tile_root = Path(tile_root)
+    bounds = coordinate_bounds(records)
+    scopes = {ALL_SCOPE: records}
+    for record in records:
+        if record.get("year") is not None:
+            scopes.setdefault(str(record["year"]), []).append(record)
+
+    index = {
+        "version": TILES_VERSION,
+        "capacity": capacity,
+        "max_zoom": max_zoom,
+        "bounds": bounds,
+        "scopes": {},
+    }
+    written = set()
+    for scope in sorted(scopes, key=lambda s: (s != ALL_SCOPE, s)):
+        pyramid = build_pyramid(scopes[scope], bounds, capacity, max_zoom)
+        tile_meta = {}
+        for (z, tx, ty), (members, total, leaf) in sorted(pyramid.items()):
+            payload = _tile_bytes(members)
+            relative = f"{scope}/{z}/{tx}/{ty}.json"
+            publish_bytes(tile_root / relative, payload)
+            written.add(relative)
+            tile_meta[f"{z}/{tx}/{ty}"] = {
+                "count": total,
+                "records": len(members),
+                "leaf": leaf,
+                "sha256": hashlib.sha256(payload).hexdigest(),
+            }
+        index["scopes"][scope] = {"count": len(scopes[scope]), "tiles": tile_meta}
+
+    # 清理旧金字塔中已不存在的瓦片
+    for stale in tile_root.rglob("*.json*"):
+        relative = stale.relative_to(tile_root)
+        if is_compressed_sibling(stale):
+            relative = relative.with_suffix("")
+        if relative.as_posix() != INDEX_NAME and relative.as_posix() not in written:
+            stale.unlink()
+    for directory in sorted((p for p in tile_root.rglob("*") if p.is_dir()), reverse=True):
+        if not any(directory.iterdir()):
+            directory.rmdir()
+
+    index_path = tile_root / INDEX_NAME
+    publish_bytes(index_path, json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return index_path
+
+
+if __name__ == "__main__":
+    data_dir = Path(sys.argv[1] if len(sys.argv) > 1 else "data")
+    with (data_dir / "landscape_data.json").open("r", encoding="utf-8") as f:
+        landscape = json.load(f)
+    index_path = write_landscape_tiles(data_dir / "tiles", landscape)
+    with index_path.open("r", encoding="utf-8") as f:
+        index = json.load(f)
+    for scope, meta in index["scopes"].items():
+        depth = max(int(key.split("/")[0]) for key in meta["tiles"])
+        print(f"{scope}: {meta['count']} papers, {len(meta['tiles'])} tiles, depth {depth}")
+    print(f"index -> {index_path}")
@@ -0,0 +1,196 @@
+"""Precompute AI panel insights for the hot set (`ai_insights.json`).
+
+Most public-demo traffic asks about the same few dozen leaderboard entries and
+the most cited landscape papers. This job generates those analyses offline,
+through the backend's own `run_analysis` (so prompts, providers and the
+response cache are exactly those of `/api/analyze`), and publishes them as a
+static asset that `ai_panel.js` consults before calling the backend:
+
+    {
+      "version": 1,
+      "entries": {
+        "<key>": {"prompt_type": "paper_impact", "variant": "", "text": "...",
+                  "model": "deepseek", "summary": "...", "keywords": [...],
+                  "confidence": 1.0, "generated": "2025-01-01T00:00:00Z"}
+      }
+    }
+
+    key = sha256(f"{prompt_type}\\n{variant}\\n{normalized text}").hexdigest()[:16]
+
+`normalized text` is the whitespace-collapsed, lower-cased title or name;
+`variant` is "nankai" for scholar profiles requested from the NANKAI
+leaderboard (their prompt differs) and "" otherwise. `insight_store.js`
+computes the same key in the browser.
+
+Reruns only generate entries that are missing (or were made by another model);
+entries no longer in the hot set are dropped.
+
+    python scripts/precompute_insights.py --model deepseek --top 30 --concurrency 4
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from publish import publish_bytes, stamp_assets
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+WEB_DATA_DIR = PROJECT_ROOT / "web" / "data"
+OUTPUT_NAME = "ai_insights.json"
+VERSION = 1
+
+
+def normalize_text(text):
+    return " ".join(str(text or "").split()).lower()
+
+
+def insight_key(prompt_type, text, variant=""):
+    raw = f"{prompt_type or ''}\n{variant}\n{normalize_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def leaderboard_jobs(seeds):
+    """Jobs for every scholar and paper card, with the context ai_panel.js would send."""
+    jobs = []
+    for view, board in seeds.items():
+        for scholar in board.get("scholars", []):
+            jobs.append({
+                "prompt_type": "scholar_profile",
+                "variant": "nankai" if view == "nankai" else "",
+                "text": scholar["name"],
+                "context": {"year": "Career", "venue": scholar.get("aff"), "citations": scholar.get("citations"),
+                            "desc": scholar.get("desc"), "concepts": scholar.get("tags"),
+                            "leaderboardView": view},
+            })
+        for paper in board.get("papers", []):
+            jobs.append({
+                "prompt_type": "paper_impact",
+                "variant": "",
+                "text": paper["title"],
+                "context": {"year": paper.get("year"), "venue": paper.get("venue"),
+                            "citations": paper.get("citations"), "authors": paper.get("authors"),
+                            "leaderboardView": view},
+            })
+    return jobs
+
+
+def landscape_jobs(records, top):
+    ranked = sorted(records, key=lambda r: int(r.get("citations") or 0), reverse=True)[:top]
+    return [{
+        "prompt_type": "paper_impact",
+        "variant": "",
+        "text": record["title"],
+        "context": {"year": record.get("year"), "venue": record.get("venue"),
+                    "citations": record.get("citations"), "concepts": record.get("concepts")},
+    } for record in ranked if record.get("title")]
+
+
+def unique_jobs(jobs):
+    """First job per key wins (leaderboard cards carry richer context than landscape records)."""
+    seen = {}
+    for job in jobs:
+        seen.setdefault(insight_key(job["prompt_type"], job["text"], job["variant"]), job)
+    return seen
+
+
+def load_existing(path):
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return payload.get("entries", {}) if payload.get("version") == VERSION else {}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate static AI insights for the leaderboard and top papers.")
+    parser.add_argument("--seeds", default=str(DATA_DIR / "leaderboard_seeds.json"))
+    parser.add_argument("--landscape", default=str(DATA_DIR / "landscape_data.json"))
+    parser.add_argument("--output", default=str(DATA_DIR / OUTPUT_NAME))
+    parser.add_argument("--top", type=int, default=30, help="Most cited landscape papers to include.")
+    parser.add_argument("--model", default="deepseek")
+    parser.add_argument("--api-key", default="", help="Defaults to the backend's configured key.")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--force", action="store_true", help="Regenerate every entry.")
+    parser.add_argument("--no-publish", action="store_true", help="Do not mirror to web/data.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+    import server
+
+    if args.model not in server.API_KEYS and args.model != "mock":
+        print(f"不支持的模型: {args.model}")
+        return 2
+    api_key = args.api_key or server.API_KEYS.get(args.model, "")
+    if args.model != "mock" and not api_key:
+        print(f"[warn] {args.model} 未配置 API Key，将写入 Mock 演示响应")
+
+    with open(args.seeds, "r", encoding="utf-8") as f:
+        jobs = leaderboard_jobs(json.load(f))
+    if args.top > 0 and Path(args.landscape).exists():
+        with open(args.landscape, "r", encoding="utf-8") as f:
+            jobs += landscape_jobs(json.load(f), args.top)
+    wanted = unique_jobs(jobs)
+
+    output = Path(args.output)
+    existing = load_existing(output)
+    entries = {key: entry for key, entry in existing.items()
+               if key in wanted and not args.force and entry.get("model") == args.model}
+    missing = {key: job for key, job in wanted.items() if key not in entries}
+    print(f"{len(wanted)} 条热点，已有 {len(entries)} 条，需生成 {len(missing)} 条 (model={args.model})")
+
+    def generate(key, job):
+        result, _ = server.run_analysis(args.model, job["text"], job["context"], api_key, job["prompt_type"])
+        return key, job, result
+
+    failed = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        futures = [executor.submit(generate, key, job) for key, job in missing.items()]
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                key, job, result = future.result()
+            except Exception as e:  # ProviderBusy 等：本轮跳过，下次增量补齐
+                failed += 1
+                print(f"  [{done}/{len(missing)}] 失败: {e}")
+                continue
+            if "error" in result:
+                failed += 1
+                print(f"  [{done}/{len(missing)}] 失败: {job['text'][:40]} - {result['error']}")
+                continue
+            if result.get("degraded"):  # 上游熔断或超时给出的演示响应不写入洞察
+                failed += 1
+                print(f"  [{done}/{len(missing)}] 已降级，跳过: {job['text'][:40]}")
+                continue
+            entries[key] = {
+                "prompt_type": job["prompt_type"],
+                "variant": job["variant"],
+                "text": job["text"],
+                "model": args.model,
+                "summary": result.get("summary", ""),
+                "keywords": result.get("keywords", []),
+                "confidence": result.get("confidence"),
+                "generated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            }
+            print(f"  [{done}/{len(missing)}] {job['prompt_type']}: {job['text'][:40]}")
+
+    payload = json.dumps({"version": VERSION, "entries": dict(sorted(entries.items()))},
+                         ensure_ascii=False, indent=2).encode("utf-8")
+    publish_bytes(output, payload)
+    if not args.no_publish and output.parent.resolve() == DATA_DIR.resolve():
+        publish_bytes(WEB_DATA_DIR / OUTPUT_NAME, payload)
+        stamp_assets(DATA_DIR, [OUTPUT_NAME])
+        stamp_assets(WEB_DATA_DIR, [OUTPUT_NAME])
+    print(f"写入 {output}: {len(entries)} 条（失败 {failed} 条，{time.perf_counter() - started:.1f}s）")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,1034 +2,52 @@ import argparse
 import json
 import math
 import re
-import shutil
 import warnings
 from collections import defaultdict, deque
 from pathlib import Path
 
-import numpy as np
-from sklearn.cluster import MiniBatchKMeans
-from sklearn.decomposition import TruncatedSVD
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.manifold import TSNE
+from corpus_columns import write_corpus_columns
+from flow_cube import write_flow_cube
+from landscape_binary import save_landscape_binary
+from landscape_density import write_landscape_density
+from landscape_tiles import write_landscape_tiles
+from profiling import StageProfiler, count as profile_count, stage as profile_stage
+from publish import is_compressed_sibling, publish_file, stamp_assets, write_if_changed
+from search_index import write_search_index
+from taxonomy import (
+    CONCEPT_END_YEAR,
+    CONCEPT_START_YEAR,
+    DEFAULT_PRIMARY_SEMANTIC,
+    METHOD_MATCHER,
+    METHOD_START_YEAR,
+    PROBLEM_MATCHER,
+    STRICT_CONCEPT_WHITELIST,
+    TERM_HIERARCHY,
+    TOPIC_MATCHER,
+    TOPIC_PRIORITY,
+    YEARLY_DOMINANT_MAP,
+    build_text_blob,
+    ensure_list,
+    get_allowed_concepts_for_year,
+    is_meaningful_concept,
+    normalize_citations,
+    normalize_phrase,
+    normalize_year,
+    pick_field,
+    prettify_concept,
+    select_canonical_semantic,
+)
+from year_shards import MANIFEST_NAME, load_manifest, manifest_files, write_year_shards
+
+# numpy / scikit-learn are imported inside the embedding stages so that
+# taxonomy-only callers do not pay for them at startup.
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 
-FIELD_ALIASES = {
-    "id": ("id", "paper_id", "pid"),
-    "title": ("t", "title", "paper_title"),
-    "year": ("y", "year", "pub_year"),
-    "venue": ("v", "venue", "journal", "conference"),
-    "citations": ("c", "citations", "citation", "num_citations"),
-    "abstract": ("abs", "abstract", "summary"),
-    "concepts": ("con", "concepts", "keywords", "tags", "topics")
-}
-
-PROBLEM_DEFINITIONS = {
-    "detection": [
-        r"\b(object|instance|face|pedestrian|vehicle|anomaly|skeleton)\s+detection\b",
-        r"\bdetectors?\b",
-        r"\byolo\b"
-    ],
-    "segmentation": [
-        r"\b(semantic|instance|panoptic|video|medical|image)\s+segmentation\b",
-        r"\bscene\s+parsing\b",
-        r"\bsegment\b"
-    ],
-    "tracking": [
-        r"\b(object|visual|video|multi-object|pose)\s+tracking\b",
-        r"\bmot\b",
-        r"\btrackers?\b"
-    ],
-    "recognition": [
-        r"\b(image|action|face|gesture|scene|pattern)\s+recognition\b",
-        r"\b(image|text|video)\s+classification\b",
-        r"\bre-?identification\b",
-        r"\bre-?id\b"
-    ],
-    "generation": [
-        r"\b(image|video|text-to-image|content|scene|avatar)\s+generation\b",
-        r"\b(image|view)\s+synthesis\b",
-        r"\bgenerative\s+models?\b",
-        r"\bstyle\s+transfer\b"
-    ],
-    "restoration": [
-        r"\b(image|video)\s+restoration\b",
-        r"\bsuper-?resolution\b",
-        r"\bdenoising\b",
-        r"\bdeblurring\b",
-        r"\binpainting\b",
-        r"\bderaining\b",
-        r"\bdehazing\b"
-    ],
-    "3d_vision": [
-        r"\b3d\s+reconstruction\b",
-        r"\bdepth\s+estimation\b",
-        r"\bpoint\s+clouds?\b",
-        r"\bslam\b",
-        r"\bnerf\b",
-        r"\bneural\s+radiance\s+fields?\b",
-        r"\b3d\s+generation\b"
-    ]
-}
-
-METHOD_DEFINITIONS = {
-    "cnn": [
-        r"\bcnn\b", r"\bconvnets?\b", r"\bconvolutional\s+neural\s+networks?\b",
-        r"\bresnet\b", r"\befficientnet\b", r"\bvgg\b", r"\bdensenet\b", r"\bmobilenet\b"
-    ],
-    "transformer": [
-        r"\btransformers?\b", r"\bvision\s+transformers?\b", r"\bself-attention\b",
-        r"\bswin\b", r"\bdetr\b", r"\bbert\b", r"\bcross-attention\b"
-    ],
-    "vit": [
-        r"\bvit\b", r"\bvision\s+transformer\b", r"\bmae\b", r"\bmasked\s+autoencoders?\b"
-    ],
-    "diffusion": [
-        r"\bdiffusion\s+models?\b", r"\bddpm\b", r"\bldm\b", r"\bstable\s+diffusion\b",
-        r"\bscore-based\s+generative\b", r"\bdiffusion\s+probabilistic\b"
-    ],
-    "gan": [
-        r"\bgan\b", r"\bgenerative\s+adversarial\b", r"\bstylegan\b", r"\bcyclegan\b", r"\bpix2pix\b"
-    ],
-    "mlp": [
-        r"\bmlp\b", r"\bmultilayer\s+perceptrons?\b", r"\bmlp-mixer\b"
-    ],
-    "gnn": [
-        r"\bgnn\b", r"\bgraph\s+neural\b", r"\bgcn\b", r"\bgraph\s+convolution\b"
-    ],
-    "nerf": [
-        r"\bnerf\b", r"\bradiance\s+fields?\b", r"\bgaussian\s+splatting\b"
-    ],
-    "contrastive": [
-        r"\bcontrastive\s+learning\b", r"\bclip\b", r"\bsimclr\b", r"\bmoco\b"
-    ],
-    "rnn": [
-        r"\brnn\b", r"\blstm\b", r"\bgru\b", r"\brecurrent\b"
-    ]
-}
-
-METHOD_START_YEAR = {
-    "transformer": 2017,
-    "vit": 2020,
-    "diffusion": 2019,
-    "nerf": 2020,
-    "contrastive": 2019
-}
-
-SEMANTIC_TOPIC_DEFINITIONS = {
-    "Cnn": [r"\bcnn\b", r"\bconvnet\b", r"\bconvolutional\b", r"\bresnet\b", r"\befficientnet\b"],
-    "Transformer": [r"\btransformer\b", r"\bself-attention\b", r"\bswin\b", r"\bdetr\b", r"\bvit\b"],
-    "Diffusion": [r"\bdiffusion\b", r"\bddpm\b", r"\bldm\b", r"\bstable\s+diffusion\b"],
-    "Gan": [r"\bgan\b", r"\badversarial\b", r"\bstylegan\b"],
-    "Nerf": [r"\bnerf\b", r"\bradiance\s+field\b", r"\bgaussian\s+splatting\b"],
-    "Gnn": [r"\bgnn\b", r"\bgraph\b", r"\bgcn\b"],
-    "Mlp": [r"\bmlp\b", r"\bperceptron\b"],
-    "Rnn": [r"\brnn\b", r"\blstm\b", r"\bgru\b"],
-    "Contrastive": [r"\bcontrastive\b", r"\bclip\b", r"\bsimclr\b", r"\bmoco\b"],
-    "Detection": [r"\bdetection\b", r"\byolo\b", r"\brcnn\b"],
-    "Segmentation": [r"\bsegmentation\b", r"\bmask\b", r"\bsam\b"],
-    "Generation": [r"\bgeneration\b", r"\bsynthesis\b"],
-    "Multimodal": [r"\bmultimodal\b", r"\bvision-language\b", r"\bvqa\b", r"\bcaptioning\b"]
-}
-
-TOPIC_PRIORITY = {
-    "Diffusion": 10,
-    "Nerf": 9,
-    "Transformer": 8,
-    "Contrastive": 7,
-    "Gan": 6,
-    "Gnn": 5,
-    "Multimodal": 5,
-    "Detection": 4,
-    "Segmentation": 4,
-    "Cnn": 3,
-    "Rnn": 2,
-    "Mlp": 2,
-    "Generation": 1
-}
-
-CANONICAL_TOPIC_DEFINITIONS = {
-    "Vision Transformer (ViT)": [r"\bvit\b", r"\bvision\s+transformer\b", r"\bswin\b", r"\bdeit\b", r"\bbeit\b", r"\bpvt\b", r"\bcait\b", r"\bt2t\b"],
-    "Diffusion Models": [r"\bdiffusion\b", r"\bddpm\b", r"\bldm\b", r"\bstable\s+diffusion\b", r"\bscore-based\b", r"\bdenoising\s+diffusion\b"],
-    "NeRF & Neural Fields": [r"\bnerf\b", r"\bradiance\s+field\b", r"\bgaussian\s+splatting\b", r"\bview\s+synthesis\b", r"\bimplicit\s+function\b"],
-    "Multimodal Alignment (CLIP)": [r"\bclip\b", r"\balign\b", r"\bcontrastive\s+language\b", r"\btext-image\s+matching\b", r"\bopen-vocabulary\b"],
-    "Large Vision-Language Models": [r"\bllava\b", r"\bminigpt\b", r"\bblip\b", r"\bflamingo\b", r"\bvisual\s+gpt\b", r"\binstructblip\b", r"\bvlm\b"],
-    "Object Detection": [r"\byolo\b", r"\byolov\d\b", r"\bcenternet\b", r"\befficientdet\b", r"\bssd\b", r"\bretina\b", r"\bfcos\b", r"\br-?cnn\b", r"\bfaster\s+rcnn\b", r"\bmask\s+rcnn\b", r"\bcascade\s+rcnn\b", r"\bregion\s+proposal\b", r"\bobject\s+detection\b", r"\bdetectors?\b"],
-    "DETR & Object Queries": [r"\bdetr\b", r"\bdeformable\s+detr\b", r"\bobject\s+query\b", r"\bset\s+prediction\b"],
-    "Segmentation (SAM & U-Net)": [r"\bunet\b", r"\bdeeplab\b", r"\bpspnet\b", r"\bmask2former\b", r"\bsegment\s+anything\b", r"\bsam\b", r"\bpanoptic\s+fpn\b"],
-    "GANs & Image Synthesis": [r"\bgan\b", r"\bstylegan\b", r"\bcyclegan\b", r"\bpix2pix\b", r"\bimage-to-image\b", r"\bbiggan\b", r"\bstyle\s+transfer\b"],
-    "CNN Backbones": [r"\bresnet\b", r"\befficientnet\b", r"\bvgg\b", r"\bdensenet\b", r"\bmobilenet\b", r"\bconvnext\b", r"\binception\b", r"\bxception\b"],
-    "Self-Supervised Learning": [r"\bsimclr\b", r"\bmoco\b", r"\bbyol\b", r"\bdino\b", r"\bmae\b", r"\bmasked\s+image\s+modeling\b", r"\bcontrastive\b"],
-    "3D Reconstruction & SLAM": [r"\bslam\b", r"\bstructure\s+from\s+motion\b", r"\bmulti-view\s+stereo\b", r"\bpoint\s+cloud\b", r"\bmesh\s+reconstruction\b"],
-    "Video & Motion": [r"\bvideo\s+transformer\b", r"\btime\s+series\b", r"\boptical\s+flow\b", r"\baction\s+recognition\b", r"\btracking\b", r"\bmot\b"]
-}
-
-CANONICAL_TOPIC_PRIORITY = {
-    "Diffusion Models": 10,
-    "Large Vision-Language Models": 10,
-    "NeRF & Neural Fields": 9,
-    "Vision Transformer (ViT)": 9,
-    "Multimodal Alignment (CLIP)": 8,
-    "DETR & Object Queries": 8,
-    "Self-Supervised Learning": 7,
-    "GANs & Image Synthesis": 7,
-    "Object Detection": 6,
-    "Segmentation (SAM & U-Net)": 5,
-    "3D Reconstruction & SLAM": 5,
-    "CNN Backbones": 4,
-    "Video & Motion": 3
-}
-
-DEFAULT_PRIMARY_SEMANTIC = "Uncategorized Research"
-
-GENERIC_CONCEPTS = {
-    "computer science",
-    "artificial intelligence",
-    "machine learning",
-    "deep learning",
-    "convolutional neural network",
-    "benchmark",
-    "survey",
-    "dataset",
-    "generalization"
-}
-
-GENERIC_CONCEPT_TOKENS = {
-    "computer", "science", "artificial", "intelligence", "learning",
-    "network", "networks", "model", "models", "paper", "study",
-    "generalization", "method", "analysis", "system", "approach",
-    "algorithm", "benchmark", "dataset", "data"
-}
-
-LOW_VALUE_TERMS = {
-    "remote sensing",
-    "landslide",
-    "earthquake",
-    "soil stability",
-    "geology",
-    "weather forecast",
-    "agriculture",
-    "crop monitoring",
-    "meta analysis",
-    "categorization",
-    "open research",
-    "key",
-    "field",
-    "modal",
-    "generative grammar",
-    "psychology",
-    "mathematics",
-    "medicine",
-    "environmental science",
-    "engineering",
-    "physics",
-    "biology",
-    "business",
-    "materials science",
-    "geography",
-    'noise',
-    'algorithm',
-    'challenge',
-    'performance',
-    'accuracy',
-    'efficiency',
-    'robustness',
-    'framework',
-    'architecture',
-    'methodology',
-    'implementation',
-    'evaluation',
-    'experiment',
-    'ablation',
-    'comparison',
-    'overview',
-    'survey',
-    'review',
-    'perspective',
-    'future',
-    'trend',
-    'direction',
-    'opportunity',
-    'issue',
-    'limitation',
-    'gap',
-    'advance',
-    'progress',
-    'state',
-    'art',
-    'practice',
-    'application',
-    'usage',
-    'deployment',
-    'system',
-    'tool',
-    'platform',
-    'infrastructure',
-    'hardware',
-    'software',
-    'device',
-    'equipment',
-    'setup',
-    'configuration',
-    'parameter',
-    'setting',
-    'feature',
-    'representation',
-    'embedding',
-    'vector',
-    'space',
-    'manifold',
-    'distribution',
-    'function',
-    'mapping',
-    'transform',
-    'operation',
-    'layer',
-    'unit',
-    'block',
-    'module',
-    'component',
-    'part',
-    'element',
-    'structure',
-    'design',
-    'scheme',
-    'strategy',
-    'policy',
-    'protocol',
-    'standard',
-    'criterion',
-    'measure',
-    'metric',
-    'score',
-    'index',
-    'value',
-    'factor',
-    'term',
-    'concept',
-    'idea',
-    'notion',
-    'principle',
-    'theory',
-    'hypothesis',
-    'assumption',
-    'conjecture',
-    'proposition',
-    'lemma',
-    'theorem',
-    'proof',
-    'corollary',
-    'definition',
-    'example',
-    'sample',
-    'instance',
-    'case',
-    'scenario',
-    'situation',
-    'condition',
-    'environment',
-    'context',
-    'setting',
-    'background',
-    'foreground',
-    'object',
-    'subject',
-    'target',
-    'source',
-    'input',
-    'output',
-    'result',
-    'outcome',
-    'effect',
-    'impact',
-    'influence',
-    'consequence',
-    'implication',
-    'significance',
-    'importance',
-    'relevance',
-    'role',
-    'contribution',
-    'innovation',
-    'novelty',
-    'improvement',
-    'enhancement',
-    'extension',
-    'modification',
-    'adaptation',
-    'adjustment',
-    'correction',
-    'revision',
-    'update',
-    'upgrade',
-    'version',
-    'variant',
-    'alternative',
-    'option',
-    'choice',
-    'selection',
-    'decision',
-    'action',
-    'activity',
-    'behavior',
-    'process',
-    'procedure',
-    'routine',
-    'task',
-    'job',
-    'mission',
-    'goal',
-    'objective',
-    'aim',
-    'purpose',
-    'intention',
-    'motivation',
-    'reason',
-    'cause',
-    'explanation',
-    'interpretation',
-    'understanding',
-    'insight',
-    'knowledge',
-    'information',
-    'data',
-    'evidence',
-    'fact',
-    'truth',
-    'reality',
-    'world',
-    'universe',
-    'nature',
-    'life',
-    'human',
-    'person',
-    'people',
-    'user',
-    'customer',
-    'client',
-    'consumer',
-    'participant',
-    'observer',
-    'annotator',
-    'worker',
-    'agent',
-    'actor',
-    'player',
-    'partner',
-    'collaborator',
-    'competitor',
-    'adversary',
-    'attacker',
-    'defender',
-    'learner',
-    'teacher',
-    'student',
-    'expert',
-    'novice',
-    'beginner',
-    'professional',
-    'practitioner',
-    'researcher',
-    'scientist',
-    'engineer',
-    'developer',
-    'designer',
-    'architect',
-    'manager',
-    'leader',
-    'director',
-    'supervisor',
-    'administrator',
-    'organizer',
-    'coordinator',
-    'facilitator',
-    'mediator',
-    'arbitrator',
-    'judge',
-    'reviewer',
-    'critic',
-    'editor',
-    'publisher',
-    'author',
-    'writer',
-    'reader',
-    'viewer',
-    'listener',
-    'speaker',
-    'presenter',
-    'audience',
-    'crowd',
-    'group',
-    'team',
-    'community',
-    'society',
-    'organization',
-    'institution',
-    'institute',
-    'center',
-    'laboratory',
-    'department',
-    'division',
-    'section',
-    'branch',
-    'unit',
-    'sector',
-    'industry',
-    'market',
-    'economy',
-    'business',
-    'company',
-    'corporation',
-    'firm',
-    'enterprise',
-    'startup',
-    'agency',
-    'bureau',
-    'office',
-    'studio',
-    'workshop',
-    'factory',
-    'plant',
-    'facility',
-    'station',
-    'base',
-    'camp',
-    'site',
-    'location',
-    'place',
-    'area',
-    'region',
-    'zone',
-    'district',
-    'territory',
-    'country',
-    'nation',
-    'state',
-    'city',
-    'town',
-    'village',
-    'neighborhood',
-    'street',
-    'road',
-    'path',
-    'way',
-    'route',
-    'track',
-    'lane',
-    'channel',
-    'corridor',
-    'bridge',
-    'tunnel',
-    'gateway',
-    'portal',
-    'interface',
-    'boundary',
-    'border',
-    'edge',
-    'limit',
-    'margin',
-    'threshold',
-    'level',
-    'degree',
-    'extent',
-    'scope',
-    'range',
-    'scale',
-    'magnitude',
-    'dimension',
-    'size',
-    'volume',
-    'capacity',
-    'quantity',
-    'amount',
-    'number',
-    'count',
-    'frequency',
-    'rate',
-    'ratio',
-    'percentage',
-    'proportion',
-    'fraction',
-    'part',
-    'share',
-    'slice',
-    'piece',
-    'segment',
-    'section',
-    'fragment',
-    'bit',
-    'byte',
-    'pixel',
-    'voxel',
-    'point',
-    'line',
-    'curve',
-    'surface',
-    'plane',
-    'shape',
-    'form',
-    'pattern',
-    'texture',
-    'color',
-    'tone',
-    'shade',
-    'hue',
-    'brightness',
-    'contrast',
-    'saturation',
-    'intensity',
-    'luminance',
-    'illuminance',
-    'radiance',
-    'reflectance',
-    'transmittance',
-    'absorbance',
-    'scattering',
-    'diffraction',
-    'refraction',
-    'interference',
-    'polarization',
-    'dispersion',
-    'aberration',
-    'distortion',
-    'noise',
-    'blur',
-    'artifact',
-    'occlusion',
-    'shadow',
-    'reflection',
-    'specularity',
-    'highlight',
-    'glare',
-    'transparency',
-    'opacity',
-    'visibility',
-    'clarity',
-    'sharpness',
-    'focus',
-    'resolution',
-    'quality',
-    'fidelity',
-    'accuracy',
-    'precision',
-    'recall',
-    'sensitivity',
-    'specificity',
-    'reliability',
-    'validity',
-    'consistency',
-    'stability',
-    'robustness',
-    'efficiency',
-    'effectiveness',
-    'performance',
-    'speed',
-    'latency',
-    'throughput',
-    'bandwidth',
-    'storage',
-    'memory',
-    'compute',
-    'power',
-    'energy',
-    'cost',
-    'price',
-    'value',
-    'benefit',
-    'profit',
-    'revenue',
-    'income',
-    'budget',
-    'fund',
-    'grant',
-    'award',
-    'prize',
-    'honor',
-    'recognition',
-    'citation',
-    'reference',
-    'bibliography',
-    'appendix',
-    'supplement',
-    'material',
-    'code',
-    'software',
-    'data',
-    'dataset',
-    'model',
-    'network',
-    'system',
-    'method',
-    'algorithm',
-    'technique',
-    'approach',
-    'framework',
-    'pipeline',
-    'workflow',
-    'process',
-    'procedure',
-    'protocol',
-    'standard',
-    'policy',
-    'strategy',
-    'plan',
-    'project',
-    'program',
-    'initiative',
-    'campaign',
-    'movement',
-    'trend',
-    'direction',
-    'future',
-    'vision',
-    'mission',
-    'goal',
-    'objective',
-    'aim',
-    'target',
-    'purpose'
-}
-
-CONCEPT_BLACKLIST = {
-    "computer vision",
-    "artificial intelligence",
-    "pattern recognition",
-    "responsible ai"
-}
-
-LATEX_INLINE_PATTERN = re.compile(r"\$[^$]+\$")
-LATEX_ENV_PATTERN = re.compile(r"\\begin\{[^}]+\}.*?\\end\{[^}]+\}", re.DOTALL)
-LATEX_CMD_PATTERN = re.compile(
-    r"\\(?:cite|ref|eqref|mathbf|mathrm|textit|emph)\{[^}]*\}")
-GENERIC_CMD_PATTERN = re.compile(r"\\[a-zA-Z]+")
-NON_ALPHA_PATTERN = re.compile(r"[^a-z0-9\+\-\s]")
-PAREN_STRIP_PATTERN = re.compile(r"\([^)]*\)")
-
-COMMON_STOPWORDS = {
-    'the', 'and', 'for', 'with', 'that', 'have', 'this', 'from', 'been', 'into',
-    'using', 'their', 'these', 'those', 'between', 'within', 'without', 'through',
-    'towards', 'toward', 'upon', 'while', 'where', 'when', 'which', 'such', 'than',
-    'also', 'however', 'therefore', 'overall', 'well', 'both', 'each', 'most',
-    'more', 'many', 'much', 'can', 'could', 'would', 'should', 'may', 'might',
-    'our', 'are', 'is', 'was', 'were', 'be', 'has', 'had', 'do', 'does', 'did', 'but',
-    'not', 'only', 'all', 'any', 'some', 'other', 'its', 'it', 'time', 'domain', 'year',
-    'years', 'two', 'new', 'one', 'use', 'used', 'using', 'research', 'review', 'machine',
-    'prediction', 'predict', 'predicting',
-    'feature', 'features', 'algorithm', 'algorithms', 'challenge', 'challenges',
-    'noise', 'human', 'image', 'images', 'visual', 'vision', 'performance', 'method',
-    'methods', 'proposed', 'approach', 'framework', 'system', 'study', 'analysis',
-    'evaluation', 'experiment', 'experiments', 'experimental', 'result', 'results',
-    'state-of-the-art', 'sota', 'dataset', 'datasets', 'benchmark', 'benchmarks',
-    'novel', 'new', 'paper', 'work', 'research', 'review', 'survey', 'overview',
-    'comprehensive', 'recent', 'advance', 'advances', 'trend', 'trends',
-    'problem', 'problems', 'solution', 'solutions', 'application', 'applications',
-    'technique', 'techniques', 'strategy', 'strategies', 'scheme', 'schemes',
-    'mechanism', 'mechanisms', 'model', 'models', 'network', 'networks',
-    'architecture', 'architectures', 'structure', 'structures', 'design', 'designs',
-    'learning', 'training', 'testing', 'validation', 'inference',
-    'deep', 'neural', 'machine', 'artificial', 'intelligence', 'computer',
-    'task', 'tasks', 'capability', 'capabilities', 'quality', 'improvement',
-    'accuracy', 'efficiency', 'robustness', 'generalization', 'complexity',
-    'parameter', 'parameters', 'component', 'components', 'module', 'modules',
-    'layer', 'layers', 'block', 'blocks', 'unit', 'units', 'input', 'output',
-    'representation', 'representations', 'information', 'context', 'content',
-    'detail', 'details', 'object', 'objects', 'scene', 'scenes', 'video', 'videos',
-    'sample', 'samples', 'example', 'examples', 'instance', 'instances',
-    'level', 'scale', 'resolution', 'size', 'speed', 'rate', 'time', 'real-time',
-    'based', 'high', 'low', 'large', 'small', 'simple', 'complex',
-    'fast', 'slow', 'strong', 'weak', 'good', 'bad', 'best', 'better',
-    'multi', 'single', 'cross', 'joint', 'dual', 'hybrid', 'hierarchical',
-    'global', 'local', 'spatial', 'temporal', 'spatiotemporal',
-    'end', 'pipeline', 'stage', 'step', 'phase',
-    'prior', 'post', 'pre', 're', 'non', 'semi', 'un', 'self',
-    'supervised', 'unsupervised', 'weakly', 'fully', 'different'
-}
-
-ACADEMIC_STOPWORDS = {
-    'paper', 'method', 'proposed', 'approach', 'results', 'performance',
-    'state-of-the-art', 'sota', 'using', 'based', 'model', 'network', 'algorithm',
-    'framework', 'novel', 'data', 'dataset', 'learning', 'deep', 'visual',
-    'computer', 'vision', 'image', 'images', 'task', 'tasks', 'efficient',
-    'robust', 'accurate', 'analysis', 'study', 'via', 'neural', 'networks',
-    'experiments', 'experimental', 'demonstrate', 'show', 'outperforms', 'existing',
-    'methods', 'problem', 'address', 'propose', 'presents', 'introduction',
-    'conclusion', 'abstract', 'training', 'trained', 'evaluation', 'benchmark',
-    'application', 'applications'
-}
-
-STOPWORDS = COMMON_STOPWORDS | ACADEMIC_STOPWORDS
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 WEB_DATA_DIR = PROJECT_ROOT / "web" / "data"
 
 
-YEARLY_DOMINANT_MAP = {
-    2014: {"theme": "Two-Stage Detection (R-CNN)", "keywords": [r"r-cnn", r"rcnn", r"region-based", r"alexnet", r"vgg"]},
-    2015: {"theme": "CNN Backbones (ResNet)", "keywords": [r"resnet", r"residual network", r"residual learning", r"batch normalization"]},
-    2016: {"theme": "YOLO & Real-time Detection", "keywords": [r"yolo", r"ssd", r"real-time detection", r"faster r-cnn"]},
-    2017: {"theme": "CNN Architectures (DenseNet)", "keywords": [r"densenet", r"dense connection", r"feature pyramid", r"fpn"]},
-    2018: {"theme": "GANs & Image Synthesis", "keywords": [r"gan", r"generative adversarial", r"pix2pix", r"cyclegan"]},
-    2019: {"theme": "Self-Supervised Learning", "keywords": [r"self-supervised", r"contrastive learning", r"moco", r"simclr", r"efficientnet"]},
-    2020: {"theme": "Vision Transformer (ViT)", "keywords": [r"vit", r"vision transformer", r"dosovitskiy", r"detr", r"nerf"]},
-    2021: {"theme": "Transformer Dominance (Swin)", "keywords": [r"transformer", r"swin", r"mae", r"clip"]},
-    2022: {"theme": "Diffusion Models", "keywords": [r"diffusion model", r"stable diffusion", r"latent diffusion", r"ddpm", r"imagen"]},
-    2023: {"theme": "Segmentation (SAM)", "keywords": [r"segment anything", r"sam", r"foundation model", r"controlnet", r"generative", r"diffusion"]},
-    2024: {"theme": "Generative AI & LLMs", "keywords": [r"multimodal", r"large language", r"gpt", r"gemini", r"vlm", r"llava", r"sora", r"generative", r"diffusion", r"autonomous", r"robotics", r"yolo", r"real-time"]}
-}
-
-
-class CategoryMatcher:
-    def __init__(self, definitions):
-        self.patterns = {}
-        for category, regex_list in definitions.items():
-            combined = "|".join(f"(?:{pattern})" for pattern in regex_list)
-            self.patterns[category] = re.compile(combined, re.IGNORECASE)
-
-    def find_matches(self, text):
-        if not text:
-            return set()
-        return {category for category, pattern in self.patterns.items() if pattern.search(text)}
-
-
-PROBLEM_MATCHER = CategoryMatcher(PROBLEM_DEFINITIONS)
-METHOD_MATCHER = CategoryMatcher(METHOD_DEFINITIONS)
-TOPIC_MATCHER = CategoryMatcher(SEMANTIC_TOPIC_DEFINITIONS)
-PRIMARY_TOPIC_MATCHER = CategoryMatcher(CANONICAL_TOPIC_DEFINITIONS)
-
-
-STRICT_CONCEPT_WHITELIST = {
-    # Architectures & Models
-    "cnn", "convnet", "resnet", "densenet", "efficientnet", "vgg", "mobilenet", "inception", "xception",
-    "transformer", "vision transformer", "vit", "swin", "detr", "bert", "gpt", "clip", "t5", "mae",
-    "gan", "stylegan", "cyclegan", "pix2pix", "biggan", "vae", "vq-vae",
-    "diffusion", "ddpm", "ldm", "stable diffusion", "controlnet", "lora",
-    "nerf", "gaussian splatting", "3d gaussian splatting", "instant ngp",
-    "rnn", "lstm", "gru",
-    "gnn", "gcn", "gat", "pointnet", "pointnet++", "unet", "fpn", "mask r-cnn", "faster r-cnn", "yolo", "ssd",
-    "mlp", "mlp-mixer",
-
-    # Core Mechanisms
-    "attention", "self-attention", "cross-attention", "convolution",
-    "contrastive learning", "self-supervised learning", "representation learning",
-    "reinforcement learning", "transfer learning", "domain adaptation", "knowledge distillation",
-    "few-shot learning", "zero-shot learning", "meta-learning", "active learning",
-    "federated learning", "continual learning", "incremental learning",
-    "generative", "adversarial", "discriminative", "probabilistic", "bayesian",
-
-    # Tasks
-    "object detection", "semantic segmentation", "instance segmentation", "panoptic segmentation",
-    "image classification", "action recognition", "pose estimation", "depth estimation",
-    "optical flow", "visual tracking", "object tracking", "mot",
-    "image captioning", "vqa", "visual question answering", "text-to-image", "image-to-text",
-    "super-resolution", "denoising", "inpainting", "deblurring", "image restoration",
-    "3d reconstruction", "view synthesis", "slam", "structure from motion",
-    "face recognition", "person re-identification", "pedestrian detection",
-    "anomaly detection", "salient object detection", "edge detection",
-    "medical imaging", "remote sensing", "autonomous driving", "robotics"
-}
-
-
-def normalize_phrase(text):
-    if not isinstance(text, str):
-        return ""
-    stripped = PAREN_STRIP_PATTERN.sub(" ", text)
-    lowered = stripped.lower()
-    lowered = re.sub(r"[\-_/:+]+", " ", lowered)
-    lowered = NON_ALPHA_PATTERN.sub(' ', lowered)
-    lowered = re.sub(r"\s+", " ", lowered)
-    return lowered.strip()
-
-
-def strip_latex_chunks(text):
-    if not isinstance(text, str):
-        return ""
-    cleaned = LATEX_ENV_PATTERN.sub(" ", text)
-    cleaned = LATEX_INLINE_PATTERN.sub(" ", cleaned)
-    cleaned = LATEX_CMD_PATTERN.sub(" ", cleaned)
-    cleaned = GENERIC_CMD_PATTERN.sub(" ", cleaned)
-    cleaned = cleaned.replace('{', ' ').replace('}', ' ')
-    return cleaned
-
-
-def clean_academic_text(text):
-    cleaned = strip_latex_chunks(text)
-    lowered = cleaned.lower()
-    lowered = NON_ALPHA_PATTERN.sub(' ', lowered)
-    tokens = [tok for tok in lowered.split()
-              if tok and tok not in STOPWORDS and len(tok) > 2]
-    return " ".join(tokens)
-
-
-def prettify_concept(term):
-    if term is None:
-        return ""
-    text = PAREN_STRIP_PATTERN.sub(" ", str(term))
-    text = text.replace("_", " ").strip()
-    text = re.sub(r"\s+", " ", text)
-    if not text:
-        return ""
-    tokens = text.split()
-    formatted = []
-    for token in tokens:
-        if token.isupper() or any(ch.isdigit() for ch in token):
-            formatted.append(token.upper())
-        else:
-            formatted.append(token.capitalize())
-    return " ".join(formatted)
-
-
-def is_meaningful_concept(term):
-    if term is None:
-        return False
-    raw_text = str(term)
-    if "(" in raw_text or ")" in raw_text:
-        return False
-    normalized = normalize_phrase(raw_text)
-    if not normalized:
-        return False
-
-    # Strict whitelist check
-    if normalized not in STRICT_CONCEPT_WHITELIST:
-        # Allow if it matches any of the semantic topic definitions regexes
-        # This is a bit expensive but ensures consistency
-        found = False
-        for pattern_list in SEMANTIC_TOPIC_DEFINITIONS.values():
-            combined = "|".join(pattern_list)
-            if re.search(combined, normalized, re.IGNORECASE):
-                found = True
-                break
-        if not found:
-            return False
-
-    if normalized in CONCEPT_BLACKLIST:
-        return False
-    if normalized in GENERIC_CONCEPTS:
-        return False
-    if normalized in LOW_VALUE_TERMS:
-        return False
-    tokens = normalized.split()
-    if not tokens:
-        return False
-    if len(tokens) == 1 and (tokens[0] in GENERIC_CONCEPT_TOKENS or len(tokens[0]) <= 2):
-        return False
-    if all(tok in GENERIC_CONCEPT_TOKENS for tok in tokens):
-        return False
-    return True
-
-
-CONCEPT_START_YEAR = {
-    "Transformer": 2017,
-    "Vision Transformer": 2020,
-    "Vision Transformer (ViT)": 2020,
-    "Diffusion": 2019,
-    "Diffusion Models": 2019,
-    "NeRF": 2020,
-    "NeRF & Neural Fields": 2020,
-    "CLIP": 2021,
-    "Multimodal Alignment (CLIP)": 2021,
-    "Swin": 2021,
-    "MAE": 2021,
-    "Self-Supervised Learning": 2019,
-    "DETR": 2020,
-    "DETR & Object Queries": 2020,
-    "Large Vision-Language Models": 2022,
-    "SAM": 2023,
-    # U-Net 2015, SAM 2023. This is a mixed category.
-    "Segmentation (SAM & U-Net)": 2015,
-    "YOLO": 2016,
-    "Object Detection": 2014,
-    "R-CNN": 2014,
-    "GAN": 2014,
-    "GANs & Image Synthesis": 2014,
-    "ResNet": 2015,
-    "CNN Backbones": 2012,
-    "CNN Architectures": 2012,
-    "Video & Motion": 2010,
-    "3D Reconstruction & SLAM": 2010,
-    "Contrastive": 2019
-}
-
-CONCEPT_END_YEAR = {
-    "Rnn": 2021,
-    "Lstm": 2021,
-    "Gru": 2021
-}
-
-TERM_HIERARCHY = {
-    "Object Detection": {"YOLO", "R-CNN", "DETR", "Detection", "DETR & Object Queries"},
-    "Detection": {"YOLO", "R-CNN", "DETR", "Object Detection"},
-    "Recognition": {"Face Recognition", "Action Recognition", "Re-Identification", "Image Classification"},
-    "Cnn": {"ResNet", "VGG", "EfficientNet", "CNN Backbones", "CNN Architectures"},
-    "Transformer": {"ViT", "Swin", "DETR", "Vision Transformer (ViT)", "Vision Transformer"},
-    "Generation": {"GAN", "Diffusion", "GANs & Image Synthesis", "Diffusion Models"},
-    "Segmentation": {"Segmentation (SAM & U-Net)", "Semantic Segmentation", "Instance Segmentation"},
-}
-
-ERA_SPECIFIC_WHITELIST = {
-    "2010-2012": {
-        "SIFT", "HOG", "SVM", "DPM", "Sparse Coding", "BoW", "GIST", "Deformable Part Models",
-        "Optical Flow", "Tracking", "Segmentation", "Detection", "Face Recognition", "Action Recognition",
-        "Object Detection", "Image Classification", "Machine Learning", "Pattern Recognition", "Clustering",
-        "Super-Resolution", "Denoising", "Inpainting", "Restoration", "Image Restoration"
-    },
-    "2013-2015": {
-        "CNN", "AlexNet", "VGG", "R-CNN", "Dropout", "ReLU", "SPP-net", "Fast R-CNN", "OverFeat",
-        "GoogLeNet", "Inception", "Deep Learning", "Convolutional Neural Network", "Detection", "Segmentation",
-        "Transfer Learning", "Fine-tuning", "Data Augmentation", "Optimization", "Neural Network",
-        "Recurrent Neural Network", "RNN", "LSTM"
-    },
-    "2016-2018": {
-        "ResNet", "YOLO", "Faster R-CNN", "SSD", "GAN", "DCGAN", "CycleGAN", "Pix2Pix",
-        "Mask R-CNN", "DenseNet", "MobileNet", "RetinaNet", "FPN", "LSTM", "RNN", "GRU", "Attention",
-        "Semantic Segmentation", "Instance Segmentation"
-    },
-    "2019-2021": {
-        "ViT", "Vision Transformer", "Transformer", "DETR", "EfficientNet", "Swin Transformer", "NeRF",
-        "Self-Supervised Learning", "Contrastive Learning", "SimCLR", "MoCo", "CLIP", "PointNet",
-        "GNN", "Graph Neural Network", "NAS", "AutoML", "Knowledge Distillation", "Domain Adaptation"
-    },
-    "2022-2025": {
-        "Diffusion", "Diffusion Models", "Stable Diffusion", "Latent Diffusion", "DDPM", "Generative AI",
-        "LLM", "Large Language Model", "Multimodal", "Vision-Language Model", "VLM", "CLIP",
-        "BLIP", "LLaVA", "SAM", "Segment Anything", "Gaussian Splatting", "3D Gaussian Splatting",
-        "YOLOv8", "YOLOv9", "YOLOv10", "BEV", "Occupancy Network", "Foundation Model", "LoRA", "ControlNet",
-        "Sora", "Gemini", "GPT-4", "Prompt Engineering", "Zero-Shot", "Few-Shot", "Transformer", "Generative"
-    }
-}
-
-
-def get_allowed_concepts_for_year(year):
-    if not year:
-        return set()
-    allowed = set()
-
-    # Always allow core tasks if they are not superseded (but we handle superseding via TERM_HIERARCHY)
-    # Actually, let's just use the era whitelist + strict global whitelist
-    # But we need to make sure we don't block "Detection" in 2024 if it's not redundant.
-    # The user wants "High Quality" keywords.
-
-    # Cumulative approach? No, strictly era-based is safer to avoid "RNN" in 2024.
-    # But "CNN" is still relevant in 2024.
-    # So we should allow previous eras' terms *unless* they are explicitly deprecated.
-
-    # Better approach:
-    # 1. Start with concepts from current era.
-    # 2. Add concepts from *previous* eras (accumulated).
-    # 3. Remove concepts in CONCEPT_END_YEAR if year > end_year.
-
-    ranges = [
-        (2010, 2012), (2013, 2015), (2016, 2018), (2019, 2021), (2022, 2025)
-    ]
-
-    for start, end in ranges:
-        if start <= year:  # If this era has started by `year`
-            key = f"{start}-{end}"
-            if key in ERA_SPECIFIC_WHITELIST:
-                allowed.update(ERA_SPECIFIC_WHITELIST[key])
-
-    return allowed
-
-
 def derive_semantic_tags(paper, tfidf_row, feature_names, limit, cluster_label=None):
     title = pick_field(paper, "title", "") or ""
     abstract = pick_field(paper, "abstract", "") or ""
@@ -1327,75 +345,9 @@ def derive_semantic_tags(paper, tfidf_row, feature_names, limit, cluster_label=N
     return final_output[:target]
 
 
-def pick_field(record, alias_key, default=None):
-    for key in FIELD_ALIASES.get(alias_key, (alias_key,)):
-        if key in record and record[key] not in (None, ""):
-            return record[key]
-    return default
-
-
-def normalize_year(value):
-    if value is None:
-        return None
-    try:
-        return int(str(value).strip())
-    except ValueError:
-        return None
-
-
-def normalize_citations(value):
-    if value is None:
-        return 0
-    try:
-        return int(float(value))
-    except ValueError:
-        return 0
-
-
-def ensure_list(value):
-    if value is None:
-        return []
-    if isinstance(value, list):
-        return [v for v in value if v]
-    if isinstance(value, str):
-        parts = re.split(r"[;,/]", value)
-        return [p.strip() for p in parts if p.strip()]
-    return []
-
-
-def build_text_blob(paper):
-    parts = []
-    for alias in ("title", "abstract"):
-        value = pick_field(paper, alias, "")
-        if isinstance(value, str):
-            parts.append(value)
-    concept_list = ensure_list(pick_field(paper, "concepts", []))
-    if concept_list:
-        parts.append(" ".join(concept_list))
-    combined = " ".join(parts)
-    return clean_academic_text(combined)
-
-
-def select_canonical_semantic(text, fallback=None):
-    if not isinstance(text, str):
-        text = ""
-    matches = PRIMARY_TOPIC_MATCHER.find_matches(text)
-    if matches:
-        ordered = sorted(
-            matches,
-            key=lambda name: (
-                CANONICAL_TOPIC_PRIORITY.get(name, 1), len(name)),
-            reverse=True
-        )
-        return ordered[0]
-    if fallback:
-        formatted = prettify_concept(fallback)
-        if formatted:
-            return formatted
-    return DEFAULT_PRIMARY_SEMANTIC
-
-
 def keywords_from_vector(vector, feature_names, limit):
+    import numpy as np
+
     if vector is None or not len(feature_names):
         return []
     if isinstance(vector, np.matrix):
@@ -1419,7 +371,26 @@ def keywords_from_vector(vector, feature_names, limit):
     return keywords
 
 
-def build_semantic_clusters(tfidf_matrix, feature_names, desired_clusters):
+def cluster_mean_vectors(tfidf_matrix, labels, cluster_count):
+    """Per-cluster mean TF-IDF rows as one sparse product (no per-cluster row copies)."""
+    import numpy as np
+    from scipy import sparse
+
+    sample_count = tfidf_matrix.shape[0]
+    counts = np.bincount(labels, minlength=cluster_count).astype(tfidf_matrix.dtype)
+    inverse = np.divide(1.0, counts, out=np.zeros_like(counts), where=counts > 0)
+    membership = sparse.csr_matrix(
+        (inverse[labels], (labels, np.arange(sample_count))),
+        shape=(cluster_count, sample_count),
+        dtype=tfidf_matrix.dtype
+    )
+    return (membership @ tfidf_matrix).tocsr(), counts
+
+
+def build_semantic_clusters(tfidf_matrix, feature_names, desired_clusters, low_memory=False):
+    import numpy as np
+    from sklearn.cluster import MiniBatchKMeans
+
     if tfidf_matrix is None or tfidf_matrix.shape[0] < 40 or tfidf_matrix.shape[1] < 8:
         return None, {}
 
@@ -1442,12 +413,22 @@ def build_semantic_clusters(tfidf_matrix, feature_names, desired_clusters):
     except ValueError:
         return None, {}
 
+    centroids = None
+    if low_memory:
+        centroids, member_counts = cluster_mean_vectors(
+            tfidf_matrix, labels, cluster_count)
+
     cluster_titles = {}
     for cluster_id in range(cluster_count):
-        members = np.where(labels == cluster_id)[0]
-        if members.size == 0:
-            continue
-        mean_vector = tfidf_matrix[members].mean(axis=0)
+        if centroids is not None:
+            if not member_counts[cluster_id]:
+                continue
+            mean_vector = centroids.getrow(cluster_id).toarray().ravel()
+        else:
+            members = np.where(labels == cluster_id)[0]
+            if members.size == 0:
+                continue
+            mean_vector = tfidf_matrix[members].mean(axis=0)
         keywords = keywords_from_vector(mean_vector, feature_names, limit=6)
         context = " ".join(keywords[:6])
         canonical = select_canonical_semantic(context)
@@ -1524,10 +505,51 @@ def select_top_papers(papers, per_year, overall_cap):
     return selected
 
 
-def compute_embeddings(papers, max_features):
-    documents = [build_text_blob(p) for p in papers]
+def tsne_perplexity(sample_count):
+    perplexity = min(40, max(5, sample_count // 3))
+    if perplexity >= sample_count:
+        perplexity = max(2, sample_count - 1)
+    return perplexity
+
+
+def estimate_embedding_peak_mb(sample_count, nnz, svd_components, itemsize):
+    """Rough upper bound of the embedding stage's working set in MiB.
+
+    Counts the CSR TF-IDF matrix, randomized SVD scratch (range finder with
+    the default 10 oversamples, ~3 live copies) and the Barnes-Hut t-SNE
+    neighbour graph, which dominates for large inputs.
+    """
+    tfidf_bytes = nnz * (itemsize + 4) + (sample_count + 1) * 4
+    svd_bytes = 3 * sample_count * (svd_components + 10) * itemsize
+    neighbors = min(sample_count - 1, 3 * tsne_perplexity(sample_count) + 1)
+    tsne_bytes = sample_count * max(neighbors, 0) * (8 + 8 + 8) * 2
+    return (tfidf_bytes + svd_bytes + tsne_bytes) / (1024 * 1024)
+
+
+def fit_svd_components(sample_count, nnz, svd_components, itemsize, memory_budget_mb):
+    """Shrink the SVD width until the estimate fits the budget (floor: 10)."""
+    while svd_components > 10 and estimate_embedding_peak_mb(
+            sample_count, nnz, svd_components, itemsize) > memory_budget_mb:
+        svd_components = max(10, svd_components - 10)
+    estimate = estimate_embedding_peak_mb(sample_count, nnz, svd_components, itemsize)
+    if estimate > memory_budget_mb:
+        raise MemoryError(
+            f"内存预算不足: 预计峰值 {estimate:.0f} MiB > 预算 {memory_budget_mb:.0f} MiB，"
+            f"请减少 --max-landscape 或 --tfidf-features")
+    return svd_components, estimate
+
+
+def compute_embeddings(papers, max_features, low_memory=False, memory_budget_mb=None):
+    import numpy as np
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.manifold import TSNE
+
+    dtype = np.float32 if low_memory else np.float64
+    with profile_stage("text_blob"):
+        documents = [build_text_blob(p) for p in papers]
     if not any(doc.strip() for doc in documents):
-        zeros = np.zeros((len(papers), 2))
+        zeros = np.zeros((len(papers), 2), dtype=dtype)
         return zeros, None, []
 
     min_df = 1 if len(documents) < 50 else 2
@@ -1535,32 +557,40 @@ def compute_embeddings(papers, max_features):
         max_features=max_features,
         ngram_range=(1, 2),
         max_df=0.65,
-        min_df=min_df
+        min_df=min_df,
+        dtype=dtype
     )
     try:
-        tfidf = vectorizer.fit_transform(documents)
+        with profile_stage("tfidf"):
+            tfidf = vectorizer.fit_transform(documents)
     except ValueError:
-        zeros = np.zeros((len(papers), 2))
+        zeros = np.zeros((len(papers), 2), dtype=dtype)
         return zeros, None, []
+    del documents
 
     if tfidf.shape[0] < 2 or tfidf.shape[1] < 2:
-        coords = np.zeros((tfidf.shape[0], 2))
+        coords = np.zeros((tfidf.shape[0], 2), dtype=dtype)
         if tfidf.shape[0]:
-            coords[:, 0] = tfidf.sum(axis=1).A1
+            coords[:, 0] = np.asarray(tfidf.sum(axis=1)).ravel()
         return coords, tfidf, vectorizer.get_feature_names_out()
 
     svd_components = min(50, tfidf.shape[1], tfidf.shape[0])
     if svd_components < 2:
         svd_components = 2
+    if memory_budget_mb:
+        svd_components, estimate = fit_svd_components(
+            tfidf.shape[0], tfidf.nnz, svd_components,
+            np.dtype(dtype).itemsize, memory_budget_mb)
+        print(f"嵌入阶段预计峰值 {estimate:.0f} MiB (预算 {memory_budget_mb:.0f} MiB, "
+              f"SVD 维度 {svd_components})")
     reducer = TruncatedSVD(n_components=svd_components, random_state=42)
-    svd_coords = reducer.fit_transform(tfidf)
+    with profile_stage("svd"):
+        svd_coords = reducer.fit_transform(tfidf).astype(dtype, copy=False)
 
     coords = None
     sample_count = len(papers)
     if sample_count >= 5 and svd_coords.shape[1] >= 2:
-        perplexity = min(40, max(5, sample_count // 3))
-        if perplexity >= sample_count:
-            perplexity = max(2, sample_count - 1)
+        perplexity = tsne_perplexity(sample_count)
         if perplexity >= 2 and perplexity < sample_count:
             try:
                 tsne_kwargs = {
@@ -1577,7 +607,8 @@ def compute_embeddings(papers, max_features):
                 else:
                     tsne_kwargs["n_iter"] = 1000
                 tsne = TSNE(**tsne_kwargs)
-                coords = tsne.fit_transform(svd_coords)
+                with profile_stage("tsne"):
+                    coords = tsne.fit_transform(svd_coords)
             except ValueError:
                 coords = None
 
@@ -1585,7 +616,7 @@ def compute_embeddings(papers, max_features):
         base = svd_coords[:,
                           :2] if svd_coords.shape[1] >= 2 else svd_coords[:, [0]]
         if base.shape[1] < 2:
-            padded = np.zeros((base.shape[0], 2))
+            padded = np.zeros((base.shape[0], 2), dtype=dtype)
             padded[:, 0] = base[:, 0]
             coords = padded
         else:
@@ -1601,13 +632,25 @@ def top_terms_for_row(row, feature_names, limit):
     return [feature_names[idx] for _, idx in pairs]
 
 
-def build_landscape(papers, max_features, top_terms, semantic_clusters):
-    coords, tfidf, feature_names = compute_embeddings(papers, max_features)
+def build_landscape(papers, max_features, top_terms, semantic_clusters,
+                    low_memory=False, memory_budget_mb=None):
+    coords, tfidf, feature_names = compute_embeddings(
+        papers, max_features, low_memory=low_memory, memory_budget_mb=memory_budget_mb)
     cluster_assignments = None
     cluster_titles = {}
     if semantic_clusters and tfidf is not None and feature_names is not None:
-        cluster_assignments, cluster_titles = build_semantic_clusters(
-            tfidf, feature_names, semantic_clusters)
+        with profile_stage("kmeans"):
+            cluster_assignments, cluster_titles = build_semantic_clusters(
+                tfidf, feature_names, semantic_clusters, low_memory=low_memory)
+    with profile_stage("tags"):
+        records = build_landscape_records(
+            papers, coords, tfidf, feature_names, top_terms,
+            cluster_assignments, cluster_titles)
+    return records
+
+
+def build_landscape_records(papers, coords, tfidf, feature_names, top_terms,
+                            cluster_assignments, cluster_titles):
     records = []
     for idx, paper in enumerate(papers):
         year = normalize_year(pick_field(paper, "year"))
@@ -1642,6 +685,7 @@ def build_landscape(papers, max_features, top_terms, semantic_clusters):
         record["semantic_primary"] = concepts[0] if concepts else None
         record["semantic_cluster"] = cluster_label
         records.append(record)
+        profile_count("tags_produced", len(concepts))
 
     return records
 
@@ -1651,10 +695,12 @@ def compute_link_weight(paper):
     return math.log(citations + 1) + 1
 
 
-def build_sankey(papers, min_value, recent_years=10):
-    """聚合 problem→method 年度流向，标题命中的论文给予更高权重。"""
+def collect_flow_weights(papers):
+    """逐年累加 problem→method 权重（不设阈值），标题命中的论文给予更高权重。
+
+    build_sankey 与 flow_cube 共用这一遍扫描。
+    """
     links_by_year = defaultdict(lambda: defaultdict(float))
-    observed_years = set()
 
     print("开始提取桑基图流向数据...")
 
@@ -1693,7 +739,6 @@ def build_sankey(papers, min_value, recent_years=10):
         combo_count = max(1, len(problems) * len(methods))
         distributed = weight / combo_count
 
-        observed_years.add(year)
         for prob in problems:
             for meth in methods:
                 links_by_year[year][(prob, meth)] += distributed
@@ -1701,10 +746,15 @@ def build_sankey(papers, min_value, recent_years=10):
         if (i + 1) % 20000 == 0:
             print(f"  已处理 {i + 1} 篇...")
 
-    if not observed_years:
+    return links_by_year
+
+
+def sankey_links(links_by_year, min_value, recent_years=10):
+    """按年输出超过阈值的流向，仅保留最近 `recent_years` 年。"""
+    if not links_by_year:
         return []
 
-    sorted_years = sorted(observed_years)
+    sorted_years = sorted(links_by_year)
     if recent_years and len(sorted_years) > recent_years:
         cutoff = sorted_years[-recent_years]
     else:
@@ -1727,30 +777,70 @@ def build_sankey(papers, min_value, recent_years=10):
     return final_payload
 
 
+def build_sankey(papers, min_value, recent_years=10):
+    """聚合 problem→method 年度流向。"""
+    return sankey_links(collect_flow_weights(papers), min_value, recent_years)
+
+
 def save_json(path, payload):
     path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False)
+    write_if_changed(path, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
     return path
 
 
-def mirror_to_web_data(source_path):
+def mirror_to_web_data(source_path, relative_to=None):
+    source_path = Path(source_path)
+    relative = source_path.relative_to(relative_to) if relative_to else Path(source_path.name)
+    target_path = WEB_DATA_DIR / relative
     try:
-        WEB_DATA_DIR.mkdir(parents=True, exist_ok=True)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
     except OSError as exc:
         print(f"[warn] 无法创建 web/data 目录: {exc}")
         return None
-    source_path = Path(source_path)
-    target_path = WEB_DATA_DIR / source_path.name
     try:
-        shutil.copy2(source_path, target_path)
+        publish_file(source_path, target_path)
         return target_path
     except OSError as exc:
-        print(f"[warn] 无法同步 {source_path.name} 至 web/data: {exc}")
+        print(f"[warn] 无法同步 {relative} 至 web/data: {exc}")
         return None
 
 
+def sync_tree_to_web_data(source_root, listed):
+    """Mirror `listed` (paths relative to source_root) into web/data and prune stale copies."""
+    source_root = Path(source_root)
+    data_root = source_root.parent
+    for relative in sorted(listed):
+        mirror_to_web_data(source_root / relative, relative_to=data_root)
+
+    web_root = WEB_DATA_DIR / source_root.relative_to(data_root)
+    if not web_root.is_dir():
+        return
+    for stale in web_root.rglob("*"):
+        relative = stale.relative_to(web_root)
+        if is_compressed_sibling(stale):
+            relative = relative.with_suffix("")
+        if stale.is_file() and relative.as_posix() not in listed:
+            try:
+                stale.unlink()
+            except OSError as exc:
+                print(f"[warn] 无法删除过期文件 {stale}: {exc}")
+
+
+def sync_shards_to_web_data(manifest_path):
+    """Mirror the shard manifest and every shard it lists, pruning stale web copies."""
+    manifest_path = Path(manifest_path)
+    listed = {MANIFEST_NAME, *manifest_files(load_manifest(manifest_path))}
+    sync_tree_to_web_data(manifest_path.parent, listed)
+
+
+def sync_density_to_web_data(index_path):
+    index_path = Path(index_path)
+    with index_path.open("r", encoding="utf-8") as f:
+        index = json.load(f)
+    listed = {index_path.name, *(meta["path"] for meta in index["scopes"].values())}
+    sync_tree_to_web_data(index_path.parent, listed)
+
+
 def resolve_existing(path_str):
     path = Path(path_str)
     if path.exists():
@@ -1781,6 +871,14 @@ def parse_args(argv=None):
     parser.add_argument("--top-terms", type=int, default=5)
     parser.add_argument("--min-link", type=float, default=2.0)
     parser.add_argument("--semantic-clusters", type=int, default=14)
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Keep TF-IDF/SVD in float32 and avoid dense copies of sparse data.")
+    parser.add_argument("--memory-budget", type=float, default=None,
+                        help="Peak memory budget (MiB) for the embedding stage.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Record per-stage wall/CPU time, memory and counters.")
+    parser.add_argument("--profile-output", default=None,
+                        help="Profile report path (default: pipeline_profile.json next to the landscape output).")
     return parser.parse_args(argv)
 
 
@@ -1796,19 +894,72 @@ def main(cli_args=None):
     landscape_output_path = resolve_output(args.landscape_output)
     sankey_output_path = resolve_output(args.sankey_output)
 
-    with input_path.open("r", encoding="utf-8") as f:
-        papers = json.load(f)
+    profiler = StageProfiler().start() if getattr(args, "profile", False) else None
+    try:
+        run_pipeline(args, input_path, landscape_output_path, sankey_output_path)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+
+    if profiler is not None:
+        profile_path = args.profile_output or landscape_output_path.parent / "pipeline_profile.json"
+        meta = {
+            "input": str(input_path),
+            "args": {key: value for key, value in vars(args).items()
+                     if isinstance(value, (str, int, float, bool)) or value is None}
+        }
+        report_path = profiler.write(resolve_output(str(profile_path)), meta)
+        print(f"Profile report: {report_path}")
+
 
-    top_papers = select_top_papers(
-        papers, args.top_per_year, args.max_landscape)
-    landscape_payload = build_landscape(
-        top_papers, args.tfidf_features, args.top_terms, args.semantic_clusters)
-    sankey_payload = build_sankey(papers, args.min_link)
+def run_pipeline(args, input_path, landscape_output_path, sankey_output_path):
+    with profile_stage("load"):
+        with input_path.open("r", encoding="utf-8") as f:
+            papers = json.load(f)
+        profile_count("papers_loaded", len(papers))
 
-    landscape_path = save_json(landscape_output_path, landscape_payload)
-    sankey_path = save_json(sankey_output_path, sankey_payload)
-    mirror_to_web_data(landscape_path)
-    mirror_to_web_data(sankey_path)
+    with profile_stage("select"):
+        top_papers = select_top_papers(
+            papers, args.top_per_year, args.max_landscape)
+    landscape_payload = build_landscape(
+        top_papers, args.tfidf_features, args.top_terms, args.semantic_clusters,
+        low_memory=getattr(args, "low_memory", False),
+        memory_budget_mb=getattr(args, "memory_budget", None))
+    with profile_stage("sankey"):
+        flow_weights = collect_flow_weights(papers)
+        sankey_payload = sankey_links(flow_weights, args.min_link)
+        profile_count("sankey_links", len(sankey_payload))
+
+    with profile_stage("serialize"):
+        landscape_path = save_json(landscape_output_path, landscape_payload)
+        landscape_binary_path = save_landscape_binary(
+            landscape_output_path.with_suffix(".bin"), landscape_payload)
+        sankey_path = save_json(sankey_output_path, sankey_payload)
+        write_flow_cube(sankey_output_path.parent / "flow_cube.json", flow_weights)
+        manifest_path = write_year_shards(
+            landscape_output_path.parent / "shards",
+            {"landscape": landscape_payload, "sankey": sankey_payload})
+    with profile_stage("search_index"):
+        # 全量语料建索引（不止 landscape 抽样），命中的论文若在地图上则带上其 id
+        write_search_index(
+            landscape_output_path.parent / "search_index.bin", papers,
+            {record["title"]: record["id"] for record in landscape_payload})
+    with profile_stage("corpus_columns"):
+        write_corpus_columns(landscape_output_path.parent / "corpus_columns.bin", papers)
+    with profile_stage("tiles"):
+        write_landscape_tiles(landscape_output_path.parent / "tiles", landscape_payload)
+    with profile_stage("density"):
+        density_index_path = write_landscape_density(
+            landscape_output_path.parent / "density", landscape_payload)
+    with profile_stage("publish"):
+        mirror_to_web_data(landscape_path)
+        mirror_to_web_data(landscape_binary_path)
+        mirror_to_web_data(sankey_path)
+        sync_shards_to_web_data(manifest_path)
+        sync_density_to_web_data(density_index_path)
+        published = [landscape_path.name, landscape_binary_path.name, sankey_path.name]
+        stamp_assets(landscape_path.parent, published)
+        stamp_assets(WEB_DATA_DIR, published)
 
     print(f"Landscape records: {len(landscape_payload)}")
     print(f"Sankey links: {len(sankey_payload)}")
@@ -1,12 +1,10 @@
-from process_advanced import (
-    get_allowed_concepts_for_year,
-    is_meaningful_concept,
+from taxonomy import (
     prettify_concept,
     normalize_phrase,
-    CONCEPT_START_YEAR,
     CONCEPT_END_YEAR,
     normalize_year,
-    ensure_list
+    ensure_list,
+    summary_concepts
 )
 import json
 from collections import Counter
@@ -97,31 +95,8 @@ def process_visual_data(input_file):
             keyword_labels[year] = {}
 
         # 过滤并统计 Concept (这是 OpenAlex 提供的高质量标签)
-        # 获取该年份允许的白名单
-        allowed_concepts_set = get_allowed_concepts_for_year(year_val)
-
-        for concept in concepts:
-            if not is_meaningful_concept(concept):
-                continue
-            normalized = normalize_phrase(concept)
-            if not normalized:
-                continue
-
-            pretty = prettify_concept(concept) or concept
-
-            # 严格过滤：白名单检查
-            if allowed_concepts_set:
-                if not any(normalize_phrase(pretty) == normalize_phrase(a) for a in allowed_concepts_set):
-                    continue
-
-            # 严格过滤：年份检查
-            start_year = CONCEPT_START_YEAR.get(pretty)
-            end_year = CONCEPT_END_YEAR.get(pretty)
-            if start_year and year_val < start_year:
-                continue
-            if end_year and year_val > end_year:
-                continue
-
+        # 白名单与年份过滤见 taxonomy.summary_concepts，/api/stats 共用同一规则
+        for normalized, pretty in summary_concepts(concepts, year_val):
             keyword_trend[year][normalized] += 1
             keyword_labels[year].setdefault(normalized, pretty)
 
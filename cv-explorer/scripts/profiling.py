@@ -0,0 +1,309 @@
+"""Per-stage profiling for the visualization pipeline.
+
+`process_advanced.main --profile` activates a `StageProfiler`; pipeline code
+marks its phases with `stage("tfidf")` and bumps counters with `count(...)`.
+Both helpers are no-ops while no profiler is active, so the hooks stay in the
+hot paths permanently.
+
+Two reports can be compared to catch regressions:
+
+    python scripts/profiling.py diff base.json candidate.json --threshold 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_VERSION = 1
+_ACTIVE = None
+
+
+def peak_rss_mb():
+    """Process-lifetime peak resident set size in MiB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 2)
+    return round(peak / 1024, 2)
+
+
+class StageProfiler:
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.counters = defaultdict(int)
+        self._started_at = None
+        self._owns_tracemalloc = False
+
+    def start(self):
+        global _ACTIVE
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._started_at = time.perf_counter()
+        _ACTIVE = self
+        return self
+
+    def stop(self):
+        global _ACTIVE
+        if _ACTIVE is self:
+            _ACTIVE = None
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    @contextmanager
+    def stage(self, name):
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            base_traced = tracemalloc.get_traced_memory()[0]
+        counters_before = dict(self.counters)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            peak_traced = None
+            if tracing:
+                peak_traced = max(
+                    0, tracemalloc.get_traced_memory()[1] - base_traced)
+            deltas = {
+                key: value - counters_before.get(key, 0)
+                for key, value in self.counters.items()
+                if value != counters_before.get(key, 0)
+            }
+            self._record(name, wall, cpu, peak_traced, deltas)
+
+    def _record(self, name, wall, cpu, peak_traced, deltas):
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = {
+                "calls": 0,
+                "wall_s": 0.0,
+                "cpu_s": 0.0,
+                "peak_traced_mb": None,
+                "peak_rss_mb": None,
+                "counters": {}
+            }
+            self.stages[name] = entry
+        entry["calls"] += 1
+        entry["wall_s"] = round(entry["wall_s"] + wall, 6)
+        entry["cpu_s"] = round(entry["cpu_s"] + cpu, 6)
+        if peak_traced is not None:
+            traced_mb = round(peak_traced / (1024 * 1024), 3)
+            entry["peak_traced_mb"] = max(
+                entry["peak_traced_mb"] or 0.0, traced_mb)
+        entry["peak_rss_mb"] = peak_rss_mb()
+        for key, value in deltas.items():
+            entry["counters"][key] = entry["counters"].get(key, 0) + value
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def report(self, meta=None):
+        total = None
+        if self._started_at is not None:
+            total = round(time.perf_counter() - self._started_at, 6)
+        return {
+            "version": REPORT_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "meta": meta or {},
+            "total_wall_s": total,
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": self.stages,
+            "counters": dict(self.counters)
+        }
+
+    def write(self, path, meta=None):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(self.report(meta), f, ensure_ascii=False, indent=2)
+        return path
+
+
+def active_profiler():
+    return _ACTIVE
+
+
+def stage(name):
+    """Time a pipeline phase when profiling is on; otherwise do nothing."""
+    if _ACTIVE is None:
+        return nullcontext()
+    return _ACTIVE.stage(name)
+
+
+def count(name, amount=1):
+    if _ACTIVE is not None:
+        _ACTIVE.counters[name] += amount
+
+
+def load_report(path):
+    with Path(path).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _relative_change(base, candidate):
+    if base is None or candidate is None:
+        return None
+    if base == 0:
+        return None if candidate == 0 else float("inf")
+    return (candidate - base) / base
+
+
+def diff_reports(base, candidate, threshold=0.2, min_wall_s=0.05, min_memory_mb=1.0):
+    """Compare two reports stage by stage.
+
+    A metric regresses when it grows by more than `threshold` (relative) and
+    by more than the absolute noise floor for its unit.
+    """
+    rows = []
+    regressions = []
+    stage_names = list(base.get("stages", {}))
+    for name in candidate.get("stages", {}):
+        if name not in stage_names:
+            stage_names.append(name)
+
+    metrics = (
+        ("wall_s", min_wall_s),
+        ("cpu_s", min_wall_s),
+        ("peak_traced_mb", min_memory_mb),
+    )
+    for name in stage_names:
+        base_stage = base.get("stages", {}).get(name)
+        cand_stage = candidate.get("stages", {}).get(name)
+        if base_stage is None or cand_stage is None:
+            rows.append({"stage": name, "metric": "presence",
+                         "base": base_stage is not None,
+                         "candidate": cand_stage is not None,
+                         "change": None, "regressed": False})
+            continue
+        for metric, floor in metrics:
+            old = base_stage.get(metric)
+            new = cand_stage.get(metric)
+            change = _relative_change(old, new)
+            regressed = (
+                change is not None
+                and change > threshold
+                and (new - old) > floor
+            )
+            row = {"stage": name, "metric": metric, "base": old,
+                   "candidate": new, "change": change, "regressed": regressed}
+            rows.append(row)
+            if regressed:
+                regressions.append(row)
+
+        old_counters = base_stage.get("counters", {})
+        new_counters = cand_stage.get("counters", {})
+        for key in sorted(set(old_counters) | set(new_counters)):
+            old = old_counters.get(key, 0)
+            new = new_counters.get(key, 0)
+            if old != new:
+                rows.append({"stage": name, "metric": f"counter:{key}",
+                             "base": old, "candidate": new,
+                             "change": _relative_change(old, new),
+                             "regressed": False})
+    return rows, regressions
+
+
+def format_diff(rows):
+    lines = [f"{'stage':<18} {'metric':<26} {'base':>12} {'candidate':>12} {'change':>9}"]
+    for row in rows:
+        change = row["change"]
+        if change is None:
+            change_text = "-"
+        elif change == float("inf"):
+            change_text = "new"
+        else:
+            change_text = f"{change * 100:+.1f}%"
+        marker = "  <-- regression" if row["regressed"] else ""
+        lines.append(
+            f"{row['stage']:<18} {row['metric']:<26} "
+            f"{_format_value(row['base']):>12} {_format_value(row['candidate']):>12} "
+            f"{change_text:>9}{marker}"
+        )
+    return "\n".join(lines)
+
+
+def _format_value(value):
+    if value is None:
+        return "-"
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Inspect and compare pipeline profile reports.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    show = sub.add_parser("show", help="Print a single report.")
+    show.add_argument("report")
+
+    diff = sub.add_parser("diff", help="Compare two reports.")
+    diff.add_argument("base")
+    diff.add_argument("candidate")
+    diff.add_argument("--threshold", type=float, default=0.2,
+                      help="Relative growth that counts as a regression.")
+    diff.add_argument("--min-wall", type=float, default=0.05,
+                      help="Ignore time regressions smaller than this many seconds.")
+    diff.add_argument("--min-memory", type=float, default=1.0,
+                      help="Ignore memory regressions smaller than this many MiB.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "show":
+        report = load_report(args.report)
+        print(f"total wall: {report.get('total_wall_s')}s, peak RSS: {report.get('peak_rss_mb')} MiB")
+        for name, entry in report.get("stages", {}).items():
+            print(f"{name:<18} wall={entry['wall_s']:.3f}s cpu={entry['cpu_s']:.3f}s "
+                  f"traced={_format_value(entry.get('peak_traced_mb'))}MiB "
+                  f"rss={_format_value(entry.get('peak_rss_mb'))}MiB {entry.get('counters') or ''}")
+        return 0
+
+    rows, regressions = diff_reports(
+        load_report(args.base), load_report(args.candidate),
+        threshold=args.threshold, min_wall_s=args.min_wall,
+        min_memory_mb=args.min_memory)
+    print(format_diff(rows))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold * 100:.0f}%")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""Atomic, content-addressed publishing of the generated data assets.
+
+Every published file is written to a temporary sibling and renamed into
+place, so a reader never observes a half-written file. Identical content is
+never rewritten. Each file gets precompressed `.gz` and (if the optional
+`brotli` package is installed) `.br` siblings, which `npx http-server -g -b`
+serves directly.
+
+`publish_tree` only publishes the datasets the frontend loads
+(`PUBLISHED_DATASETS`); the full corpus, profiles and backend-only indexes in
+`data/` stay out of the public web root. `stamp_assets` additionally copies
+the published datasets to `assets/<stem>.<sha256[:12]><suffix>` and records
+them in `asset-manifest.json`:
+
+    {
+      "version": 1,
+      "assets": {
+        "landscape_data.json": {
+          "path": "assets/landscape_data.1f2e3d4c5b6a.json",
+          "sha256": "...", "bytes": 1046363,
+          "encodings": {"gzip": 181234, "br": 140321}
+        }
+      }
+    }
+
+Hashed URLs never change content, so they are served with immutable cache
+headers (see vercel.json); `main.js` resolves dataset paths through the
+manifest and falls back to the plain names.
+
+Usage:
+    python scripts/publish.py                       # data/ -> web/data/
+    python scripts/publish.py --source data --target web/data
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip siblings are produced
+    brotli = None
+
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+ASSET_DIR_NAME = "assets"
+HASH_LENGTH = 12
+# 只发布前端读取的数据集；cleaned_papers.json、search_index.bin 等仅供后端/流水线使用
+PUBLISHED_DATASETS = (
+    "landscape_data.json",
+    "landscape_data.bin",
+    "sankey_data.json",
+    "summary.json",
+    "wordcloud_data.json",
+    "leaderboard_seeds.json",
+    "ai_insights.json",
+)
+COMPRESSED_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+# Below this size the compressed sibling saves less than a request header costs.
+MIN_COMPRESS_BYTES = 1024
+
+
+def sha256_bytes(payload):
+    return hashlib.sha256(payload).hexdigest()
+
+
+def is_compressed_sibling(path):
+    return Path(path).suffix in COMPRESSED_SUFFIXES.values()
+
+
+def atomic_write_bytes(path, payload):
+    """Write `payload` to `path` via a temp file + rename in the same directory."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def write_if_changed(path, payload):
+    """Atomically write `payload` unless `path` already holds exactly these bytes."""
+    path = Path(path)
+    if path.exists() and path.stat().st_size == len(payload) and path.read_bytes() == payload:
+        return False
+    atomic_write_bytes(path, payload)
+    return True
+
+
+def compressed_variants(payload):
+    if len(payload) < MIN_COMPRESS_BYTES:
+        return {}
+    variants = {"gzip": gzip.compress(payload, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(payload, quality=11)
+    return variants
+
+
+def _write_variants(path, payload, force=False):
+    """Write the compressed siblings of `path`; returns {encoding: bytes}."""
+    path = Path(path)
+    sizes = {}
+    variants = compressed_variants(payload)
+    for encoding, suffix in COMPRESSED_SUFFIXES.items():
+        sibling = path.with_name(path.name + suffix)
+        if encoding not in variants:
+            # 源文件变小或未安装 brotli 时清理旧的压缩副本，避免内容不一致
+            if sibling.exists():
+                sibling.unlink()
+            continue
+        if force or not sibling.exists():
+            atomic_write_bytes(sibling, variants[encoding])
+        sizes[encoding] = len(variants[encoding])
+    return sizes
+
+
+def publish_bytes(path, payload):
+    """Publish `payload` at `path` with compressed siblings. Returns True if rewritten."""
+    changed = write_if_changed(path, payload)
+    _write_variants(path, payload, force=changed)
+    return changed
+
+
+def publish_file(source, target):
+    source, target = Path(source), Path(target)
+    if source.resolve() == target.resolve():
+        payload = source.read_bytes()
+        _write_variants(target, payload)
+        return False
+    return publish_bytes(target, source.read_bytes())
+
+
+def hashed_name(path, digest):
+    path = Path(path)
+    return f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"
+
+
+def load_asset_manifest(root):
+    manifest_path = Path(root) / ASSET_MANIFEST_NAME
+    if not manifest_path.exists():
+        return {"version": 1, "assets": {}}
+    with manifest_path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def stamp_assets(root, names):
+    """Write hash-named copies of `names` (relative to root) and update the asset manifest."""
+    root = Path(root)
+    asset_dir = root / ASSET_DIR_NAME
+    manifest = load_asset_manifest(root)
+    assets = manifest.setdefault("assets", {})
+
+    for name in names:
+        source = root / name
+        if not source.is_file():
+            assets.pop(name, None)
+            continue
+        payload = source.read_bytes()
+        digest = sha256_bytes(payload)
+        target = asset_dir / hashed_name(source, digest)
+        write_if_changed(target, payload)
+        encodings = _write_variants(target, payload)
+        assets[name] = {
+            "path": f"{ASSET_DIR_NAME}/{target.name}",
+            "sha256": digest,
+            "bytes": len(payload),
+            "encodings": encodings,
+        }
+
+    # 只保留清单中仍被引用的哈希副本
+    referenced = {Path(meta["path"]).name for meta in assets.values()}
+    if asset_dir.is_dir():
+        for stale in asset_dir.iterdir():
+            base = stale.name[:-len(stale.suffix)] if is_compressed_sibling(stale) else stale.name
+            if stale.is_file() and base not in referenced:
+                stale.unlink()
+
+    manifest["assets"] = dict(sorted(assets.items()))
+    write_if_changed(
+        root / ASSET_MANIFEST_NAME,
+        json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    return manifest
+
+
+def publishable_files(root):
+    root = Path(root)
+    return sorted(name for name in PUBLISHED_DATASETS if (root / name).is_file())
+
+
+def publish_tree(source_root, target_root):
+    """Publish the frontend datasets of `source_root` into `target_root` and stamp both."""
+    source_root, target_root = Path(source_root), Path(target_root)
+    names = publishable_files(source_root)
+    changed = [name for name in names if publish_file(source_root / name, target_root / name)]
+    stamp_assets(source_root, names)
+    if target_root.resolve() != source_root.resolve():
+        stamp_assets(target_root, names)
+    return changed
+
+
+def parse_args():
+    project_root = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description="原子发布 data/ 产物到 web/data，并生成压缩副本与哈希清单")
+    parser.add_argument("--source", default=str(project_root / "data"))
+    parser.add_argument("--target", default=str(project_root / "web" / "data"))
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if brotli is None:
+        print("[warn] 未安装 brotli，仅生成 .gz 压缩副本")
+    changed = publish_tree(args.source, args.target)
+    print(f"发布完成: {len(changed)} 个文件更新" + (f" ({', '.join(changed)})" if changed else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""BM25 inverted index over paper titles and abstracts (`search_index.bin`).
+
+Built by `process_advanced.py` from the full cleaned corpus (not only the
+landscape sample) and read by the backend's `/api/search`. Tokens come from
+`taxonomy.clean_academic_text`, so queries and documents share one tokenizer.
+
+The file reuses the container of `landscape_binary.py` (preamble, header JSON,
+4-byte aligned little-endian columns) with magic "CVSI". Header:
+
+    {
+      "params": {"k1": 1.2, "b": 0.75, "title_weight": 2},
+      "avg_length": 87.3,
+      "dictionaries": {"venue": [...]},
+      "columns": [...]
+    }
+
+Columns (N documents, T terms, P postings):
+
+    doc_length        uint16[N]   weighted token count, clipped at 65535
+    year              uint16[N]   0 = unknown
+    citations         uint32[N]
+    venue             uint8[N]    index into dictionaries.venue (uint16 beyond 256 venues)
+    title_offsets     uint32[N+1] byte ranges into title_bytes (NUL-terminated)
+    title_bytes       uint8[*]
+    id_offsets        uint32[N+1] landscape id when the paper is on the map,
+    id_bytes          uint8[*]    else its source id, else ""
+    term_offsets      uint32[T+1] sorted vocabulary, NUL-terminated
+    term_bytes        uint8[*]
+    posting_offsets   uint32[T+1] term t owns postings [offsets[t], offsets[t+1])
+    posting_docs      uint32[P]   ascending document numbers
+    posting_tf        uint16[P]   weighted term frequency
+
+Title tokens count `title_weight` times in both the term frequency and the
+document length, a cheap stand-in for a separate title field.
+
+    python scripts/search_index.py data/cleaned_papers.json --query "gaussian splatting"
+"""
+
+import argparse
+import json
+import math
+import mmap
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from landscape_binary import numpy_columns, pack_columns, string_column, unpack_header
+from publish import write_if_changed
+from taxonomy import clean_academic_text, normalize_citations, normalize_year, pick_field
+
+MAGIC = b"CVSI"
+VERSION = 1
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+MAX_COUNT = 0xFFFF
+
+
+def tokenize(text):
+    return clean_academic_text(text or "").split()
+
+
+def encode_search_index(papers, landscape_ids=None, title_weight=TITLE_WEIGHT):
+    """`landscape_ids` maps a title to its landscape record id, so hits can be located on the map."""
+    landscape_ids = landscape_ids or {}
+    postings = defaultdict(list)  # term -> [(doc, tf)], docs ascending
+    lengths, years, citations, venue_codes, titles, ids = [], [], [], [], [], []
+    venues = []
+    venue_index = {}
+
+    for doc, paper in enumerate(papers):
+        title = str(pick_field(paper, "title", "") or "")
+        counts = Counter()
+        for token in tokenize(title):
+            counts[token] += title_weight
+        counts.update(tokenize(pick_field(paper, "abstract", "")))
+        for term, tf in counts.items():
+            postings[term].append((doc, min(tf, MAX_COUNT)))
+
+        venue = str(pick_field(paper, "venue", "") or "Others")
+        if venue not in venue_index:
+            venue_index[venue] = len(venues)
+            venues.append(venue)
+        lengths.append(min(sum(counts.values()), MAX_COUNT))
+        years.append(normalize_year(pick_field(paper, "year")) or 0)
+        citations.append(normalize_citations(pick_field(paper, "citations", 0)))
+        venue_codes.append(venue_index[venue])
+        titles.append(title)
+        ids.append(landscape_ids.get(title) or pick_field(paper, "id", ""))
+
+    # 最多 256 个 venue 用 uint8 编码，更多时改用 uint16（列类型记录在头部，读取端无需改动）
+    if len(venues) > 0x10000:
+        raise ValueError("venue dictionary exceeds 65536 entries")
+    venue_type = "uint8" if len(venues) <= 0x100 else "uint16"
+
+    terms = sorted(postings)
+    posting_offsets = [0]
+    posting_docs = []
+    posting_tf = []
+    for term in terms:
+        for doc, tf in postings[term]:
+            posting_docs.append(doc)
+            posting_tf.append(tf)
+        posting_offsets.append(len(posting_docs))
+
+    title_offsets, title_bytes = string_column(titles)
+    id_offsets, id_bytes = string_column(ids)
+    term_offsets, term_bytes = string_column(terms)
+    meta = {
+        "params": {"k1": K1, "b": B, "title_weight": title_weight},
+        "avg_length": round(sum(lengths) / len(lengths), 4) if lengths else 0.0,
+        "dictionaries": {"venue": venues},
+    }
+    columns = [
+        ("doc_length", "uint16", lengths),
+        ("year", "uint16", years),
+        ("citations", "uint32", citations),
+        ("venue", venue_type, venue_codes),
+        ("title_offsets", "uint32", title_offsets),
+        ("title_bytes", "uint8", title_bytes),
+        ("id_offsets", "uint32", id_offsets),
+        ("id_bytes", "uint8", id_bytes),
+        ("term_offsets", "uint32", term_offsets),
+        ("term_bytes", "uint8", term_bytes),
+        ("posting_offsets", "uint32", posting_offsets),
+        ("posting_docs", "uint32", posting_docs),
+        ("posting_tf", "uint16", posting_tf),
+    ]
+    return pack_columns(MAGIC, VERSION, len(papers), meta, columns)
+
+
+def write_search_index(path, papers, landscape_ids=None):
+    """Only the backend reads this file (memory-mapped), so no compressed siblings."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(path, encode_search_index(papers, landscape_ids))
+    return path
+
+
+class SearchIndex:
+    """Read side: numpy views straight over the (memory-mapped) file."""
+
+    def __init__(self, buffer):
+        import numpy as np
+
+        self._np = np
+        self.buffer = buffer
+        self.count, header = unpack_header(buffer, MAGIC, VERSION)
+        self.venue_names = header["dictionaries"]["venue"]
+        params = header["params"]
+        self.k1 = params["k1"]
+        columns = numpy_columns(buffer, header)
+        self.columns = columns
+        self.years = columns["year"]
+        self.venues = columns["venue"]
+        self.citations = columns["citations"]
+        self.posting_offsets = columns["posting_offsets"]
+        self.posting_docs = columns["posting_docs"]
+        self.posting_tf = columns["posting_tf"]
+
+        term_bytes = columns["term_bytes"].tobytes()
+        self.terms = {term: idx for idx, term in enumerate(term_bytes[:-1].decode("utf-8").split("\0"))} \
+            if term_bytes else {}
+        avg_length = header["avg_length"] or 1.0
+        # BM25 的长度归一化项只依赖文档，加载时算好
+        self.norm = (self.k1 * (1 - params["b"] + params["b"] * columns["doc_length"] / avg_length)) \
+            .astype(np.float32)
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _string(self, name, doc):
+        offsets = self.columns[f"{name}_offsets"]
+        return self.columns[f"{name}_bytes"][offsets[doc]:offsets[doc + 1] - 1].tobytes().decode("utf-8")
+
+    def record(self, doc):
+        return {
+            "id": self._string("id", doc) or None,
+            "title": self._string("title", doc),
+            "year": int(self.years[doc]) or None,
+            "venue": self.venue_names[self.venues[doc]],
+            "citations": int(self.citations[doc]),
+        }
+
+    def search(self, query, year=None, venue=None, limit=20):
+        """Ranked (total, [(doc, score)]) for `query`; ties go to the more cited paper."""
+        np = self._np
+        term_ids = [self.terms[token] for token in dict.fromkeys(tokenize(query)) if token in self.terms]
+        if not term_ids or limit <= 0:
+            return 0, []
+        scores = np.zeros(self.count, dtype=np.float32)
+        for term in term_ids:
+            lo, hi = int(self.posting_offsets[term]), int(self.posting_offsets[term + 1])
+            docs = self.posting_docs[lo:hi]
+            tf = self.posting_tf[lo:hi].astype(np.float32)
+            idf = math.log(1 + (self.count - (hi - lo) + 0.5) / ((hi - lo) + 0.5))
+            scores[docs] += idf * tf * (self.k1 + 1) / (tf + self.norm[docs])
+
+        candidates = np.flatnonzero(scores)
+        if year is not None:
+            candidates = candidates[self.years[candidates] == year]
+        if venue is not None:
+            if venue not in self.venue_names:
+                return 0, []
+            candidates = candidates[self.venues[candidates] == self.venue_names.index(venue)]
+        total = int(candidates.size)
+        if total > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        order = np.lexsort((-self.citations[candidates].astype(np.int64), -scores[candidates]))
+        return total, [(int(doc), float(scores[doc])) for doc in candidates[order]]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the BM25 search index.")
+    parser.add_argument("input", nargs="?", default="data/cleaned_papers.json")
+    parser.add_argument("--output", default="data/search_index.bin")
+    parser.add_argument("--landscape", default="data/landscape_data.json",
+                        help="Landscape records used to attach map ids to hits.")
+    parser.add_argument("--query", default=None, help="Run one query against the written index.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with open(args.input, "r", encoding="utf-8") as f:
+        papers = json.load(f)
+    landscape_ids = {}
+    if Path(args.landscape).exists():
+        with open(args.landscape, "r", encoding="utf-8") as f:
+            landscape_ids = {r.get("title"): r.get("id") for r in json.load(f)}
+    start = time.perf_counter()
+    path = write_search_index(args.output, papers, landscape_ids)
+    print(f"{len(papers)} papers -> {path} ({path.stat().st_size} B, {time.perf_counter() - start:.1f}s)")
+    if args.query:
+        index = SearchIndex.open(path)
+        total, hits = index.search(args.query)
+        print(f"{total} hits for {args.query!r}")
+        for doc, score in hits[:10]:
+            print(f"  {score:6.2f}  {index.record(doc)['title']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""Synthetic cleaned-paper generator for benchmarks.
+
+Produces records in the `data_cleaner.py` output format (t/y/c/v/a/abs/con)
+whose year, venue, citation, concept and abstract-length distributions follow
+the real corpus. By default the shape is read from `data/summary.json`; a full
+`cleaned_papers.json` can be used instead via `--calibrate`.
+
+    python scripts/synthetic_corpus.py --count 100000 --output /tmp/synthetic.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import random
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SUMMARY = PROJECT_ROOT / "data" / "summary.json"
+
+# Fallback when no summary.json is available (counts mirror the 2014-2024 crawl).
+DEFAULT_YEARLY = {
+    2014: (2267, 61.5), 2015: (2737, 35.8), 2016: (3401, 31.6),
+    2017: (4170, 52.5), 2018: (6004, 35.6), 2019: (9626, 34.1),
+    2020: (12512, 28.8), 2021: (14551, 21.5), 2022: (16304, 16.4),
+    2023: (19629, 11.2), 2024: (12614, 5.3)
+}
+DEFAULT_VENUES = {"CVPR": 68172, "ICCV": 20065, "ECCV": 15578}
+
+# OpenAlex attaches these to nearly every CV paper.
+GENERIC_CONCEPTS = (
+    ("Computer science", 0.95), ("Artificial intelligence", 0.9),
+    ("Computer vision", 0.7), ("Pattern recognition (psychology)", 0.45),
+    ("Machine learning", 0.3), ("Deep learning", 0.25)
+)
+
+PROBLEM_PHRASES = (
+    "object detection", "instance segmentation", "semantic segmentation",
+    "panoptic segmentation", "visual tracking", "multi-object tracking",
+    "image recognition", "action recognition", "face recognition",
+    "person re-identification", "image classification", "image generation",
+    "video generation", "view synthesis", "style transfer", "image restoration",
+    "super-resolution", "denoising", "inpainting", "dehazing",
+    "3d reconstruction", "depth estimation", "point cloud", "slam",
+    "pose estimation", "optical flow", "visual question answering"
+)
+
+# (phrase, first year it plausibly appears)
+METHOD_PHRASES = (
+    ("convolutional neural network", 2010), ("resnet", 2015), ("cnn", 2012),
+    ("recurrent network", 2012), ("lstm", 2013), ("generative adversarial network", 2014),
+    ("gan", 2014), ("stylegan", 2018), ("graph neural network", 2017),
+    ("transformer", 2017), ("self-attention", 2017), ("vision transformer", 2020),
+    ("vit", 2020), ("detr", 2020), ("swin", 2021), ("masked autoencoders", 2021),
+    ("contrastive learning", 2019), ("clip", 2021), ("moco", 2019),
+    ("diffusion models", 2020), ("stable diffusion", 2022), ("ddpm", 2020),
+    ("nerf", 2020), ("gaussian splatting", 2023), ("mlp", 2010), ("yolo", 2016)
+)
+
+FILLER_WORDS = (
+    "the", "and", "for", "with", "that", "this", "from", "into", "which", "such",
+    "we", "our", "propose", "method", "approach", "framework", "results", "show",
+    "experiments", "demonstrate", "performance", "state-of-the-art", "benchmark",
+    "dataset", "datasets", "training", "features", "feature", "representation",
+    "learning", "network", "model", "models", "accuracy", "efficient", "robust",
+    "novel", "existing", "methods", "outperforms", "significantly", "improves",
+    "task", "tasks", "image", "images", "video", "videos", "visual", "scene",
+    "objects", "spatial", "temporal", "global", "local", "context", "module",
+    "loss", "supervision", "labels", "annotations", "weakly", "unsupervised",
+    "self-supervised", "domain", "adaptation", "generalization", "transfer",
+    "fusion", "multi-scale", "hierarchical", "attention", "memory", "graph",
+    "geometry", "semantic", "structure", "prior", "priors", "sampling",
+    "optimization", "inference", "real-time", "lightweight", "compact",
+    "pixel", "pixels", "patch", "patches", "tokens", "embedding", "latent",
+    "space", "distribution", "uncertainty", "calibration", "consistency",
+    "alignment", "correspondence", "matching", "retrieval", "queries",
+    "proposals", "regions", "boxes", "masks", "keypoints", "shape", "texture",
+    "appearance", "illumination", "camera", "views", "multi-view", "lidar",
+    "medical", "remote", "sensing", "autonomous", "driving", "robotics",
+    "evaluate", "extensive", "ablation", "code", "available", "publicly"
+)
+
+SYLLABLES = ("ar", "bel", "cor", "den", "ex", "fal", "gan", "hyp", "ion", "jux",
+             "kel", "lum", "mor", "nov", "oct", "per", "qua", "ros", "syn", "tor",
+             "ul", "vex", "wor", "xen", "yal", "zet")
+
+
+def _long_tail_vocabulary(size=4000):
+    words = []
+    for a, b, c in itertools.product(SYLLABLES, repeat=3):
+        words.append(a + b + c)
+        if len(words) >= size:
+            break
+    return tuple(words)
+
+
+LONG_TAIL_WORDS = _long_tail_vocabulary()
+
+
+def _zipf_cum_weights(count, exponent=1.1):
+    total = 0.0
+    cumulative = []
+    for rank in range(1, count + 1):
+        total += 1.0 / (rank ** exponent)
+        cumulative.append(total)
+    return cumulative
+
+
+def load_summary_profile(summary_path=DEFAULT_SUMMARY):
+    """Distribution profile derived from the pipeline's own summary.json."""
+    yearly = dict(DEFAULT_YEARLY)
+    venues = dict(DEFAULT_VENUES)
+    concepts_by_year = {}
+    path = Path(summary_path)
+    if path.exists():
+        with path.open("r", encoding="utf-8") as f:
+            summary = json.load(f)
+        parsed = {}
+        for year, stats in (summary.get("yearly") or {}).items():
+            count = stats.get("count") or 0
+            if count:
+                parsed[int(year)] = (count, (stats.get("cites") or 0) / count)
+        if parsed:
+            yearly = parsed
+        parsed_venues = {name: sum(by_year.values())
+                         for name, by_year in (summary.get("venues") or {}).items()}
+        if any(parsed_venues.values()):
+            venues = parsed_venues
+        for year, keywords in (summary.get("keywords") or {}).items():
+            concepts_by_year[int(year)] = dict(keywords)
+    return {
+        "years": {year: {"count": count, "mean_citations": mean}
+                  for year, (count, mean) in yearly.items()},
+        "venues": venues,
+        "concepts_by_year": concepts_by_year,
+        "concepts_per_paper": {"mean": 2.2, "max": 8},
+        "abstract_words": {"log_mean": math.log(170), "log_sd": 0.3},
+        "citation_sigma": 1.6
+    }
+
+
+def calibrate(papers):
+    """Fit a distribution profile from real cleaned papers."""
+    years = {}
+    venues = {}
+    concepts_by_year = {}
+    concept_counts = []
+    abstract_logs = []
+    log_citations = []
+    for paper in papers:
+        try:
+            year = int(str(paper.get("y") or paper.get("year")).strip())
+        except (TypeError, ValueError):
+            continue
+        citations = float(paper.get("c") or paper.get("citations") or 0)
+        bucket = years.setdefault(year, {"count": 0, "cites": 0.0})
+        bucket["count"] += 1
+        bucket["cites"] += citations
+        log_citations.append(math.log1p(citations))
+        venue = paper.get("v") or paper.get("venue") or "Unknown"
+        venues[venue] = venues.get(venue, 0) + 1
+        concepts = paper.get("con") or paper.get("concepts") or []
+        concept_counts.append(len(concepts))
+        year_concepts = concepts_by_year.setdefault(year, {})
+        for concept in concepts:
+            year_concepts[concept] = year_concepts.get(concept, 0) + 1
+        words = len(str(paper.get("abs") or paper.get("abstract") or "").split())
+        if words:
+            abstract_logs.append(math.log(words))
+
+    def _mean_sd(values, default_mean, default_sd):
+        if len(values) < 2:
+            return default_mean, default_sd
+        mean = sum(values) / len(values)
+        var = sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+        return mean, math.sqrt(var)
+
+    log_mean, log_sd = _mean_sd(abstract_logs, math.log(170), 0.3)
+    _, citation_sd = _mean_sd(log_citations, 0.0, 1.6)
+    top_concepts = {
+        year: dict(sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:200])
+        for year, counts in concepts_by_year.items()
+    }
+    return {
+        "years": {year: {"count": b["count"], "mean_citations": b["cites"] / b["count"]}
+                  for year, b in years.items()},
+        "venues": venues,
+        "concepts_by_year": top_concepts,
+        "concepts_per_paper": {
+            "mean": (sum(concept_counts) / len(concept_counts)) if concept_counts else 2.2,
+            "max": max(concept_counts) if concept_counts else 8
+        },
+        "abstract_words": {"log_mean": log_mean, "log_sd": log_sd},
+        "citation_sigma": max(0.5, citation_sd)
+    }
+
+
+def _normalize_profile(profile):
+    """JSON round-trips turn year keys into strings; restore ints."""
+    profile = dict(profile)
+    profile["years"] = {int(k): v for k, v in profile["years"].items()}
+    profile["concepts_by_year"] = {
+        int(k): v for k, v in profile.get("concepts_by_year", {}).items()}
+    return profile
+
+
+class CorpusGenerator:
+    def __init__(self, profile=None, seed=0):
+        self.profile = _normalize_profile(profile or load_summary_profile())
+        self.rng = random.Random(seed)
+
+        years = sorted(self.profile["years"])
+        self.years = years
+        self.year_cum = list(itertools.accumulate(
+            self.profile["years"][y]["count"] for y in years))
+        venue_items = sorted(self.profile["venues"].items())
+        self.venues = [name for name, _ in venue_items]
+        self.venue_cum = list(itertools.accumulate(w for _, w in venue_items))
+
+        self.concept_tables = {}
+        for year, counts in self.profile["concepts_by_year"].items():
+            items = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)
+            if items:
+                self.concept_tables[year] = (
+                    [name for name, _ in items],
+                    list(itertools.accumulate(c for _, c in items)))
+
+        self.filler_cum = _zipf_cum_weights(len(FILLER_WORDS), exponent=0.9)
+        self.tail_cum = _zipf_cum_weights(len(LONG_TAIL_WORDS), exponent=1.2)
+        self.sigma = self.profile.get("citation_sigma", 1.6)
+        self.counter = 0
+
+    def _citations(self, year):
+        mean = max(0.5, self.profile["years"][year]["mean_citations"])
+        mu = math.log(mean) - self.sigma ** 2 / 2
+        return int(self.rng.lognormvariate(mu, self.sigma))
+
+    def _concepts(self, year):
+        rng = self.rng
+        concepts = [name for name, p in GENERIC_CONCEPTS if rng.random() < p]
+        table = self.concept_tables.get(year)
+        if table is None and self.concept_tables:
+            nearest = min(self.concept_tables, key=lambda y: abs(y - year))
+            table = self.concept_tables[nearest]
+        if table:
+            spec = self.profile["concepts_per_paper"]
+            k = min(spec["max"], max(1, int(rng.expovariate(1 / spec["mean"])) + 1))
+            picked = rng.choices(table[0], cum_weights=table[1], k=k)
+            concepts.extend(dict.fromkeys(picked))
+        return concepts
+
+    def _methods_for_year(self, year):
+        return [phrase for phrase, start in METHOD_PHRASES if start <= year]
+
+    def _abstract(self, year, problems, methods):
+        rng = self.rng
+        spec = self.profile["abstract_words"]
+        length = max(30, int(rng.lognormvariate(spec["log_mean"], spec["log_sd"])))
+        tail = max(1, length // 8)
+        words = rng.choices(FILLER_WORDS, cum_weights=self.filler_cum, k=length - tail)
+        words.extend(rng.choices(LONG_TAIL_WORDS, cum_weights=self.tail_cum, k=tail))
+        rng.shuffle(words)
+        for phrase in problems + methods:
+            words.insert(rng.randrange(len(words) + 1), phrase)
+        if rng.random() < 0.05:
+            words.insert(rng.randrange(len(words) + 1), "$\\mathbf{x}_t$")
+        return " ".join(words)
+
+    def paper(self):
+        rng = self.rng
+        year = rng.choices(self.years, cum_weights=self.year_cum)[0]
+        venue = rng.choices(self.venues, cum_weights=self.venue_cum)[0]
+        available_methods = self._methods_for_year(year)
+        problems = rng.sample(PROBLEM_PHRASES, rng.randint(0, 2))
+        methods = rng.sample(available_methods, min(len(available_methods), rng.randint(0, 2)))
+        title_words = rng.choices(FILLER_WORDS, cum_weights=self.filler_cum, k=rng.randint(3, 7))
+        title_words[rng.randrange(len(title_words))] = (problems or ["vision"])[0]
+        if methods and rng.random() < 0.6:
+            title_words.insert(0, methods[0])
+        self.counter += 1
+        return {
+            "t": " ".join(title_words).title(),
+            "y": year,
+            "c": self._citations(year),
+            "v": venue,
+            "a": [f"Author {rng.randrange(50000)}" for _ in range(rng.randint(1, 6))],
+            "abs": self._abstract(year, problems, methods),
+            "con": self._concepts(year)
+        }
+
+    def papers(self, count):
+        for _ in range(count):
+            yield self.paper()
+
+
+def generate_papers(count, seed=0, profile=None):
+    return list(CorpusGenerator(profile, seed).papers(count))
+
+
+def write_corpus(path, count, seed=0, profile=None):
+    """Stream `count` papers into a JSON array without holding them in memory."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    generator = CorpusGenerator(profile, seed)
+    with path.open("w", encoding="utf-8") as f:
+        f.write("[")
+        for idx, paper in enumerate(generator.papers(count)):
+            if idx:
+                f.write(",")
+            json.dump(paper, f, ensure_ascii=False)
+        f.write("]")
+    return path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic cleaned-paper corpus.")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="data/synthetic_papers.json")
+    parser.add_argument("--summary", default=str(DEFAULT_SUMMARY),
+                        help="summary.json used to shape the distributions.")
+    parser.add_argument("--calibrate", default=None,
+                        help="Fit distributions from a real cleaned_papers.json instead.")
+    parser.add_argument("--save-profile", default=None,
+                        help="Write the fitted distribution profile to this path.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.calibrate:
+        with open(args.calibrate, "r", encoding="utf-8") as f:
+            profile = calibrate(json.load(f))
+    else:
+        profile = load_summary_profile(args.summary)
+    if args.save_profile:
+        with open(args.save_profile, "w", encoding="utf-8") as f:
+            json.dump(profile, f, ensure_ascii=False, indent=2)
+    output = Path(args.output)
+    if not output.is_absolute():
+        output = PROJECT_ROOT / output
+    write_corpus(output, args.count, args.seed, profile)
+    print(f"Synthetic corpus: {args.count} papers -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1144 @@
+"""Concept taxonomy and text normalization shared by the data scripts.
+
+Everything here is plain Python (regex tables, stop-word sets, field helpers)
+so `processor.py` and other summary/word-cloud steps can import it without
+pulling in numpy or scikit-learn. The embedding pipeline lives in
+`process_advanced.py`; callers import these names from here directly.
+"""
+
+import re
+from functools import lru_cache
+
+from profiling import count as profile_count
+
+FIELD_ALIASES = {
+    "id": ("id", "paper_id", "pid"),
+    "title": ("t", "title", "paper_title"),
+    "year": ("y", "year", "pub_year"),
+    "venue": ("v", "venue", "journal", "conference"),
+    "citations": ("c", "citations", "citation", "num_citations"),
+    "abstract": ("abs", "abstract", "summary"),
+    "concepts": ("con", "concepts", "keywords", "tags", "topics")
+}
+
+PROBLEM_DEFINITIONS = {
+    "detection": [
+        r"\b(object|instance|face|pedestrian|vehicle|anomaly|skeleton)\s+detection\b",
+        r"\bdetectors?\b",
+        r"\byolo\b"
+    ],
+    "segmentation": [
+        r"\b(semantic|instance|panoptic|video|medical|image)\s+segmentation\b",
+        r"\bscene\s+parsing\b",
+        r"\bsegment\b"
+    ],
+    "tracking": [
+        r"\b(object|visual|video|multi-object|pose)\s+tracking\b",
+        r"\bmot\b",
+        r"\btrackers?\b"
+    ],
+    "recognition": [
+        r"\b(image|action|face|gesture|scene|pattern)\s+recognition\b",
+        r"\b(image|text|video)\s+classification\b",
+        r"\bre-?identification\b",
+        r"\bre-?id\b"
+    ],
+    "generation": [
+        r"\b(image|video|text-to-image|content|scene|avatar)\s+generation\b",
+        r"\b(image|view)\s+synthesis\b",
+        r"\bgenerative\s+models?\b",
+        r"\bstyle\s+transfer\b"
+    ],
+    "restoration": [
+        r"\b(image|video)\s+restoration\b",
+        r"\bsuper-?resolution\b",
+        r"\bdenoising\b",
+        r"\bdeblurring\b",
+        r"\binpainting\b",
+        r"\bderaining\b",
+        r"\bdehazing\b"
+    ],
+    "3d_vision": [
+        r"\b3d\s+reconstruction\b",
+        r"\bdepth\s+estimation\b",
+        r"\bpoint\s+clouds?\b",
+        r"\bslam\b",
+        r"\bnerf\b",
+        r"\bneural\s+radiance\s+fields?\b",
+        r"\b3d\s+generation\b"
+    ]
+}
+
+METHOD_DEFINITIONS = {
+    "cnn": [
+        r"\bcnn\b", r"\bconvnets?\b", r"\bconvolutional\s+neural\s+networks?\b",
+        r"\bresnet\b", r"\befficientnet\b", r"\bvgg\b", r"\bdensenet\b", r"\bmobilenet\b"
+    ],
+    "transformer": [
+        r"\btransformers?\b", r"\bvision\s+transformers?\b", r"\bself-attention\b",
+        r"\bswin\b", r"\bdetr\b", r"\bbert\b", r"\bcross-attention\b"
+    ],
+    "vit": [
+        r"\bvit\b", r"\bvision\s+transformer\b", r"\bmae\b", r"\bmasked\s+autoencoders?\b"
+    ],
+    "diffusion": [
+        r"\bdiffusion\s+models?\b", r"\bddpm\b", r"\bldm\b", r"\bstable\s+diffusion\b",
+        r"\bscore-based\s+generative\b", r"\bdiffusion\s+probabilistic\b"
+    ],
+    "gan": [
+        r"\bgan\b", r"\bgenerative\s+adversarial\b", r"\bstylegan\b", r"\bcyclegan\b", r"\bpix2pix\b"
+    ],
+    "mlp": [
+        r"\bmlp\b", r"\bmultilayer\s+perceptrons?\b", r"\bmlp-mixer\b"
+    ],
+    "gnn": [
+        r"\bgnn\b", r"\bgraph\s+neural\b", r"\bgcn\b", r"\bgraph\s+convolution\b"
+    ],
+    "nerf": [
+        r"\bnerf\b", r"\bradiance\s+fields?\b", r"\bgaussian\s+splatting\b"
+    ],
+    "contrastive": [
+        r"\bcontrastive\s+learning\b", r"\bclip\b", r"\bsimclr\b", r"\bmoco\b"
+    ],
+    "rnn": [
+        r"\brnn\b", r"\blstm\b", r"\bgru\b", r"\brecurrent\b"
+    ]
+}
+
+METHOD_START_YEAR = {
+    "transformer": 2017,
+    "vit": 2020,
+    "diffusion": 2019,
+    "nerf": 2020,
+    "contrastive": 2019
+}
+
+SEMANTIC_TOPIC_DEFINITIONS = {
+    "Cnn": [r"\bcnn\b", r"\bconvnet\b", r"\bconvolutional\b", r"\bresnet\b", r"\befficientnet\b"],
+    "Transformer": [r"\btransformer\b", r"\bself-attention\b", r"\bswin\b", r"\bdetr\b", r"\bvit\b"],
+    "Diffusion": [r"\bdiffusion\b", r"\bddpm\b", r"\bldm\b", r"\bstable\s+diffusion\b"],
+    "Gan": [r"\bgan\b", r"\badversarial\b", r"\bstylegan\b"],
+    "Nerf": [r"\bnerf\b", r"\bradiance\s+field\b", r"\bgaussian\s+splatting\b"],
+    "Gnn": [r"\bgnn\b", r"\bgraph\b", r"\bgcn\b"],
+    "Mlp": [r"\bmlp\b", r"\bperceptron\b"],
+    "Rnn": [r"\brnn\b", r"\blstm\b", r"\bgru\b"],
+    "Contrastive": [r"\bcontrastive\b", r"\bclip\b", r"\bsimclr\b", r"\bmoco\b"],
+    "Detection": [r"\bdetection\b", r"\byolo\b", r"\brcnn\b"],
+    "Segmentation": [r"\bsegmentation\b", r"\bmask\b", r"\bsam\b"],
+    "Generation": [r"\bgeneration\b", r"\bsynthesis\b"],
+    "Multimodal": [r"\bmultimodal\b", r"\bvision-language\b", r"\bvqa\b", r"\bcaptioning\b"]
+}
+
+TOPIC_PRIORITY = {
+    "Diffusion": 10,
+    "Nerf": 9,
+    "Transformer": 8,
+    "Contrastive": 7,
+    "Gan": 6,
+    "Gnn": 5,
+    "Multimodal": 5,
+    "Detection": 4,
+    "Segmentation": 4,
+    "Cnn": 3,
+    "Rnn": 2,
+    "Mlp": 2,
+    "Generation": 1
+}
+
+CANONICAL_TOPIC_DEFINITIONS = {
+    "Vision Transformer (ViT)": [r"\bvit\b", r"\bvision\s+transformer\b", r"\bswin\b", r"\bdeit\b", r"\bbeit\b", r"\bpvt\b", r"\bcait\b", r"\bt2t\b"],
+    "Diffusion Models": [r"\bdiffusion\b", r"\bddpm\b", r"\bldm\b", r"\bstable\s+diffusion\b", r"\bscore-based\b", r"\bdenoising\s+diffusion\b"],
+    "NeRF & Neural Fields": [r"\bnerf\b", r"\bradiance\s+field\b", r"\bgaussian\s+splatting\b", r"\bview\s+synthesis\b", r"\bimplicit\s+function\b"],
+    "Multimodal Alignment (CLIP)": [r"\bclip\b", r"\balign\b", r"\bcontrastive\s+language\b", r"\btext-image\s+matching\b", r"\bopen-vocabulary\b"],
+    "Large Vision-Language Models": [r"\bllava\b", r"\bminigpt\b", r"\bblip\b", r"\bflamingo\b", r"\bvisual\s+gpt\b", r"\binstructblip\b", r"\bvlm\b"],
+    "Object Detection": [r"\byolo\b", r"\byolov\d\b", r"\bcenternet\b", r"\befficientdet\b", r"\bssd\b", r"\bretina\b", r"\bfcos\b", r"\br-?cnn\b", r"\bfaster\s+rcnn\b", r"\bmask\s+rcnn\b", r"\bcascade\s+rcnn\b", r"\bregion\s+proposal\b", r"\bobject\s+detection\b", r"\bdetectors?\b"],
+    "DETR & Object Queries": [r"\bdetr\b", r"\bdeformable\s+detr\b", r"\bobject\s+query\b", r"\bset\s+prediction\b"],
+    "Segmentation (SAM & U-Net)": [r"\bunet\b", r"\bdeeplab\b", r"\bpspnet\b", r"\bmask2former\b", r"\bsegment\s+anything\b", r"\bsam\b", r"\bpanoptic\s+fpn\b"],
+    "GANs & Image Synthesis": [r"\bgan\b", r"\bstylegan\b", r"\bcyclegan\b", r"\bpix2pix\b", r"\bimage-to-image\b", r"\bbiggan\b", r"\bstyle\s+transfer\b"],
+    "CNN Backbones": [r"\bresnet\b", r"\befficientnet\b", r"\bvgg\b", r"\bdensenet\b", r"\bmobilenet\b", r"\bconvnext\b", r"\binception\b", r"\bxception\b"],
+    "Self-Supervised Learning": [r"\bsimclr\b", r"\bmoco\b", r"\bbyol\b", r"\bdino\b", r"\bmae\b", r"\bmasked\s+image\s+modeling\b", r"\bcontrastive\b"],
+    "3D Reconstruction & SLAM": [r"\bslam\b", r"\bstructure\s+from\s+motion\b", r"\bmulti-view\s+stereo\b", r"\bpoint\s+cloud\b", r"\bmesh\s+reconstruction\b"],
+    "Video & Motion": [r"\bvideo\s+transformer\b", r"\btime\s+series\b", r"\boptical\s+flow\b", r"\baction\s+recognition\b", r"\btracking\b", r"\bmot\b"]
+}
+
+CANONICAL_TOPIC_PRIORITY = {
+    "Diffusion Models": 10,
+    "Large Vision-Language Models": 10,
+    "NeRF & Neural Fields": 9,
+    "Vision Transformer (ViT)": 9,
+    "Multimodal Alignment (CLIP)": 8,
+    "DETR & Object Queries": 8,
+    "Self-Supervised Learning": 7,
+    "GANs & Image Synthesis": 7,
+    "Object Detection": 6,
+    "Segmentation (SAM & U-Net)": 5,
+    "3D Reconstruction & SLAM": 5,
+    "CNN Backbones": 4,
+    "Video & Motion": 3
+}
+
+DEFAULT_PRIMARY_SEMANTIC = "Uncategorized Research"
+
+GENERIC_CONCEPTS = {
+    "computer science",
+    "artificial intelligence",
+    "machine learning",
+    "deep learning",
+    "convolutional neural network",
+    "benchmark",
+    "survey",
+    "dataset",
+    "generalization"
+}
+
+GENERIC_CONCEPT_TOKENS = {
+    "computer", "science", "artificial", "intelligence", "learning",
+    "network", "networks", "model", "models", "paper", "study",
+    "generalization", "method", "analysis", "system", "approach",
+    "algorithm", "benchmark", "dataset", "data"
+}
+
+LOW_VALUE_TERMS = {
+    "remote sensing",
+    "landslide",
+    "earthquake",
+    "soil stability",
+    "geology",
+    "weather forecast",
+    "agriculture",
+    "crop monitoring",
+    "meta analysis",
+    "categorization",
+    "open research",
+    "key",
+    "field",
+    "modal",
+    "generative grammar",
+    "psychology",
+    "mathematics",
+    "medicine",
+    "environmental science",
+    "engineering",
+    "physics",
+    "biology",
+    "business",
+    "materials science",
+    "geography",
+    'noise',
+    'algorithm',
+    'challenge',
+    'performance',
+    'accuracy',
+    'efficiency',
+    'robustness',
+    'framework',
+    'architecture',
+    'methodology',
+    'implementation',
+    'evaluation',
+    'experiment',
+    'ablation',
+    'comparison',
+    'overview',
+    'survey',
+    'review',
+    'perspective',
+    'future',
+    'trend',
+    'direction',
+    'opportunity',
+    'issue',
+    'limitation',
+    'gap',
+    'advance',
+    'progress',
+    'state',
+    'art',
+    'practice',
+    'application',
+    'usage',
+    'deployment',
+    'system',
+    'tool',
+    'platform',
+    'infrastructure',
+    'hardware',
+    'software',
+    'device',
+    'equipment',
+    'setup',
+    'configuration',
+    'parameter',
+    'setting',
+    'feature',
+    'representation',
+    'embedding',
+    'vector',
+    'space',
+    'manifold',
+    'distribution',
+    'function',
+    'mapping',
+    'transform',
+    'operation',
+    'layer',
+    'unit',
+    'block',
+    'module',
+    'component',
+    'part',
+    'element',
+    'structure',
+    'design',
+    'scheme',
+    'strategy',
+    'policy',
+    'protocol',
+    'standard',
+    'criterion',
+    'measure',
+    'metric',
+    'score',
+    'index',
+    'value',
+    'factor',
+    'term',
+    'concept',
+    'idea',
+    'notion',
+    'principle',
+    'theory',
+    'hypothesis',
+    'assumption',
+    'conjecture',
+    'proposition',
+    'lemma',
+    'theorem',
+    'proof',
+    'corollary',
+    'definition',
+    'example',
+    'sample',
+    'instance',
+    'case',
+    'scenario',
+    'situation',
+    'condition',
+    'environment',
+    'context',
+    'setting',
+    'background',
+    'foreground',
+    'object',
+    'subject',
+    'target',
+    'source',
+    'input',
+    'output',
+    'result',
+    'outcome',
+    'effect',
+    'impact',
+    'influence',
+    'consequence',
+    'implication',
+    'significance',
+    'importance',
+    'relevance',
+    'role',
+    'contribution',
+    'innovation',
+    'novelty',
+    'improvement',
+    'enhancement',
+    'extension',
+    'modification',
+    'adaptation',
+    'adjustment',
+    'correction',
+    'revision',
+    'update',
+    'upgrade',
+    'version',
+    'variant',
+    'alternative',
+    'option',
+    'choice',
+    'selection',
+    'decision',
+    'action',
+    'activity',
+    'behavior',
+    'process',
+    'procedure',
+    'routine',
+    'task',
+    'job',
+    'mission',
+    'goal',
+    'objective',
+    'aim',
+    'purpose',
+    'intention',
+    'motivation',
+    'reason',
+    'cause',
+    'explanation',
+    'interpretation',
+    'understanding',
+    'insight',
+    'knowledge',
+    'information',
+    'data',
+    'evidence',
+    'fact',
+    'truth',
+    'reality',
+    'world',
+    'universe',
+    'nature',
+    'life',
+    'human',
+    'person',
+    'people',
+    'user',
+    'customer',
+    'client',
+    'consumer',
+    'participant',
+    'observer',
+    'annotator',
+    'worker',
+    'agent',
+    'actor',
+    'player',
+    'partner',
+    'collaborator',
+    'competitor',
+    'adversary',
+    'attacker',
+    'defender',
+    'learner',
+    'teacher',
+    'student',
+    'expert',
+    'novice',
+    'beginner',
+    'professional',
+    'practitioner',
+    'researcher',
+    'scientist',
+    'engineer',
+    'developer',
+    'designer',
+    'architect',
+    'manager',
+    'leader',
+    'director',
+    'supervisor',
+    'administrator',
+    'organizer',
+    'coordinator',
+    'facilitator',
+    'mediator',
+    'arbitrator',
+    'judge',
+    'reviewer',
+    'critic',
+    'editor',
+    'publisher',
+    'author',
+    'writer',
+    'reader',
+    'viewer',
+    'listener',
+    'speaker',
+    'presenter',
+    'audience',
+    'crowd',
+    'group',
+    'team',
+    'community',
+    'society',
+    'organization',
+    'institution',
+    'institute',
+    'center',
+    'laboratory',
+    'department',
+    'division',
+    'section',
+    'branch',
+    'unit',
+    'sector',
+    'industry',
+    'market',
+    'economy',
+    'business',
+    'company',
+    'corporation',
+    'firm',
+    'enterprise',
+    'startup',
+    'agency',
+    'bureau',
+    'office',
+    'studio',
+    'workshop',
+    'factory',
+    'plant',
+    'facility',
+    'station',
+    'base',
+    'camp',
+    'site',
+    'location',
+    'place',
+    'area',
+    'region',
+    'zone',
+    'district',
+    'territory',
+    'country',
+    'nation',
+    'state',
+    'city',
+    'town',
+    'village',
+    'neighborhood',
+    'street',
+    'road',
+    'path',
+    'way',
+    'route',
+    'track',
+    'lane',
+    'channel',
+    'corridor',
+    'bridge',
+    'tunnel',
+    'gateway',
+    'portal',
+    'interface',
+    'boundary',
+    'border',
+    'edge',
+    'limit',
+    'margin',
+    'threshold',
+    'level',
+    'degree',
+    'extent',
+    'scope',
+    'range',
+    'scale',
+    'magnitude',
+    'dimension',
+    'size',
+    'volume',
+    'capacity',
+    'quantity',
+    'amount',
+    'number',
+    'count',
+    'frequency',
+    'rate',
+    'ratio',
+    'percentage',
+    'proportion',
+    'fraction',
+    'part',
+    'share',
+    'slice',
+    'piece',
+    'segment',
+    'section',
+    'fragment',
+    'bit',
+    'byte',
+    'pixel',
+    'voxel',
+    'point',
+    'line',
+    'curve',
+    'surface',
+    'plane',
+    'shape',
+    'form',
+    'pattern',
+    'texture',
+    'color',
+    'tone',
+    'shade',
+    'hue',
+    'brightness',
+    'contrast',
+    'saturation',
+    'intensity',
+    'luminance',
+    'illuminance',
+    'radiance',
+    'reflectance',
+    'transmittance',
+    'absorbance',
+    'scattering',
+    'diffraction',
+    'refraction',
+    'interference',
+    'polarization',
+    'dispersion',
+    'aberration',
+    'distortion',
+    'noise',
+    'blur',
+    'artifact',
+    'occlusion',
+    'shadow',
+    'reflection',
+    'specularity',
+    'highlight',
+    'glare',
+    'transparency',
+    'opacity',
+    'visibility',
+    'clarity',
+    'sharpness',
+    'focus',
+    'resolution',
+    'quality',
+    'fidelity',
+    'accuracy',
+    'precision',
+    'recall',
+    'sensitivity',
+    'specificity',
+    'reliability',
+    'validity',
+    'consistency',
+    'stability',
+    'robustness',
+    'efficiency',
+    'effectiveness',
+    'performance',
+    'speed',
+    'latency',
+    'throughput',
+    'bandwidth',
+    'storage',
+    'memory',
+    'compute',
+    'power',
+    'energy',
+    'cost',
+    'price',
+    'value',
+    'benefit',
+    'profit',
+    'revenue',
+    'income',
+    'budget',
+    'fund',
+    'grant',
+    'award',
+    'prize',
+    'honor',
+    'recognition',
+    'citation',
+    'reference',
+    'bibliography',
+    'appendix',
+    'supplement',
+    'material',
+    'code',
+    'software',
+    'data',
+    'dataset',
+    'model',
+    'network',
+    'system',
+    'method',
+    'algorithm',
+    'technique',
+    'approach',
+    'framework',
+    'pipeline',
+    'workflow',
+    'process',
+    'procedure',
+    'protocol',
+    'standard',
+    'policy',
+    'strategy',
+    'plan',
+    'project',
+    'program',
+    'initiative',
+    'campaign',
+    'movement',
+    'trend',
+    'direction',
+    'future',
+    'vision',
+    'mission',
+    'goal',
+    'objective',
+    'aim',
+    'target',
+    'purpose'
+}
+
+CONCEPT_BLACKLIST = {
+    "computer vision",
+    "artificial intelligence",
+    "pattern recognition",
+    "responsible ai"
+}
+
+LATEX_INLINE_PATTERN = re.compile(r"\$[^$]+\$")
+LATEX_ENV_PATTERN = re.compile(r"\\begin\{[^}]+\}.*?\\end\{[^}]+\}", re.DOTALL)
+LATEX_CMD_PATTERN = re.compile(
+    r"\\(?:cite|ref|eqref|mathbf|mathrm|textit|emph)\{[^}]*\}")
+GENERIC_CMD_PATTERN = re.compile(r"\\[a-zA-Z]+")
+NON_ALPHA_PATTERN = re.compile(r"[^a-z0-9\+\-\s]")
+PAREN_STRIP_PATTERN = re.compile(r"\([^)]*\)")
+
+COMMON_STOPWORDS = {
+    'the', 'and', 'for', 'with', 'that', 'have', 'this', 'from', 'been', 'into',
+    'using', 'their', 'these', 'those', 'between', 'within', 'without', 'through',
+    'towards', 'toward', 'upon', 'while', 'where', 'when', 'which', 'such', 'than',
+    'also', 'however', 'therefore', 'overall', 'well', 'both', 'each', 'most',
+    'more', 'many', 'much', 'can', 'could', 'would', 'should', 'may', 'might',
+    'our', 'are', 'is', 'was', 'were', 'be', 'has', 'had', 'do', 'does', 'did', 'but',
+    'not', 'only', 'all', 'any', 'some', 'other', 'its', 'it', 'time', 'domain', 'year',
+    'years', 'two', 'new', 'one', 'use', 'used', 'using', 'research', 'review', 'machine',
+    'prediction', 'predict', 'predicting',
+    'feature', 'features', 'algorithm', 'algorithms', 'challenge', 'challenges',
+    'noise', 'human', 'image', 'images', 'visual', 'vision', 'performance', 'method',
+    'methods', 'proposed', 'approach', 'framework', 'system', 'study', 'analysis',
+    'evaluation', 'experiment', 'experiments', 'experimental', 'result', 'results',
+    'state-of-the-art', 'sota', 'dataset', 'datasets', 'benchmark', 'benchmarks',
+    'novel', 'new', 'paper', 'work', 'research', 'review', 'survey', 'overview',
+    'comprehensive', 'recent', 'advance', 'advances', 'trend', 'trends',
+    'problem', 'problems', 'solution', 'solutions', 'application', 'applications',
+    'technique', 'techniques', 'strategy', 'strategies', 'scheme', 'schemes',
+    'mechanism', 'mechanisms', 'model', 'models', 'network', 'networks',
+    'architecture', 'architectures', 'structure', 'structures', 'design', 'designs',
+    'learning', 'training', 'testing', 'validation', 'inference',
+    'deep', 'neural', 'machine', 'artificial', 'intelligence', 'computer',
+    'task', 'tasks', 'capability', 'capabilities', 'quality', 'improvement',
+    'accuracy', 'efficiency', 'robustness', 'generalization', 'complexity',
+    'parameter', 'parameters', 'component', 'components', 'module', 'modules',
+    'layer', 'layers', 'block', 'blocks', 'unit', 'units', 'input', 'output',
+    'representation', 'representations', 'information', 'context', 'content',
+    'detail', 'details', 'object', 'objects', 'scene', 'scenes', 'video', 'videos',
+    'sample', 'samples', 'example', 'examples', 'instance', 'instances',
+    'level', 'scale', 'resolution', 'size', 'speed', 'rate', 'time', 'real-time',
+    'based', 'high', 'low', 'large', 'small', 'simple', 'complex',
+    'fast', 'slow', 'strong', 'weak', 'good', 'bad', 'best', 'better',
+    'multi', 'single', 'cross', 'joint', 'dual', 'hybrid', 'hierarchical',
+    'global', 'local', 'spatial', 'temporal', 'spatiotemporal',
+    'end', 'pipeline', 'stage', 'step', 'phase',
+    'prior', 'post', 'pre', 're', 'non', 'semi', 'un', 'self',
+    'supervised', 'unsupervised', 'weakly', 'fully', 'different'
+}
+
+ACADEMIC_STOPWORDS = {
+    'paper', 'method', 'proposed', 'approach', 'results', 'performance',
+    'state-of-the-art', 'sota', 'using', 'based', 'model', 'network', 'algorithm',
+    'framework', 'novel', 'data', 'dataset', 'learning', 'deep', 'visual',
+    'computer', 'vision', 'image', 'images', 'task', 'tasks', 'efficient',
+    'robust', 'accurate', 'analysis', 'study', 'via', 'neural', 'networks',
+    'experiments', 'experimental', 'demonstrate', 'show', 'outperforms', 'existing',
+    'methods', 'problem', 'address', 'propose', 'presents', 'introduction',
+    'conclusion', 'abstract', 'training', 'trained', 'evaluation', 'benchmark',
+    'application', 'applications'
+}
+
+STOPWORDS = COMMON_STOPWORDS | ACADEMIC_STOPWORDS
+
+
+YEARLY_DOMINANT_MAP = {
+    2014: {"theme": "Two-Stage Detection (R-CNN)", "keywords": [r"r-cnn", r"rcnn", r"region-based", r"alexnet", r"vgg"]},
+    2015: {"theme": "CNN Backbones (ResNet)", "keywords": [r"resnet", r"residual network", r"residual learning", r"batch normalization"]},
+    2016: {"theme": "YOLO & Real-time Detection", "keywords": [r"yolo", r"ssd", r"real-time detection", r"faster r-cnn"]},
+    2017: {"theme": "CNN Architectures (DenseNet)", "keywords": [r"densenet", r"dense connection", r"feature pyramid", r"fpn"]},
+    2018: {"theme": "GANs & Image Synthesis", "keywords": [r"gan", r"generative adversarial", r"pix2pix", r"cyclegan"]},
+    2019: {"theme": "Self-Supervised Learning", "keywords": [r"self-supervised", r"contrastive learning", r"moco", r"simclr", r"efficientnet"]},
+    2020: {"theme": "Vision Transformer (ViT)", "keywords": [r"vit", r"vision transformer", r"dosovitskiy", r"detr", r"nerf"]},
+    2021: {"theme": "Transformer Dominance (Swin)", "keywords": [r"transformer", r"swin", r"mae", r"clip"]},
+    2022: {"theme": "Diffusion Models", "keywords": [r"diffusion model", r"stable diffusion", r"latent diffusion", r"ddpm", r"imagen"]},
+    2023: {"theme": "Segmentation (SAM)", "keywords": [r"segment anything", r"sam", r"foundation model", r"controlnet", r"generative", r"diffusion"]},
+    2024: {"theme": "Generative AI & LLMs", "keywords": [r"multimodal", r"large language", r"gpt", r"gemini", r"vlm", r"llava", r"sora", r"generative", r"diffusion", r"autonomous", r"robotics", r"yolo", r"real-time"]}
+}
+
+
+class CategoryMatcher:
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self._patterns = None
+
+    @property
+    def patterns(self):
+        # Compiled on first use so importing the taxonomy stays cheap.
+        if self._patterns is None:
+            compiled = {}
+            for category, regex_list in self.definitions.items():
+                combined = "|".join(f"(?:{pattern})" for pattern in regex_list)
+                compiled[category] = re.compile(combined, re.IGNORECASE)
+            self._patterns = compiled
+        return self._patterns
+
+    def find_matches(self, text):
+        profile_count("matcher_calls")
+        if not text:
+            return set()
+        return {category for category, pattern in self.patterns.items() if pattern.search(text)}
+
+
+PROBLEM_MATCHER = CategoryMatcher(PROBLEM_DEFINITIONS)
+METHOD_MATCHER = CategoryMatcher(METHOD_DEFINITIONS)
+TOPIC_MATCHER = CategoryMatcher(SEMANTIC_TOPIC_DEFINITIONS)
+PRIMARY_TOPIC_MATCHER = CategoryMatcher(CANONICAL_TOPIC_DEFINITIONS)
+
+
+STRICT_CONCEPT_WHITELIST = {
+    # Architectures & Models
+    "cnn", "convnet", "resnet", "densenet", "efficientnet", "vgg", "mobilenet", "inception", "xception",
+    "transformer", "vision transformer", "vit", "swin", "detr", "bert", "gpt", "clip", "t5", "mae",
+    "gan", "stylegan", "cyclegan", "pix2pix", "biggan", "vae", "vq-vae",
+    "diffusion", "ddpm", "ldm", "stable diffusion", "controlnet", "lora",
+    "nerf", "gaussian splatting", "3d gaussian splatting", "instant ngp",
+    "rnn", "lstm", "gru",
+    "gnn", "gcn", "gat", "pointnet", "pointnet++", "unet", "fpn", "mask r-cnn", "faster r-cnn", "yolo", "ssd",
+    "mlp", "mlp-mixer",
+
+    # Core Mechanisms
+    "attention", "self-attention", "cross-attention", "convolution",
+    "contrastive learning", "self-supervised learning", "representation learning",
+    "reinforcement learning", "transfer learning", "domain adaptation", "knowledge distillation",
+    "few-shot learning", "zero-shot learning", "meta-learning", "active learning",
+    "federated learning", "continual learning", "incremental learning",
+    "generative", "adversarial", "discriminative", "probabilistic", "bayesian",
+
+    # Tasks
+    "object detection", "semantic segmentation", "instance segmentation", "panoptic segmentation",
+    "image classification", "action recognition", "pose estimation", "depth estimation",
+    "optical flow", "visual tracking", "object tracking", "mot",
+    "image captioning", "vqa", "visual question answering", "text-to-image", "image-to-text",
+    "super-resolution", "denoising", "inpainting", "deblurring", "image restoration",
+    "3d reconstruction", "view synthesis", "slam", "structure from motion",
+    "face recognition", "person re-identification", "pedestrian detection",
+    "anomaly detection", "salient object detection", "edge detection",
+    "medical imaging", "remote sensing", "autonomous driving", "robotics"
+}
+
+
+def normalize_phrase(text):
+    if not isinstance(text, str):
+        return ""
+    stripped = PAREN_STRIP_PATTERN.sub(" ", text)
+    lowered = stripped.lower()
+    lowered = re.sub(r"[\-_/:+]+", " ", lowered)
+    lowered = NON_ALPHA_PATTERN.sub(' ', lowered)
+    lowered = re.sub(r"\s+", " ", lowered)
+    return lowered.strip()
+
+
+def strip_latex_chunks(text):
+    if not isinstance(text, str):
+        return ""
+    cleaned = LATEX_ENV_PATTERN.sub(" ", text)
+    cleaned = LATEX_INLINE_PATTERN.sub(" ", cleaned)
+    cleaned = LATEX_CMD_PATTERN.sub(" ", cleaned)
+    cleaned = GENERIC_CMD_PATTERN.sub(" ", cleaned)
+    cleaned = cleaned.replace('{', ' ').replace('}', ' ')
+    return cleaned
+
+
+def clean_academic_text(text):
+    cleaned = strip_latex_chunks(text)
+    lowered = cleaned.lower()
+    lowered = NON_ALPHA_PATTERN.sub(' ', lowered)
+    tokens = [tok for tok in lowered.split()
+              if tok and tok not in STOPWORDS and len(tok) > 2]
+    return " ".join(tokens)
+
+
+def prettify_concept(term):
+    if term is None:
+        return ""
+    text = PAREN_STRIP_PATTERN.sub(" ", str(term))
+    text = text.replace("_", " ").strip()
+    text = re.sub(r"\s+", " ", text)
+    if not text:
+        return ""
+    tokens = text.split()
+    formatted = []
+    for token in tokens:
+        if token.isupper() or any(ch.isdigit() for ch in token):
+            formatted.append(token.upper())
+        else:
+            formatted.append(token.capitalize())
+    return " ".join(formatted)
+
+
+@lru_cache(maxsize=None)
+def semantic_topic_patterns():
+    return tuple(
+        re.compile("|".join(pattern_list), re.IGNORECASE)
+        for pattern_list in SEMANTIC_TOPIC_DEFINITIONS.values()
+    )
+
+
+def is_meaningful_concept(term):
+    if term is None:
+        return False
+    raw_text = str(term)
+    if "(" in raw_text or ")" in raw_text:
+        return False
+    normalized = normalize_phrase(raw_text)
+    if not normalized:
+        return False
+
+    # Strict whitelist check
+    if normalized not in STRICT_CONCEPT_WHITELIST:
+        # Allow if it matches any of the semantic topic definitions regexes
+        if not any(pattern.search(normalized) for pattern in semantic_topic_patterns()):
+            return False
+
+    if normalized in CONCEPT_BLACKLIST:
+        return False
+    if normalized in GENERIC_CONCEPTS:
+        return False
+    if normalized in LOW_VALUE_TERMS:
+        return False
+    tokens = normalized.split()
+    if not tokens:
+        return False
+    if len(tokens) == 1 and (tokens[0] in GENERIC_CONCEPT_TOKENS or len(tokens[0]) <= 2):
+        return False
+    if all(tok in GENERIC_CONCEPT_TOKENS for tok in tokens):
+        return False
+    return True
+
+
+CONCEPT_START_YEAR = {
+    "Transformer": 2017,
+    "Vision Transformer": 2020,
+    "Vision Transformer (ViT)": 2020,
+    "Diffusion": 2019,
+    "Diffusion Models": 2019,
+    "NeRF": 2020,
+    "NeRF & Neural Fields": 2020,
+    "CLIP": 2021,
+    "Multimodal Alignment (CLIP)": 2021,
+    "Swin": 2021,
+    "MAE": 2021,
+    "Self-Supervised Learning": 2019,
+    "DETR": 2020,
+    "DETR & Object Queries": 2020,
+    "Large Vision-Language Models": 2022,
+    "SAM": 2023,
+    # U-Net 2015, SAM 2023. This is a mixed category.
+    "Segmentation (SAM & U-Net)": 2015,
+    "YOLO": 2016,
+    "Object Detection": 2014,
+    "R-CNN": 2014,
+    "GAN": 2014,
+    "GANs & Image Synthesis": 2014,
+    "ResNet": 2015,
+    "CNN Backbones": 2012,
+    "CNN Architectures": 2012,
+    "Video & Motion": 2010,
+    "3D Reconstruction & SLAM": 2010,
+    "Contrastive": 2019
+}
+
+CONCEPT_END_YEAR = {
+    "Rnn": 2021,
+    "Lstm": 2021,
+    "Gru": 2021
+}
+
+TERM_HIERARCHY = {
+    "Object Detection": {"YOLO", "R-CNN", "DETR", "Detection", "DETR & Object Queries"},
+    "Detection": {"YOLO", "R-CNN", "DETR", "Object Detection"},
+    "Recognition": {"Face Recognition", "Action Recognition", "Re-Identification", "Image Classification"},
+    "Cnn": {"ResNet", "VGG", "EfficientNet", "CNN Backbones", "CNN Architectures"},
+    "Transformer": {"ViT", "Swin", "DETR", "Vision Transformer (ViT)", "Vision Transformer"},
+    "Generation": {"GAN", "Diffusion", "GANs & Image Synthesis", "Diffusion Models"},
+    "Segmentation": {"Segmentation (SAM & U-Net)", "Semantic Segmentation", "Instance Segmentation"},
+}
+
+ERA_SPECIFIC_WHITELIST = {
+    "2010-2012": {
+        "SIFT", "HOG", "SVM", "DPM", "Sparse Coding", "BoW", "GIST", "Deformable Part Models",
+        "Optical Flow", "Tracking", "Segmentation", "Detection", "Face Recognition", "Action Recognition",
+        "Object Detection", "Image Classification", "Machine Learning", "Pattern Recognition", "Clustering",
+        "Super-Resolution", "Denoising", "Inpainting", "Restoration", "Image Restoration"
+    },
+    "2013-2015": {
+        "CNN", "AlexNet", "VGG", "R-CNN", "Dropout", "ReLU", "SPP-net", "Fast R-CNN", "OverFeat",
+        "GoogLeNet", "Inception", "Deep Learning", "Convolutional Neural Network", "Detection", "Segmentation",
+        "Transfer Learning", "Fine-tuning", "Data Augmentation", "Optimization", "Neural Network",
+        "Recurrent Neural Network", "RNN", "LSTM"
+    },
+    "2016-2018": {
+        "ResNet", "YOLO", "Faster R-CNN", "SSD", "GAN", "DCGAN", "CycleGAN", "Pix2Pix",
+        "Mask R-CNN", "DenseNet", "MobileNet", "RetinaNet", "FPN", "LSTM", "RNN", "GRU", "Attention",
+        "Semantic Segmentation", "Instance Segmentation"
+    },
+    "2019-2021": {
+        "ViT", "Vision Transformer", "Transformer", "DETR", "EfficientNet", "Swin Transformer", "NeRF",
+        "Self-Supervised Learning", "Contrastive Learning", "SimCLR", "MoCo", "CLIP", "PointNet",
+        "GNN", "Graph Neural Network", "NAS", "AutoML", "Knowledge Distillation", "Domain Adaptation"
+    },
+    "2022-2025": {
+        "Diffusion", "Diffusion Models", "Stable Diffusion", "Latent Diffusion", "DDPM", "Generative AI",
+        "LLM", "Large Language Model", "Multimodal", "Vision-Language Model", "VLM", "CLIP",
+        "BLIP", "LLaVA", "SAM", "Segment Anything", "Gaussian Splatting", "3D Gaussian Splatting",
+        "YOLOv8", "YOLOv9", "YOLOv10", "BEV", "Occupancy Network", "Foundation Model", "LoRA", "ControlNet",
+        "Sora", "Gemini", "GPT-4", "Prompt Engineering", "Zero-Shot", "Few-Shot", "Transformer", "Generative"
+    }
+}
+
+
+def get_allowed_concepts_for_year(year):
+    if not year:
+        return set()
+    allowed = set()
+
+    # Always allow core tasks if they are not superseded (but we handle superseding via TERM_HIERARCHY)
+    # Actually, let's just use the era whitelist + strict global whitelist
+    # But we need to make sure we don't block "Detection" in 2024 if it's not redundant.
+    # The user wants "High Quality" keywords.
+
+    # Cumulative approach? No, strictly era-based is safer to avoid "RNN" in 2024.
+    # But "CNN" is still relevant in 2024.
+    # So we should allow previous eras' terms *unless* they are explicitly deprecated.
+
+    # Better approach:
+    # 1. Start with concepts from current era.
+    # 2. Add concepts from *previous* eras (accumulated).
+    # 3. Remove concepts in CONCEPT_END_YEAR if year > end_year.
+
+    ranges = [
+        (2010, 2012), (2013, 2015), (2016, 2018), (2019, 2021), (2022, 2025)
+    ]
+
+    for start, end in ranges:
+        if start <= year:  # If this era has started by `year`
+            key = f"{start}-{end}"
+            if key in ERA_SPECIFIC_WHITELIST:
+                allowed.update(ERA_SPECIFIC_WHITELIST[key])
+
+    return allowed
+
+
+def summary_concepts(concepts, year):
+    """(normalized, label) pairs of `concepts` that count towards the yearly keyword stats.
+
+    Applies the same filters as summary.json: meaningful concept, era whitelist
+    for `year`, and the concept's start/end years.
+    """
+    accepted = []
+    for concept in concepts:
+        pair = _summary_concept(str(concept), year)
+        if pair:
+            accepted.append(pair)
+    return accepted
+
+
+@lru_cache(maxsize=None)
+def _allowed_concept_keys(year):
+    return frozenset(normalize_phrase(a) for a in get_allowed_concepts_for_year(year))
+
+
+@lru_cache(maxsize=None)
+def _summary_concept(concept, year):
+    # 概念词表很小而论文很多，按 (concept, year) 缓存判定结果
+    if not is_meaningful_concept(concept):
+        return None
+    normalized = normalize_phrase(concept)
+    if not normalized:
+        return None
+
+    pretty = prettify_concept(concept) or concept
+    allowed_keys = _allowed_concept_keys(year)
+    if allowed_keys and normalize_phrase(pretty) not in allowed_keys:
+        return None
+    start_year = CONCEPT_START_YEAR.get(pretty)
+    end_year = CONCEPT_END_YEAR.get(pretty)
+    if start_year and year < start_year:
+        return None
+    if end_year and year > end_year:
+        return None
+    return normalized, pretty
+
+
+def pick_field(record, alias_key, default=None):
+    for key in FIELD_ALIASES.get(alias_key, (alias_key,)):
+        if key in record and record[key] not in (None, ""):
+            return record[key]
+    return default
+
+
+def normalize_year(value):
+    if value is None:
+        return None
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+def normalize_citations(value):
+    if value is None:
+        return 0
+    try:
+        return int(float(value))
+    except ValueError:
+        return 0
+
+
+def ensure_list(value):
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [v for v in value if v]
+    if isinstance(value, str):
+        parts = re.split(r"[;,/]", value)
+        return [p.strip() for p in parts if p.strip()]
+    return []
+
+
+def build_text_blob(paper):
+    parts = []
+    for alias in ("title", "abstract"):
+        value = pick_field(paper, alias, "")
+        if isinstance(value, str):
+            parts.append(value)
+    concept_list = ensure_list(pick_field(paper, "concepts", []))
+    if concept_list:
+        parts.append(" ".join(concept_list))
+    combined = " ".join(parts)
+    return clean_academic_text(combined)
+
+
+def select_canonical_semantic(text, fallback=None):
+    if not isinstance(text, str):
+        text = ""
+    matches = PRIMARY_TOPIC_MATCHER.find_matches(text)
+    if matches:
+        ordered = sorted(
+            matches,
+            key=lambda name: (
+                CANONICAL_TOPIC_PRIORITY.get(name, 1), len(name)),
+            reverse=True
+        )
+        return ordered[0]
+    if fallback:
+        formatted = prettify_concept(fallback)
+        if formatted:
+            return formatted
+    return DEFAULT_PRIMARY_SEMANTIC
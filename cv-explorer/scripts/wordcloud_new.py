@@ -2,6 +2,8 @@ import json
 from collections import Counter
 import re
 
+from keyword_cube import write_keyword_cube
+
 # 1. 极其严格的停用词表（增加学术泛泛词）
 ACADEMIC_STOPWORDS = {
     'computer science', 'artificial intelligence', 'computer vision', 'paper', 'method',
@@ -42,33 +44,48 @@ def normalize_weight(value, min_weight=1):
     return max(min_weight, int(round(value)))
 
 
+def keyword_hits(p):
+    """(关键词, 引用加权分) 列表；同一论文里的关键词可能重复出现。"""
+    citations = p.get('c', 0) + 1
+    hits = []
+
+    # 策略 A：从 Concepts 提取 (过滤高层级词汇)
+    for concept in p.get('con', []):
+        cleaned = re.sub(r'\s*\(.*\)', '', concept.lower()).strip()
+        if len(cleaned) > 3 and cleaned not in ACADEMIC_STOPWORDS:
+            # 降低极其宽泛词汇的权重，提升细分词汇
+            hits.append((cleaned, normalize_weight(citations * 0.5)))
+
+    # 策略 B：从标题中强行提取 (高权重)
+    for tech in extract_tech_from_title(p.get('t', '')):
+        # 标题出现的词权重加倍
+        hits.append((tech, normalize_weight(citations * 2.0)))
+    return hits
+
+
 def prepare_wordcloud_data_v2(input_file):
     with open(input_file, "r", encoding="utf-8") as f:
         papers = json.load(f)
 
     yearly_keywords = {}
+    # 关键词 × 年份的 [出现次数, 引用加权分]，写入 keyword_cube.bin 供任意年份区间查询
+    cube_cells = {}
 
     for p in papers:
         year = str(p['y'])
-        citations = p.get('c', 0) + 1
-        title = p.get('t', '')
-
         if year not in yearly_keywords:
             yearly_keywords[year] = Counter()
 
-        # 策略 A：从 Concepts 提取 (过滤高层级词汇)
-        for concept in p.get('con', []):
-            cleaned = re.sub(r'\s*\(.*\)', '', concept.lower()).strip()
-            if len(cleaned) > 3 and cleaned not in ACADEMIC_STOPWORDS:
-                # 降低极其宽泛词汇的权重，提升细分词汇
-                weight = normalize_weight(citations * 0.5)
-                yearly_keywords[year][cleaned] += weight
+        hits = keyword_hits(p)
+        for keyword, weight in hits:
+            yearly_keywords[year][keyword] += weight
 
-        # 策略 B：从标题中强行提取 (高权重)
-        tech_hits = extract_tech_from_title(title)
-        for tech in tech_hits:
-            # 标题出现的词权重加倍
-            yearly_keywords[year][tech] += normalize_weight(citations * 2.0)
+        if isinstance(p['y'], int):
+            year_cells = cube_cells.setdefault(p['y'], {})
+            for keyword, weight in hits:
+                cell = year_cells.setdefault(keyword, [0, 0])
+                cell[0] += 1
+                cell[1] += weight
 
     # 格式化数据
     formatted_data = {}
@@ -80,6 +97,7 @@ def prepare_wordcloud_data_v2(input_file):
 
     with open("../data/wordcloud_data.json", "w", encoding="utf-8") as f:
         json.dump(formatted_data, f, ensure_ascii=False, indent=4)
+    write_keyword_cube("../data/keyword_cube.bin", cube_cells)
     print("词云数据深度提取完成！")
 
 
@@ -0,0 +1,191 @@
+"""Per-year shards of the pipeline outputs plus a manifest for lazy loading.
+
+Layout under the data directory:
+
+    shards/manifest.json
+    shards/landscape/2014.json   shards/landscape/2014.bin   ...
+    shards/sankey/2014.json      ...
+
+Records without a usable year go to an `unknown` shard. The manifest lists
+every shard with its record count, byte size and sha256, so the frontend can
+fetch a single year (cache-busted by hash) and see which years exist without
+downloading them:
+
+    {
+      "version": 1,
+      "datasets": {
+        "landscape": {
+          "years": [2014, ...],
+          "records": 3300,
+          "bounds": {"x": [min, max], "y": [min, max], "citations": [min, max]},
+          "venues": ["CVPR", ...],
+          "shards": [
+            {"year": 2014, "records": 300, "files": {
+              "json": {"path": "landscape/2014.json", "bytes": 95012, "sha256": "..."},
+              "bin": {...}}}
+          ]
+        },
+        "sankey": {...}
+      }
+    }
+
+Paths are relative to the manifest's own directory.
+"""
+
+import hashlib
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from landscape_binary import encode_landscape
+from publish import is_compressed_sibling, publish_bytes
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+UNKNOWN_YEAR = "unknown"
+
+# dataset name -> {extension: encoder(records) -> bytes}
+SHARD_FORMATS = {
+    "landscape": {"bin": encode_landscape},
+}
+
+
+def _json_bytes(records):
+    return json.dumps(records, ensure_ascii=False).encode("utf-8")
+
+
+def _shard_year(record):
+    try:
+        return int(record.get("year"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _extent(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return [min(values), max(values)]
+
+
+def split_by_year(records):
+    buckets = defaultdict(list)
+    for record in records:
+        buckets[_shard_year(record)].append(record)
+    return buckets
+
+
+def _dataset_summary(records):
+    """Whole-dataset facts the views need before every shard is loaded."""
+    summary = {}
+    for axis in ("x", "y", "citations"):
+        extent = _extent([r.get(axis) for r in records if isinstance(r.get(axis), (int, float))])
+        if extent is not None:
+            summary.setdefault("bounds", {})[axis] = extent
+    venues = sorted({r.get("venue") for r in records if r.get("venue")})
+    if venues:
+        summary["venues"] = venues
+    return summary
+
+
+def write_dataset_shards(shard_root, name, records, formats=None):
+    formats = {"json": _json_bytes, **(formats or {})}
+    dataset_dir = Path(shard_root) / name
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+
+    buckets = split_by_year(records)
+    ordered_years = sorted((y for y in buckets if y is not None))
+    if None in buckets:
+        ordered_years.append(None)
+
+    shards = []
+    written = set()
+    for year in ordered_years:
+        stem = UNKNOWN_YEAR if year is None else str(year)
+        files = {}
+        for extension, encoder in formats.items():
+            payload = encoder(buckets[year])
+            path = dataset_dir / f"{stem}.{extension}"
+            publish_bytes(path, payload)
+            written.add(path.name)
+            files[extension] = {
+                "path": f"{name}/{path.name}",
+                "bytes": len(payload),
+                "sha256": hashlib.sha256(payload).hexdigest(),
+            }
+        shards.append({"year": year, "records": len(buckets[year]), "files": files})
+
+    # 删除上一次运行遗留、本次不再产生的分片
+    for stale in dataset_dir.iterdir():
+        base = stale.stem if is_compressed_sibling(stale) else stale.name
+        if stale.is_file() and base not in written:
+            stale.unlink()
+
+    entry = {
+        "years": [y for y in ordered_years if y is not None],
+        "records": len(records),
+        **_dataset_summary(records),
+        "shards": shards,
+    }
+    return entry
+
+
+def write_year_shards(shard_root, datasets):
+    """Shard each `{name: records}` dataset by year and write the manifest."""
+    shard_root = Path(shard_root)
+    shard_root.mkdir(parents=True, exist_ok=True)
+    manifest = {"version": MANIFEST_VERSION, "datasets": {}}
+    for name, records in datasets.items():
+        manifest["datasets"][name] = write_dataset_shards(
+            shard_root, name, records, SHARD_FORMATS.get(name))
+    manifest_path = shard_root / MANIFEST_NAME
+    publish_bytes(
+        manifest_path,
+        json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    return manifest_path
+
+
+def load_manifest(path):
+    with Path(path).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def manifest_files(manifest):
+    """Relative paths of every shard file listed in a manifest."""
+    for dataset in manifest.get("datasets", {}).values():
+        for shard in dataset.get("shards", []):
+            for meta in shard.get("files", {}).values():
+                yield meta["path"]
+
+
+def verify_shards(manifest_path):
+    """Return the shard paths whose size or sha256 differs from the manifest."""
+    manifest_path = Path(manifest_path)
+    manifest = load_manifest(manifest_path)
+    mismatched = []
+    for dataset in manifest.get("datasets", {}).values():
+        for shard in dataset.get("shards", []):
+            for meta in shard.get("files", {}).values():
+                path = manifest_path.parent / meta["path"]
+                if not path.exists():
+                    mismatched.append(meta["path"])
+                    continue
+                payload = path.read_bytes()
+                if len(payload) != meta["bytes"] or hashlib.sha256(payload).hexdigest() != meta["sha256"]:
+                    mismatched.append(meta["path"])
+    return mismatched
+
+
+if __name__ == "__main__":
+    data_dir = Path(sys.argv[1] if len(sys.argv) > 1 else "data")
+    datasets = {}
+    for name in ("landscape", "sankey"):
+        with (data_dir / f"{name}_data.json").open("r", encoding="utf-8") as f:
+            datasets[name] = json.load(f)
+    manifest_path = write_year_shards(data_dir / "shards", datasets)
+    manifest = load_manifest(manifest_path)
+    for name, entry in manifest["datasets"].items():
+        total = sum(meta["bytes"] for shard in entry["shards"] for meta in shard["files"].values())
+        print(f"{name}: {len(entry['shards'])} shards, {entry['records']} records, {total} B")
+    print(f"manifest -> {manifest_path}")
@@ -0,0 +1,44 @@
+// web/src/insight_store.js
+// Precomputed AI panel insights (scripts/precompute_insights.py). Entries are
+// keyed by sha256(`${prompt_type}\n${variant}\n${normalized text}`)[:16], so a
+// hit answers the AI panel without a round trip to /api/analyze.
+
+export class InsightStore {
+    constructor(payload) {
+        this.entries = payload.entries || {};
+    }
+
+    static async load(paths = []) {
+        // crypto.subtle 仅在安全上下文（https / localhost）可用，否则直接走后端
+        if (!globalThis.crypto?.subtle) return null;
+        for (const candidate of paths) {
+            try {
+                const payload = await d3.json(candidate);
+                if (payload?.entries) {
+                    console.info(`[Data] 预计算 AI 洞察加载成功 (${candidate}, ${Object.keys(payload.entries).length} 条)`);
+                    return new InsightStore(payload);
+                }
+            } catch (error) {
+                console.info(`[Data] 未找到预计算 AI 洞察 (${candidate})`);
+            }
+        }
+        return null;
+    }
+
+    static async key(promptType, text, variant = '') {
+        const normalized = String(text || '').trim().split(/\s+/).join(' ').toLowerCase();
+        const bytes = new TextEncoder().encode(`${promptType || ''}\n${variant}\n${normalized}`);
+        const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', bytes));
+        return Array.from(digest.slice(0, 8), byte => byte.toString(16).padStart(2, '0')).join('');
+    }
+
+    // Entry for an AI panel selection, or null. Untyped landscape papers fall back to their paper_impact entry.
+    async lookup(payload) {
+        const text = payload.title || payload.label;
+        if (!text) return null;
+        const promptType = payload.prompt_type || (payload.citations != null ? 'paper_impact' : null);
+        if (!promptType) return null;
+        const variant = promptType === 'scholar_profile' && payload.leaderboardView === 'nankai' ? 'nankai' : '';
+        return this.entries[await InsightStore.key(promptType, text, variant)] || null;
+    }
+}
@@ -0,0 +1,106 @@
+// web/src/landscape_binary.js
+// Reader for landscape_data.bin (CVLB v1). The byte layout is documented in
+// scripts/landscape_binary.py; numeric columns are exposed as typed-array
+// views over the fetched buffer, so no per-record JSON parsing happens.
+
+const MAGIC = 'CVLB';
+const SUPPORTED_VERSION = 1;
+const NULL_CODE = 0xFFFF;
+const QUANT_MAX = 0xFFFF;
+const ARRAY_TYPES = {
+    uint8: Uint8Array,
+    uint16: Uint16Array,
+    uint32: Uint32Array
+};
+
+const isLittleEndianHost = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+
+export function decodeLandscapeBinary(buffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== MAGIC) {
+        throw new Error('landscape_data.bin 格式错误 (magic)');
+    }
+    const version = view.getUint16(4, true);
+    if (version !== SUPPORTED_VERSION) {
+        throw new Error(`不支持的 landscape 二进制版本: ${version}`);
+    }
+    if (!isLittleEndianHost) {
+        throw new Error('当前平台为大端字节序，回退至 JSON');
+    }
+
+    const count = view.getUint32(8, true);
+    const headerLength = view.getUint32(12, true);
+    const decoder = new TextDecoder('utf-8');
+    const header = JSON.parse(decoder.decode(new Uint8Array(buffer, 16, headerLength)));
+
+    const columns = {};
+    header.columns.forEach(({ name, type, offset, length }) => {
+        columns[name] = new ARRAY_TYPES[type](buffer, offset, length);
+    });
+
+    const [xMin, xMax] = header.bounds.x;
+    const [yMin, yMax] = header.bounds.y;
+    const xs = new Float32Array(count);
+    const ys = new Float32Array(count);
+    const xStep = (xMax - xMin) / QUANT_MAX;
+    const yStep = (yMax - yMin) / QUANT_MAX;
+    for (let i = 0; i < count; i += 1) {
+        xs[i] = xMin + columns.x[i] * xStep;
+        ys[i] = yMin + columns.y[i] * yStep;
+    }
+
+    return {
+        count,
+        bounds: header.bounds,
+        dictionaries: header.dictionaries,
+        columns: { ...columns, x: xs, y: ys },
+        // String columns are NUL-terminated, so one decode + split yields every value.
+        decodeStrings: kind => {
+            const strings = decoder.decode(columns[`${kind}_bytes`]).split('\0');
+            strings.length = count;
+            return strings;
+        }
+    };
+}
+
+// Materialise the record objects the views expect (same shape as landscape_data.json).
+export function landscapeRecordsFromColumns(table) {
+    const { count, columns, dictionaries, decodeStrings } = table;
+    const concepts = dictionaries.concept;
+    const venues = dictionaries.venue;
+    const conceptOf = code => (code === NULL_CODE ? null : concepts[code]);
+    const ids = decodeStrings('id');
+    const titles = decodeStrings('title');
+    const records = new Array(count);
+    for (let i = 0; i < count; i += 1) {
+        const start = columns.concept_offsets[i];
+        const end = columns.concept_offsets[i + 1];
+        const paperConcepts = new Array(end - start);
+        for (let j = start; j < end; j += 1) {
+            paperConcepts[j - start] = concepts[columns.concept_ids[j]];
+        }
+        records[i] = {
+            id: ids[i],
+            title: titles[i],
+            year: columns.year[i] || null,
+            venue: venues[columns.venue[i]],
+            citations: columns.citations[i],
+            x: columns.x[i],
+            y: columns.y[i],
+            concepts: paperConcepts,
+            semantic_primary: conceptOf(columns.semantic_primary[i]),
+            semantic_cluster: conceptOf(columns.semantic_cluster[i])
+        };
+    }
+    return records;
+}
+
+export async function fetchLandscapeBinary(path) {
+    const response = await fetch(path);
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+    }
+    const table = decodeLandscapeBinary(await response.arrayBuffer());
+    return { table, records: landscapeRecordsFromColumns(table) };
+}
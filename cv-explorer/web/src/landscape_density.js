@@ -0,0 +1,114 @@
+// web/src/landscape_density.js
+// Precomputed density contours and semantic anchors (scripts/landscape_density.py).
+// One JSON per year scope is fetched on demand; rings are decoded into data
+// coordinates once per (scope, venue, bandwidth) and then only projected.
+
+export class LandscapeDensityStore {
+    constructor(index, baseUrl) {
+        this.index = index;
+        this.baseUrl = baseUrl;
+        this.scopes = new Map(); // scope -> payload
+        this.pending = new Set();
+        this.failed = new Set();
+        this.decoded = new Map(); // `${scope}|${venue}|${band}` -> [[Float32Array ring]] per threshold
+        this.listeners = new Set();
+        const { grid, bounds } = index;
+        this.cellX = (bounds.x[1] - bounds.x[0]) / grid;
+        this.cellY = (bounds.y[1] - bounds.y[0]) / grid;
+    }
+
+    static async load(paths = []) {
+        for (const candidate of paths) {
+            try {
+                const index = await d3.json(candidate);
+                if (index?.scopes) {
+                    console.info(`[Data] 密度等值线索引加载成功 (${candidate})`);
+                    return new LandscapeDensityStore(index, candidate.slice(0, candidate.lastIndexOf('/') + 1));
+                }
+            } catch (error) {
+                console.warn(`[Data] 密度等值线索引加载失败 (${candidate})`, error);
+            }
+        }
+        return null;
+    }
+
+    subscribe(listener) {
+        this.listeners.add(listener);
+        return () => this.listeners.delete(listener);
+    }
+
+    // Entry for (scope, venue) or null; a missing scope is fetched in the background.
+    entry(scope, venue) {
+        if (!this.index.scopes[scope]) return null;
+        const payload = this.scopes.get(scope);
+        if (!payload) {
+            this.request(scope);
+            return null;
+        }
+        return payload.venues[venue] ?? null;
+    }
+
+    // Nearest precomputed kernel width (log scale) to a width given as a fraction of the plane.
+    bandFor(fraction) {
+        const target = Math.log(Math.max(fraction, 1e-6));
+        let best = 0;
+        this.index.bandwidths.forEach((value, idx) => {
+            if (Math.abs(Math.log(value) - target) < Math.abs(Math.log(this.index.bandwidths[best]) - target)) {
+                best = idx;
+            }
+        });
+        return best;
+    }
+
+    contours(scope, venue, band) {
+        const key = `${scope}|${venue}|${band}`;
+        if (this.decoded.has(key)) return this.decoded.get(key);
+        const entry = this.entry(scope, venue);
+        if (!entry) return null;
+        const [x0] = this.index.bounds.x;
+        const [y0] = this.index.bounds.y;
+        const levels = entry.contours[band].map(rings => rings.map(encoded => {
+            const ring = new Float32Array(encoded.length);
+            let qx = 0;
+            let qy = 0;
+            for (let i = 0; i < encoded.length; i += 2) {
+                qx += encoded[i];
+                qy += encoded[i + 1];
+                ring[i] = x0 + (qx / 10 - 0.5) * this.cellX;
+                ring[i + 1] = y0 + (qy / 10 - 0.5) * this.cellY;
+            }
+            return ring;
+        }));
+        this.decoded.set(key, levels);
+        return levels;
+    }
+
+    // Anchors in the shape getSemanticAnchors returns, for a smoothing value in [0, 1].
+    anchors(scope, venue, smoothing, limit) {
+        const entry = this.entry(scope, venue);
+        if (!entry) return null;
+        const steps = this.index.smoothing_steps;
+        const step = Math.max(0, Math.min(steps - 1, Math.round(smoothing * (steps - 1))));
+        return entry.anchors.slice(0, limit).map(({ positions, ...anchor }) => ({
+            ...anchor,
+            x: positions[step][0],
+            y: positions[step][1]
+        }));
+    }
+
+    request(scope) {
+        if (this.pending.has(scope) || this.failed.has(scope)) return;
+        const meta = this.index.scopes[scope];
+        this.pending.add(scope);
+        d3.json(`${this.baseUrl}${meta.path}?v=${meta.sha256.slice(0, 12)}`)
+            .then(payload => {
+                this.scopes.set(scope, payload);
+                this.listeners.forEach(listener => listener(scope));
+            })
+            .catch(error => {
+                this.failed.add(scope);
+                console.warn(`[Data] 密度等值线 ${scope} 加载失败`, error);
+            })
+            .finally(() => this.pending.delete(scope));
+    }
+}
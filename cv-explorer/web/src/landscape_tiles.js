@@ -0,0 +1,151 @@
+// web/src/landscape_tiles.js
+// Level-of-detail tiles for the landscape point layer (see scripts/landscape_tiles.py).
+// Each frame only touches the tiles intersecting the viewport at the zoom level
+// matching the current scale; tiles still in flight are stood in for by the
+// nearest loaded ancestor, clipped to the missing tile's extent.
+
+const TILE_API = '/api/landscape/tiles';
+
+const tileKey = (z, x, y) => `${z}/${x}/${y}`;
+const parentOf = ([z, x, y]) => [z - 1, x >> 1, y >> 1];
+
+export class LandscapeTileLayer {
+    constructor(index, baseUrl = TILE_API) {
+        this.index = index;
+        this.baseUrl = baseUrl;
+        this.cache = new Map(); // `${scope}:${z/x/y}` -> records
+        this.pending = new Set();
+        this.failed = new Set(); // 失败的瓦片不在每帧重复请求
+        this.listeners = new Set();
+        const [x0, x1] = index.bounds.x;
+        const [y0, y1] = index.bounds.y;
+        this.bounds = { x0, y0, width: (x1 - x0) || 1, height: (y1 - y0) || 1 };
+    }
+
+    static async load(baseUrl = TILE_API) {
+        try {
+            const response = await fetch(`${baseUrl}/index`);
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            const index = await response.json();
+            console.info(`[Data] landscape 瓦片索引加载成功 (最大层级 ${index.max_zoom})`);
+            return new LandscapeTileLayer(index, baseUrl);
+        } catch (error) {
+            console.warn('[Data] landscape 瓦片不可用，回退至全量绘制', error);
+            return null;
+        }
+    }
+
+    subscribe(listener) {
+        this.listeners.add(listener);
+        return () => this.listeners.delete(listener);
+    }
+
+    hasScope(scope) {
+        return Boolean(this.index.scopes?.[scope]);
+    }
+
+    scopeFor(year, allYears) {
+        if (allYears) return 'all';
+        return this.hasScope(String(year)) ? String(year) : null;
+    }
+
+    // k = 1 shows the whole plane, so start one level below the root tile.
+    levelFor(k) {
+        const level = Math.floor(Math.log2(Math.max(k, 1))) + 1;
+        return Math.max(0, Math.min(this.index.max_zoom, level));
+    }
+
+    tileExtent([z, x, y]) {
+        const side = 2 ** z;
+        const { x0, y0, width, height } = this.bounds;
+        return {
+            xMin: x0 + (x / side) * width,
+            xMax: x0 + ((x + 1) / side) * width,
+            yMin: y0 + (y / side) * height,
+            yMax: y0 + ((y + 1) / side) * height
+        };
+    }
+
+    // Tiles (as existing keys) covering the data-space rectangle at zoom z.
+    coveringTiles(scope, z, [xMin, xMax], [yMin, yMax]) {
+        const tiles = this.index.scopes[scope].tiles;
+        const side = 2 ** z;
+        const { x0, y0, width, height } = this.bounds;
+        const col = value => Math.max(0, Math.min(side - 1, Math.floor(((value - x0) / width) * side)));
+        const row = value => Math.max(0, Math.min(side - 1, Math.floor(((value - y0) / height) * side)));
+        const found = new Map();
+        for (let tx = col(xMin); tx <= col(xMax); tx += 1) {
+            for (let ty = row(yMin); ty <= row(yMax); ty += 1) {
+                // Empty tiles are not written; below a leaf the leaf itself covers the area.
+                let coord = [z, tx, ty];
+                while (coord[0] > 0 && !tiles[tileKey(...coord)]) {
+                    coord = parentOf(coord);
+                }
+                if (tiles[tileKey(...coord)]) {
+                    found.set(tileKey(...coord), coord);
+                }
+            }
+        }
+        return Array.from(found.values());
+    }
+
+    visibleRecords(scope, k, xDomain, yDomain) {
+        const z = this.levelFor(k);
+        const records = [];
+        const seen = new Set();
+        this.coveringTiles(scope, z, xDomain, yDomain).forEach(coord => {
+            const key = tileKey(...coord);
+            const cached = this.cache.get(`${scope}:${key}`);
+            if (cached) {
+                cached.forEach(record => {
+                    if (!seen.has(record.id)) {
+                        seen.add(record.id);
+                        records.push(record);
+                    }
+                });
+                return;
+            }
+            this.request(scope, key);
+            // 等待期间用已加载的祖先瓦片顶替，只取落在本瓦片范围内的点
+            let ancestor = parentOf(coord);
+            while (ancestor[0] >= 0) {
+                const fallback = this.cache.get(`${scope}:${tileKey(...ancestor)}`);
+                if (fallback) {
+                    const { xMin, xMax, yMin, yMax } = this.tileExtent(coord);
+                    fallback.forEach(record => {
+                        if (record.x >= xMin && record.x <= xMax && record.y >= yMin && record.y <= yMax && !seen.has(record.id)) {
+                            seen.add(record.id);
+                            records.push(record);
+                        }
+                    });
+                    break;
+                }
+                ancestor = parentOf(ancestor);
+            }
+        });
+        return records;
+    }
+
+    request(scope, key) {
+        const cacheKey = `${scope}:${key}`;
+        if (this.cache.has(cacheKey) || this.pending.has(cacheKey) || this.failed.has(cacheKey)) return;
+        const meta = this.index.scopes[scope].tiles[key];
+        const params = new URLSearchParams({ v: meta.sha256.slice(0, 12) });
+        if (scope !== 'all') params.set('year', scope);
+        this.pending.add(cacheKey);
+        fetch(`${this.baseUrl}/${key}?${params}`)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(records => {
+                this.cache.set(cacheKey, records);
+                this.listeners.forEach(listener => listener(scope, key));
+            })
+            .catch(error => {
+                this.failed.add(cacheKey);
+                console.warn(`[Data] 瓦片 ${cacheKey} 加载失败`, error);
+            })
+            .finally(() => this.pending.delete(cacheKey));
+    }
+}
@@ -1,13 +1,23 @@
 // web/src/main.js
 import { initRouter } from './router.js';
 import { ParticleBackground } from './bg-animation.js';
+import { fetchLandscapeBinary } from './landscape_binary.js';
+import { ShardStore } from './shard_store.js';
+import { LandscapeTileLayer } from './landscape_tiles.js';
+import { LandscapeDensityStore } from './landscape_density.js';
+import { InsightStore } from './insight_store.js';
 
-const dispatcher = d3.dispatch("viewUpdate", "paperSelected", "paperSelectedSync");
+const dispatcher = d3.dispatch("viewUpdate", "paperSelected", "paperSelectedSync", "datasetLoaded");
 const state = {
     summary: null,
     landscape: null,
+    landscapeColumns: null,
     sankey: null,
     wordcloud: null,
+    shardInfo: {}, // 分片数据集的全局信息（年份、坐标范围等），来自 manifest
+    landscapeTiles: null, // 后端 LOD 瓦片（不可用时为 null，视图回退至全量绘制）
+    landscapeDensity: null, // 预计算的密度等值线与语义锚点
+    insights: null, // 热点论文/学者的预计算 AI 解读，命中时 AI 面板不再请求后端
     filters: {
         year: null
     },
@@ -16,10 +26,22 @@ const state = {
 
 let routerInstance = null;
 let resizeTimer = null;
+let shardStore = null;
+let assetManifest = null; // { base, assets }: 内容哈希命名的数据副本，可长期缓存
+
+const shardManifestPaths = ["./data/shards/manifest.json", "../data/shards/manifest.json"];
+const assetManifestPaths = ["./data/asset-manifest.json", "../data/asset-manifest.json"];
+const densityIndexPaths = ["./data/density/index.json", "../data/density/index.json"];
+const insightPaths = ["./data/ai_insights.json", "../data/ai_insights.json"];
 
 const dataSources = [
     { key: "summary", paths: ["./data/summary.json", "../data/summary.json"] },
-    { key: "landscape", paths: ["./data/landscape_data.json", "../data/landscape_data.json"] },
+    {
+        key: "landscape",
+        sharded: true,
+        binaryPaths: ["./data/landscape_data.bin", "../data/landscape_data.bin"],
+        paths: ["./data/landscape_data.json", "../data/landscape_data.json"]
+    },
     { key: "sankey", paths: ["./data/sankey_data.json", "../data/sankey_data.json"] },
     { key: "wordcloud", paths: ["./data/wordcloud_data.json", "../data/wordcloud_data.json"] },
     { key: "leaderboard", paths: ["./data/leaderboard_seeds.json", "../data/leaderboard_seeds.json"] }
@@ -225,6 +247,11 @@ function bridgeDispatcher() {
             state.filters.year = payload.year;
             console.info(`[Dispatcher] 年份同步至 ${payload.year}`);
         }
+        if (shardStore && payload?.allYears) {
+            shardStore.ensureAll("landscape").catch(error => console.warn("[Data] landscape 全量分片加载失败", error));
+        } else if (shardStore && Number.isFinite(payload?.year)) {
+            requestLandscapeYear(payload.year);
+        }
     });
 
     dispatcher.on("paperSelectedSync.bridge", payload => {
@@ -246,8 +273,32 @@ function bridgeDispatcher() {
     });
 }
 
+async function loadAssetManifest() {
+    for (const candidate of assetManifestPaths) {
+        try {
+            const manifest = await d3.json(candidate);
+            if (manifest?.assets) {
+                return { base: candidate.slice(0, candidate.lastIndexOf("/") + 1), assets: manifest.assets };
+            }
+        } catch (error) {
+            console.warn(`[Data] 资源清单加载失败 (${candidate})`, error);
+        }
+    }
+    return null;
+}
+
+// 优先尝试哈希命名的副本（immutable 缓存），失败时再回退到原始文件名
+function withHashedCandidates(paths = []) {
+    if (!assetManifest) return paths;
+    return paths.flatMap(candidate => {
+        if (!candidate.startsWith(assetManifest.base)) return [candidate];
+        const entry = assetManifest.assets[candidate.slice(assetManifest.base.length)];
+        return entry ? [assetManifest.base + entry.path, candidate] : [candidate];
+    });
+}
+
 async function fetchDatasetWithFallback(key, paths = []) {
-    for (const candidate of paths) {
+    for (const candidate of withHashedCandidates(paths)) {
         try {
             const payload = await d3.json(candidate);
             console.info(`[Data] ${key} 加载成功 (${candidate})`);
@@ -260,12 +311,63 @@ async function fetchDatasetWithFallback(key, paths = []) {
     return null;
 }
 
+async function fetchLandscapeColumns(paths = []) {
+    for (const candidate of withHashedCandidates(paths)) {
+        try {
+            const started = performance.now();
+            const payload = await fetchLandscapeBinary(candidate);
+            const elapsed = Math.round(performance.now() - started);
+            console.info(`[Data] landscape 二进制加载成功 (${candidate}, ${payload.records.length} 条, ${elapsed}ms)`);
+            return payload;
+        } catch (error) {
+            console.warn(`[Data] landscape 二进制加载失败 (${candidate})`, error);
+        }
+    }
+    return null;
+}
+
+async function loadSource({ key, paths, binaryPaths }) {
+    if (binaryPaths) {
+        const binary = await fetchLandscapeColumns(binaryPaths);
+        if (binary) {
+            state[key] = binary.records;
+            state[`${key}Columns`] = binary.table;
+            return;
+        }
+    }
+    state[key] = await fetchDatasetWithFallback(key, paths);
+}
+
+function requestLandscapeYear(year) {
+    shardStore.ensureYears("landscape", [year])
+        .then(() => shardStore.prefetchAround("landscape", year))
+        .catch(error => console.warn(`[Data] landscape ${year} 分片加载失败`, error));
+}
+
+function attachShardStore(store) {
+    shardStore = store;
+    state.shardInfo.landscape = store.info("landscape");
+    state.landscape = [];
+    store.onLoad((key, year) => {
+        state[key] = store.records(key);
+        console.info(`[Data] ${key} 分片 ${year} 就绪，共 ${state[key].length} 条`);
+        dispatcher.call("datasetLoaded", null, { key, year });
+    });
+}
+
 async function loadData() {
-    await Promise.all(
-        dataSources.map(async ({ key, paths }) => {
-            state[key] = await fetchDatasetWithFallback(key, paths);
-        })
-    );
+    assetManifest = await loadAssetManifest();
+    // 分片清单与小体量数据并行加载；landscape 只取当前年份的分片，其余年份按需/空闲时预取
+    const [store, tiles, density, insights] = await Promise.all([
+        ShardStore.load(shardManifestPaths),
+        LandscapeTileLayer.load(),
+        LandscapeDensityStore.load(densityIndexPaths),
+        InsightStore.load(withHashedCandidates(insightPaths)),
+        ...dataSources.filter(source => !source.sharded).map(loadSource)
+    ]);
+    state.landscapeTiles = tiles;
+    state.landscapeDensity = density;
+    state.insights = insights;
 
     if (!state.filters.year && state.summary?.yearly) {
         const years = Object.keys(state.summary.yearly)
@@ -273,6 +375,19 @@ async function loadData() {
             .sort((a, b) => a - b);
         state.filters.year = years[years.length - 1];
     }
+
+    if (!store?.has("landscape")) {
+        await Promise.all(dataSources.filter(source => source.sharded).map(loadSource));
+        return;
+    }
+
+    attachShardStore(store);
+    const shardYears = store.years("landscape");
+    const year = shardYears.includes(state.filters.year)
+        ? state.filters.year
+        : shardYears[shardYears.length - 1];
+    await store.ensureYears("landscape", [year]);
+    store.prefetchAround("landscape", year);
 }
 
 function handleResize() {
@@ -0,0 +1,137 @@
+// web/src/shard_store.js
+// Lazy loader for the year shards described by data/shards/manifest.json
+// (written by scripts/year_shards.py). Only requested years are fetched;
+// neighbouring years can be prefetched while the browser is idle.
+import { decodeLandscapeBinary, landscapeRecordsFromColumns } from './landscape_binary.js';
+
+const idle = typeof window !== 'undefined' && window.requestIdleCallback
+    ? callback => window.requestIdleCallback(callback, { timeout: 2000 })
+    : callback => setTimeout(callback, 200);
+
+const yearKey = year => (year == null ? 'unknown' : String(year));
+
+export class ShardStore {
+    constructor(manifest, manifestUrl) {
+        this.manifest = manifest;
+        this.baseUrl = new URL('.', new URL(manifestUrl, window.location.href));
+        this.loaded = new Map(); // dataset -> Map(yearKey -> records)
+        this.pending = new Map(); // `${dataset}:${yearKey}` -> Promise
+        this.listeners = [];
+    }
+
+    static async load(paths = []) {
+        for (const candidate of paths) {
+            try {
+                const manifest = await d3.json(candidate);
+                if (manifest?.datasets) {
+                    console.info(`[Data] 分片清单加载成功 (${candidate})`);
+                    return new ShardStore(manifest, candidate);
+                }
+            } catch (error) {
+                console.warn(`[Data] 分片清单加载失败 (${candidate})`, error);
+            }
+        }
+        return null;
+    }
+
+    has(dataset) {
+        return Boolean(this.manifest.datasets?.[dataset]?.shards?.length);
+    }
+
+    info(dataset) {
+        const entry = this.manifest.datasets?.[dataset];
+        if (!entry) return null;
+        const { shards, ...rest } = entry;
+        return rest;
+    }
+
+    years(dataset) {
+        return this.manifest.datasets?.[dataset]?.years ?? [];
+    }
+
+    onLoad(listener) {
+        this.listeners.push(listener);
+    }
+
+    isLoaded(dataset, year) {
+        return this.loaded.get(dataset)?.has(yearKey(year)) ?? false;
+    }
+
+    // Records of every year fetched so far, in manifest (chronological) order.
+    records(dataset) {
+        const byYear = this.loaded.get(dataset);
+        if (!byYear) return [];
+        const shards = this.manifest.datasets[dataset].shards;
+        return shards.flatMap(shard => byYear.get(yearKey(shard.year)) ?? []);
+    }
+
+    ensureYears(dataset, years) {
+        const shards = this.manifest.datasets?.[dataset]?.shards ?? [];
+        const wanted = new Set(years.map(yearKey));
+        return Promise.all(
+            shards
+                .filter(shard => wanted.has(yearKey(shard.year)))
+                .map(shard => this.fetchShard(dataset, shard))
+        );
+    }
+
+    ensureAll(dataset) {
+        const shards = this.manifest.datasets?.[dataset]?.shards ?? [];
+        return this.ensureYears(dataset, shards.map(shard => shard.year));
+    }
+
+    // Fetch the years adjacent to `year` once the main thread is idle.
+    prefetchAround(dataset, year, radius = 1) {
+        const years = this.years(dataset);
+        const idx = years.indexOf(year);
+        if (idx < 0) return;
+        const neighbours = [];
+        for (let offset = 1; offset <= radius; offset += 1) {
+            if (idx - offset >= 0) neighbours.push(years[idx - offset]);
+            if (idx + offset < years.length) neighbours.push(years[idx + offset]);
+        }
+        const missing = neighbours.filter(y => !this.isLoaded(dataset, y));
+        if (missing.length) {
+            idle(() => {
+                this.ensureYears(dataset, missing).catch(error => {
+                    console.warn(`[Data] ${dataset} 预取失败`, error);
+                });
+            });
+        }
+    }
+
+    fetchShard(dataset, shard) {
+        const key = `${dataset}:${yearKey(shard.year)}`;
+        if (this.isLoaded(dataset, shard.year)) {
+            return Promise.resolve(this.loaded.get(dataset).get(yearKey(shard.year)));
+        }
+        if (!this.pending.has(key)) {
+            const request = this.fetchShardRecords(shard)
+                .then(records => {
+                    if (!this.loaded.has(dataset)) this.loaded.set(dataset, new Map());
+                    this.loaded.get(dataset).set(yearKey(shard.year), records);
+                    this.listeners.forEach(listener => listener(dataset, shard.year));
+                    return records;
+                })
+                .finally(() => this.pending.delete(key));
+            this.pending.set(key, request);
+        }
+        return this.pending.get(key);
+    }
+
+    async fetchShardRecords(shard) {
+        const { bin, json } = shard.files;
+        // 内容哈希作为查询参数，数据更新后自动绕开旧缓存
+        const urlOf = meta => new URL(`${meta.path}?v=${meta.sha256.slice(0, 12)}`, this.baseUrl).href;
+        if (bin) {
+            try {
+                const response = await fetch(urlOf(bin));
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return landscapeRecordsFromColumns(decodeLandscapeBinary(await response.arrayBuffer()));
+            } catch (error) {
+                console.warn(`[Data] 分片 ${bin.path} 二进制加载失败，回退至 JSON`, error);
+            }
+        }
+        return d3.json(urlOf(json));
+    }
+}
@@ -104,6 +104,8 @@ export function renderAiPanel(container, state, dispatcher) {
 
     let typingTimer = null;
     let pendingTimer = null;
+    let activeStream = null;
+    let selectionToken = 0;
 
     // Initialize UI state
     // Force immediate sync with config values if available
@@ -198,6 +200,57 @@ export function renderAiPanel(container, state, dispatcher) {
         }, speed);
     }
 
+    // 读取 /api/analyze/stream 的 server-sent events，delta 逐段回调，返回 done 事件里的完整结果
+    async function streamAnalysis(url, requestData, onDelta, signal) {
+        const response = await fetch(url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+            body: JSON.stringify(requestData),
+            signal
+        });
+        if (response.status === 429 || response.status === 503) {
+            // 限流 / 上游排队已满：后端给出可读的提示与 Retry-After
+            const body = await response.json().catch(() => ({}));
+            const retry = response.headers.get('Retry-After');
+            return { error: body.error || `服务繁忙${retry ? `，请 ${retry} 秒后重试` : ''}` };
+        }
+        if (!response.ok || !response.body) {
+            throw new Error(`Server Error: ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let result = null;
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary = buffer.indexOf('\n\n');
+            while (boundary >= 0) {
+                const block = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                boundary = buffer.indexOf('\n\n');
+
+                let event = 'message';
+                const dataLines = [];
+                block.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) dataLines.push(line.slice(5).trimStart());
+                });
+                if (!dataLines.length) continue;
+                const data = JSON.parse(dataLines.join('\n'));
+                if (event === 'delta') onDelta(data.text || '');
+                else if (event === 'done') result = data;
+                else if (event === 'error') result = { error: data.error };
+            }
+        }
+        if (!result) {
+            throw new Error('Stream closed before completion');
+        }
+        return result;
+    }
+
     function formatNumber(value) {
         const num = Number(value);
         return Number.isFinite(num) ? num.toLocaleString() : value;
@@ -314,6 +367,11 @@ export function renderAiPanel(container, state, dispatcher) {
             clearTimeout(pendingTimer);
             pendingTimer = null;
         }
+        if (activeStream) {
+            activeStream.abort();
+            activeStream = null;
+        }
+        selectionToken += 1;
         if (!payload) {
             showIdleState();
             return;
@@ -329,8 +387,30 @@ export function renderAiPanel(container, state, dispatcher) {
 
         showLoadingState(payload);
 
-        // 使用后端 API (相对路径以适配 Vercel)
-        const apiUrl = '/api/analyze';
+        // 先查预计算的静态洞察（默认 Mock 或与当前模型一致时采用），未命中再请求后端
+        const insights = state.insights;
+        if (!insights) {
+            requestAnalysis(payload);
+            return;
+        }
+        const token = selectionToken;
+        insights.lookup(payload).then(entry => {
+            if (token !== selectionToken) return;
+            if (entry && (currentConfig.model === 'mock' || entry.model === currentConfig.model)) {
+                const resultPayload = { ...payload, summary: entry.summary, concepts: entry.keywords || [], cached: true };
+                if (state) state.selection = resultPayload;
+                showResult(resultPayload);
+                return;
+            }
+            requestAnalysis(payload);
+        }).catch(() => {
+            if (token === selectionToken) requestAnalysis(payload);
+        });
+    }
+
+    function requestAnalysis(payload) {
+        // 使用后端流式 API (相对路径以适配 Vercel)，首段文字到达即开始显示
+        const apiUrl = '/api/analyze/stream';
 
         // 模拟延迟或实际请求
         pendingTimer = setTimeout(async () => {
@@ -356,17 +436,21 @@ export function renderAiPanel(container, state, dispatcher) {
                     }
                 };
 
-                const response = await fetch(apiUrl, {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(requestData)
-                });
-
-                if (!response.ok) {
-                    throw new Error(`Server Error: ${response.status}`);
-                }
-
-                const data = await response.json();
+                const controller = new AbortController();
+                activeStream = controller;
+                let streamed = '';
+                const data = await streamAnalysis(apiUrl, requestData, delta => {
+                    if (!streamed) {
+                        if (typingTimer) {
+                            clearInterval(typingTimer);
+                            typingTimer = null;
+                        }
+                        selectionHint.text('AI 正在输出...');
+                    }
+                    streamed += delta;
+                    selectionText.classed('is-typing', true).text(streamed);
+                }, controller.signal);
+                if (activeStream === controller) activeStream = null;
 
                 if (data.error) {
                     typewrite(selectionText, `错误: ${data.error}`);
@@ -389,6 +473,7 @@ export function renderAiPanel(container, state, dispatcher) {
                 showResult(resultPayload);
 
             } catch (error) {
+                if (error.name === 'AbortError') return; // 已切换到新的选择
                 console.error("AI Service Error:", error);
                 // 降级处理
                 if (currentConfig.model === 'mock') {
@@ -420,5 +505,6 @@ export function renderAiPanel(container, state, dispatcher) {
         dispatcher.on('paperSelected.aiView', null);
         if (typingTimer) clearInterval(typingTimer);
         if (pendingTimer) clearTimeout(pendingTimer);
+        if (activeStream) activeStream.abort();
     };
 }
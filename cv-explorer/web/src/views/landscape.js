@@ -1,7 +1,6 @@
 // web/src/views/landscape.js
-export function renderLandscape(container, state, dispatcher) {
-    const rawDataset = state.landscape || [];
-    const dataset = rawDataset
+function normalizeDataset(rawDataset) {
+    return rawDataset
         .map((entry, index) => {
             const parsedYear = typeof entry.year === 'string' ? parseInt(entry.year, 10) : entry.year;
             const parsedCitations = Number(entry.citations);
@@ -22,8 +21,18 @@ export function renderLandscape(container, state, dispatcher) {
             };
         })
         .filter(d => Number.isFinite(d.x) && Number.isFinite(d.y));
+}
 
-    if (!dataset.length) {
+export function renderLandscape(container, state, dispatcher) {
+    let dataset = normalizeDataset(state.landscape || []);
+    // 按年分片加载时，年份/会议/坐标范围取自 manifest，尚未到达的年份不会改变画布比例
+    const shardInfo = state.shardInfo?.landscape ?? null;
+    // 后端提供 LOD 瓦片时，点图层只绘制视口内可见瓦片中的论文
+    const tileLayer = state.landscapeTiles ?? null;
+    // 预计算的密度等值线与语义锚点（缺失时回退为前端实时计算）
+    const densityStore = state.landscapeDensity ?? null;
+
+    if (!dataset.length && !shardInfo) {
         container.append('div').attr('class', 'empty-state').text('暂无语义数据，请检查 landscape_data.json');
         return;
     }
@@ -56,10 +65,10 @@ export function renderLandscape(container, state, dispatcher) {
     const defaultHoverHtml = '<h3>语义锚点待命</h3><p>在图中移动或放大，即可唤醒对应论文与领域。</p>';
     let hoverCard = null;
 
-    const years = Array.from(new Set(dataset.map(d => d.year).filter(Number.isFinite))).sort((a, b) => a - b);
+    const years = Array.from(new Set([...(shardInfo?.years ?? []), ...dataset.map(d => d.year)].filter(Number.isFinite))).sort((a, b) => a - b);
     const latestYear = years[years.length - 1] ?? new Date().getFullYear();
     const requestedYear = Number(state.filters?.year);
-    const venues = ['ALL', ...Array.from(new Set(dataset.map(d => d.venue || 'Others'))).sort()];
+    const venues = ['ALL', ...(shardInfo?.venues ?? Array.from(new Set(dataset.map(d => d.venue || 'Others'))).sort())];
     let selectedYear = Number.isFinite(requestedYear) && years.includes(requestedYear)
         ? requestedYear
         : latestYear;
@@ -69,9 +78,8 @@ export function renderLandscape(container, state, dispatcher) {
     let smoothingFactor = 0.4;
     let transform = d3.zoomIdentity;
 
-    const validYears = dataset.map(d => d.year).filter(Number.isFinite);
-    const minYear = validYears.length ? d3.min(validYears) : latestYear - 5;
-    const maxYear = validYears.length ? d3.max(validYears) : latestYear;
+    const minYear = years.length ? years[0] : latestYear - 5;
+    const maxYear = years.length ? years[years.length - 1] : latestYear;
     const yearExtentForColor = [minYear, maxYear];
 
     // Safety check for interpolator
@@ -98,7 +106,9 @@ export function renderLandscape(container, state, dispatcher) {
         return d3.color(interpolator((maxYear - value) / (maxYear - minYear))).formatRgb();
     };
 
-    const citationExtent = d3.extent(dataset, d => d.citations || 1);
+    const citationExtent = shardInfo?.bounds?.citations
+        ? shardInfo.bounds.citations.map(value => value || 1)
+        : d3.extent(dataset, d => d.citations || 1);
     if (citationExtent[0] === citationExtent[1]) {
         citationExtent[1] = citationExtent[0] + 1;
     }
@@ -106,11 +116,12 @@ export function renderLandscape(container, state, dispatcher) {
     const radiusScale = d3.scaleSqrt().domain(citationExtent).range([2, 11]);
 
     const normalizeExtent = ([min, max]) => (min === max ? [min - 1, max + 1] : [min, max]);
-    const xExtent = normalizeExtent(d3.extent(dataset, d => d.x));
-    const yExtent = normalizeExtent(d3.extent(dataset, d => d.y));
+    const xExtent = normalizeExtent(shardInfo?.bounds?.x ?? d3.extent(dataset, d => d.x));
+    const yExtent = normalizeExtent(shardInfo?.bounds?.y ?? d3.extent(dataset, d => d.y));
     const padding = 30;
     const clamp = (value, [min, max]) => Math.min(Math.max(value, min), max);
     let pointerCache = [];
+    let pointerTree = null; // d3.quadtree over pointerCache (屏幕坐标)，悬停/点击命中查询
     let selectedPaper = null;
     let cachedScales = { xScale: null, yScale: null };
 
@@ -154,6 +165,9 @@ export function renderLandscape(container, state, dispatcher) {
             showAllYears = event.target.checked;
             syncYearControls();
             draw();
+            if (showAllYears) {
+                dispatcher.call('viewUpdate', canvas, { source: 'landscape', allYears: true });
+            }
         });
     allYearsToggle.append('span').text('显示所有年份');
 
@@ -304,7 +318,7 @@ export function renderLandscape(container, state, dispatcher) {
     const pointKey = point => point.id || `${point.title}-${point.year}`;
 
     const zoom = d3.zoom()
-        .scaleExtent([0.75, 6])
+        .scaleExtent([0.75, tileLayer ? Math.max(6, 2 ** (tileLayer.index.max_zoom - 1)) : 6])
         .on('zoom', event => {
             transform = event.transform;
             draw();
@@ -391,9 +405,15 @@ export function renderLandscape(container, state, dispatcher) {
         const projectY = value => transform.applyY(yScale(value));
 
         drawQuadrantBackdrop(ctx, canvas.width, canvas.height, projectX, projectY);
-        const anchors = getSemanticAnchors(data);
-        drawDensityContours(data, projectX, projectY);
-        drawNodes(data, projectX, projectY);
+        const densityScope = precomputedScope();
+        const anchors = (densityScope && densityStore.anchors(densityScope, selectedVenue, smoothingFactor, anchorCount))
+            || getSemanticAnchors(data);
+        if (densityScope) {
+            drawPrecomputedContours(densityScope, projectX, projectY, xScale);
+        } else {
+            drawDensityContours(data, projectX, projectY);
+        }
+        drawNodes(tileRecordsInView(xScale, yScale) ?? data, projectX, projectY);
         renderProfessionalLabels(anchors, data, projectX, projectY);
         updateSummary(anchors);
         updateDigest(data, anchors);
@@ -401,6 +421,65 @@ export function renderLandscape(container, state, dispatcher) {
         updateMiniMap(data, xScale, yScale);
     }
 
+    function tileRecordsInView(xScale, yScale) {
+        if (!tileLayer) return null;
+        const scope = tileLayer.scopeFor(selectedYear, showAllYears);
+        if (!scope) return null;
+        const xDomain = [xScale.invert(transform.invertX(0)), xScale.invert(transform.invertX(canvas.width))];
+        const yDomain = [yScale.invert(transform.invertY(canvas.height)), yScale.invert(transform.invertY(0))];
+        const records = tileLayer.visibleRecords(scope, transform.k, xDomain, yDomain);
+        // 首批瓦片到达前沿用已加载的数据
+        if (!records.length) return null;
+        return selectedVenue === 'ALL' ? records : records.filter(d => d.venue === selectedVenue);
+    }
+
+    let pendingFrame = null;
+    const scheduleDraw = () => {
+        if (pendingFrame) return;
+        pendingFrame = requestAnimationFrame(() => {
+            pendingFrame = null;
+            draw();
+        });
+    };
+    const unsubscribeTiles = tileLayer ? tileLayer.subscribe(scheduleDraw) : null;
+    const unsubscribeDensity = densityStore ? densityStore.subscribe(scheduleDraw) : null;
+
+    function precomputedScope() {
+        if (!densityStore) return null;
+        const scope = showAllYears ? 'all' : String(selectedYear);
+        return densityStore.entry(scope, selectedVenue) ? scope : null;
+    }
+
+    function drawPrecomputedContours(scope, projectX, projectY, xScale) {
+        if (densityStore.entry(scope, selectedVenue).count < 5) return;
+        // 与 drawDensityContours 相同的屏幕带宽，换算为占平面宽度的比例后取最近的预计算档位
+        const screenBandwidth = Math.max(22, 120 / (transform.k + 0.3));
+        const pixelsPerUnit = Math.abs(xScale(1) - xScale(0)) * transform.k;
+        const fraction = screenBandwidth / pixelsPerUnit / (xExtent[1] - xExtent[0]);
+        const levels = densityStore.contours(scope, selectedVenue, densityStore.bandFor(fraction));
+        if (!levels) return;
+
+        ctx.save();
+        levels.forEach((rings, idx) => {
+            if (!rings.length) return;
+            const alpha = Math.min(0.45, 0.08 + 0.02 * (idx + 1) * 2.2);
+            ctx.beginPath();
+            rings.forEach(ring => {
+                ctx.moveTo(projectX(ring[0]), projectY(ring[1]));
+                for (let i = 2; i < ring.length; i += 2) {
+                    ctx.lineTo(projectX(ring[i]), projectY(ring[i + 1]));
+                }
+                ctx.closePath();
+            });
+            ctx.fillStyle = `rgba(56, 189, 248, ${alpha * 0.6})`;
+            ctx.strokeStyle = `rgba(226, 232, 240, ${Math.min(0.8, alpha + 0.15)})`;
+            ctx.lineWidth = 1.2;
+            ctx.fill('evenodd');
+            ctx.stroke();
+        });
+        ctx.restore();
+    }
+
     function drawDensityContours(data, projectX, projectY) {
         if (data.length < 5) return;
 
@@ -490,6 +569,7 @@ export function renderLandscape(container, state, dispatcher) {
             pointerCache.push({ ...point, screenX, screenY, radius });
         });
 
+        pointerTree = d3.quadtree(pointerCache, d => d.screenX, d => d.screenY);
         ctx.globalAlpha = 1;
     }
 
@@ -820,17 +900,27 @@ export function renderLandscape(container, state, dispatcher) {
     }
 
     function findNearestPoint(event) {
-        if (!pointerCache.length) return null;
+        if (!pointerTree || !pointerCache.length) return null;
         const [mx, my] = d3.pointer(event, canvas);
+        // 点半径上限为 9，命中半径因此不超过 15px，只需访问该范围内的四叉树节点
+        const reach = 15;
         let best = null;
         let bestDistance = Infinity;
-        pointerCache.forEach(point => {
-            const distance = Math.hypot(point.screenX - mx, point.screenY - my);
-            const hitRadius = Math.max(point.radius + 6, 12);
-            if (distance < hitRadius && distance < bestDistance) {
-                best = point;
-                bestDistance = distance;
+        pointerTree.visit((node, x0, y0, x1, y1) => {
+            if (!node.length) {
+                let leaf = node;
+                do {
+                    const point = leaf.data;
+                    const distance = Math.hypot(point.screenX - mx, point.screenY - my);
+                    const hitRadius = Math.max(point.radius + 6, 12);
+                    if (distance < hitRadius && distance < bestDistance) {
+                        best = point;
+                        bestDistance = distance;
+                    }
+                    leaf = leaf.next;
+                } while (leaf);
             }
+            return x0 > mx + reach || x1 < mx - reach || y0 > my + reach || y1 < my - reach;
         });
         return best;
     }
@@ -918,7 +1008,16 @@ export function renderLandscape(container, state, dispatcher) {
         }
     };
 
+    const datasetLoadedHandler = payload => {
+        if (payload?.key !== 'landscape') return;
+        dataset = normalizeDataset(state.landscape || []);
+        if (showAllYears || payload.year === selectedYear) {
+            draw();
+        }
+    };
+
     dispatcher.on('viewUpdate.landscape', externalFilterHandler);
+    dispatcher.on('datasetLoaded.landscape', datasetLoadedHandler);
 
     return () => {
         if (resizeObserver) {
@@ -928,5 +1027,9 @@ export function renderLandscape(container, state, dispatcher) {
         canvas.removeEventListener('mouseleave', handleLeave);
         canvas.removeEventListener('click', handleClick);
         dispatcher.on('viewUpdate.landscape', null);
+        dispatcher.on('datasetLoaded.landscape', null);
+        if (unsubscribeTiles) unsubscribeTiles();
+        if (unsubscribeDensity) unsubscribeDensity();
+        if (pendingFrame) cancelAnimationFrame(pendingFrame);
     };
 }
\ No newline at end of file